@@ -0,0 +1,290 @@
+"""Benchmarks of the hot paths of the model and of the rendering.
+
+Mazes of growing size are generated from a seed (See `bomberman.generate`, requires numpy),
+with a growing number of players and bombs.
+The model (obstacle lookups, moves, ticks of the controller, ticks of dozens of bots) and the rendering
+(with the SDL dummy video driver) are timed separately, and the scaling with the size of the maze is reported.
+
+Timings are normalized by a pure python calibration loop, so that a baseline saved on a machine
+can roughly be compared on another one. The script fails (exit code 1) if a benchmark is slower
+than its baseline by more than the threshold. Without a baseline, it only warns.
+
+Usage (from the root of the repository):
+    python benchmarks/benchmark.py --save-baseline  # Store the baseline
+    python benchmarks/benchmark.py                  # Compare with it
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# pylint: disable = wrong-import-position
+from bomberman import generate
+from bomberman.controller import bot
+from bomberman.model import player
+from bomberman.model import snapshots
+from bomberman.simulation import headless
+
+from bomberman.model import BOX_SIZE
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+WINDOW_SIZE = (1200, 800)
+
+
+class Case(NamedTuple):
+    """A benchmark.
+
+    Attrs:
+        group (str): 'model' or 'render'.
+        name (str): Name of the benchmark.
+        size (int): Number of boxes on each side of the maze.
+        players (int): Number of players.
+        bombs (bool): Whether the players drop bombs.
+    """
+    group: str
+    name: str
+    size: int
+    players: int
+    bombs: bool
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}/{self.name}/size={self.size}/players={self.players}/bombs={int(self.bombs)}"
+
+
+def new_game(case: Case, seed: int = 0) -> headless.HeadlessGame:
+    maze_ = generate.to_maze(generate.generate(case.size, case.size, seed=seed, wood_density=0.25, spawns=case.players))
+    game = headless.HeadlessGame(maze_)
+    for k in range(case.players):
+        game.add_player(headless.RandomPolicy(seed + k, 0.05, 0.2 if case.bombs else 0.0))
+    game.run(48)  # Warm up: players spread and bombs are dropped.
+    return game
+
+
+def bench_obstacle_at(case: Case) -> Tuple[Callable[[], None], int]:
+    maze_ = new_game(case).maze
+    rng = random.Random(0)
+    positions = [(rng.uniform(0, maze_.size[0]), rng.uniform(0, maze_.size[1])) for _ in range(1000)]
+
+    def run():
+        obstacle_at = maze_.obstacle_at
+        for pos in positions:
+            obstacle_at(pos)
+    return run, len(positions)
+
+
+def bench_move(case: Case) -> Tuple[Callable[[], None], int]:
+    game = new_game(case)
+    directions = list(player.Direction)
+
+    def run():
+        for k in range(100):
+            for player_ in game.maze.players:
+                player_.move(1 / 48, directions[k // 25])
+    return run, 100 * len(game.maze.players)
+
+
+def bench_tick(case: Case) -> Tuple[Callable[[], None], int]:
+    game = new_game(case)
+    snapshot = snapshots.take(game.maze)
+
+    def run() -> float:  # Each run starts from the same state: the players are not eliminated along the runs.
+        snapshots.restore(game.maze, snapshot)
+        start = time.perf_counter()
+        game.run(48)
+        return time.perf_counter() - start
+    return run, 48
+
+
+def _bots(search_radius: Optional[int]):
+    """Ticks of a maze full of bots, searching around them at most `search_radius` moves away."""
+    def bench(case: Case) -> Tuple[Callable[[], None], int]:
+        game = headless.HeadlessGame(
+            generate.to_maze(generate.generate(case.size, case.size, seed=0, wood_density=0.25, spawns=case.players))
+        )
+        bots = [bot.new_bot(game.controller) for _ in range(case.players)]
+        for bot_ in bots:
+            bot_.search_radius = search_radius
+        game.run(48)  # Warm up: bots spread and bombs are dropped.
+        snapshot = snapshots.take(game.maze)
+
+        def run() -> float:
+            snapshots.restore(game.maze, snapshot)
+            game.controller.players = list(bots)  # Also control again the bots eliminated during the last run.
+            start = time.perf_counter()
+            game.run(48)
+            return time.perf_counter() - start
+        return run, 48
+    return bench
+
+
+def _render(view_factory):
+    def bench(case: Case) -> Tuple[Callable[[], None], int]:
+        import pygame  # pylint: disable = import-outside-toplevel
+
+        game = new_game(case)
+        size = game.maze.size
+        pygame.display.set_mode((min(size[0], WINDOW_SIZE[0]), min(size[1], WINDOW_SIZE[1])))
+        view_ = view_factory(game.maze)
+        view_.display()
+
+        def run() -> float:  # The ticks of the model are not timed.
+            duration = 0.0
+            for _ in range(24):
+                game.step()
+                start = time.perf_counter()
+                pygame.display.update(view_.display())
+                duration += time.perf_counter() - start
+            return duration
+        return run, 24
+    return bench
+
+
+def _views():
+    from bomberman.view import maze_view  # pylint: disable = import-outside-toplevel
+    return {
+        'display_full': maze_view.MazeView,
+        'display_dirty': maze_view.DirtyMazeView,
+        'display_camera': maze_view.CameraMazeView,
+    }
+
+
+MODEL_BENCHMARKS = {
+    'obstacle_at': bench_obstacle_at,
+    'player_move': bench_move,
+    'tick': bench_tick,
+}
+
+BOT_BENCHMARKS = {
+    'bots_tick': _bots(bot.BotController.SEARCH_RADIUS),
+    'bots_tick_unbounded': _bots(None),  # Searches over the whole maze: the cost of a full distance field.
+}
+
+
+def calibrate(repeat: int) -> float:
+    """Time of a fixed pure python workload (in seconds)."""
+    def workload():
+        total = 0
+        for k in range(200000):
+            total += k % 7
+    return min(_time(workload) for _ in range(repeat))
+
+
+def _time(function: Callable[[], Optional[float]]) -> float:
+    """Time of a call, unless the function returns the time to consider."""
+    start = time.perf_counter()
+    duration = function()
+    if duration is None:
+        duration = time.perf_counter() - start
+    return duration
+
+
+def measure(bench, case: Case, repeat: int) -> float:
+    """Time of one operation of a benchmark (in seconds): best of `repeat` runs."""
+    run, operations = bench(case)
+    run()  # Warm up.
+    return min(_time(run) for _ in range(repeat)) / operations
+
+
+def cases(sizes: List[int], players: List[int], groups: List[str], bots: int) -> List[Tuple[Case, Callable]]:
+    selected = []
+    benchmarks = []
+    if 'model' in groups:
+        benchmarks += [('model', name, bench) for name, bench in MODEL_BENCHMARKS.items()]
+        for name, bench in BOT_BENCHMARKS.items():  # Bots always drop bombs.
+            selected += [(Case('model', name, size, bots, True), bench) for size in sizes]
+    if 'render' in groups:
+        import pygame  # pylint: disable = import-outside-toplevel
+        pygame.init()
+        benchmarks += [('render', name, _render(view)) for name, view in _views().items()]
+
+    for group, name, bench in benchmarks:
+        for size in sizes:
+            if name in ('display_full', 'display_dirty') and size * BOX_SIZE > 4000:
+                continue  # The window (and its surfaces) would cover the whole maze.
+            for players_number in players:
+                for bombs in (False, True):
+                    selected.append((Case(group, name, size, players_number, bombs), bench))
+    return selected
+
+
+def scaling(results: Dict[Case, float]):
+    """Print, for each benchmark, its time against the size of the maze and the fitted exponent."""
+    print("\nScaling with the size of the maze (time per operation, exponent of size):")
+    series: Dict[Tuple, List[Tuple[int, float]]] = {}
+    for case, duration in results.items():
+        series.setdefault((case.group, case.name, case.players, case.bombs), []).append((case.size, duration))
+    for (group, name, players, bombs), points in sorted(series.items()):
+        points.sort()
+        curve = '  '.join(f"{size}:{duration * 1e6:.1f}us" for size, duration in points)
+        exponent = ''
+        if len(points) > 1 and points[0][1] > 0:
+            (size_0, time_0), (size_1, time_1) = points[0], points[-1]
+            exponent = f"  ~size^{math.log(time_1 / time_0) / math.log(size_1 / size_0):.2f}"
+        print(f"  {group}/{name} players={players} bombs={int(bombs)}: {curve}{exponent}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the model and the rendering of bomberman.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15, 31, 63, 127, 255])
+    parser.add_argument('--players', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--bots', type=int, default=32, help="Number of bots of the bots benchmarks.")
+    parser.add_argument('--groups', nargs='+', default=['model', 'render'], choices=['model', 'render'])
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each benchmark (the best is kept).")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="The baseline file (json).")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the baseline.")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Relative slowdown (normalized) above which a benchmark fails.")
+    args = parser.parse_args()
+
+    calibration = calibrate(args.repeat)
+    print(f"Calibration: {calibration * 1000:.2f}ms")
+
+    results: Dict[Case, float] = {}
+    for case, bench in cases(args.sizes, args.players, args.groups, args.bots):
+        results[case] = measure(bench, case, args.repeat)
+        print(f"{case.key}: {results[case] * 1e6:.2f}us")
+    scaling(results)
+
+    normalized = {case.key: duration / calibration for case, duration in results.items()}
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(normalized, file, indent=2, sort_keys=True)
+        print(f"\nBaseline saved in {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nWARNING: no baseline found ({args.baseline}), nothing compared: "
+              "use --save-baseline to store one.")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    regressions = []
+    for key, value in normalized.items():
+        if key in baseline:
+            ratio = value / baseline[key]
+            if ratio > 1 + args.threshold:
+                regressions.append((key, ratio))
+    ratios = [value / baseline[key] for key, value in normalized.items() if key in baseline]
+    if ratios:
+        median = statistics.median(ratios)
+        print(f"\nCompared with the baseline: median ratio {median:.2f} on {len(ratios)} benchmarks.")
+    for key, ratio in regressions:
+        print(f"REGRESSION {key}: x{ratio:.2f}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
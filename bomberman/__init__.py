@@ -1,11 +1,22 @@
-"""Bomberman game using pygame."""
+"""Bomberman game using pygame.
 
-from . import controller
+The model (and the headless simulation) can be used without pygame:
+the controller and view packages are only imported when accessed.
+"""
+
+import importlib
+
+from . import designpattern
 from . import model
-from . import view
 
 
 from .version import __version__
 
 
 __all__ = ['controller', 'designpattern', 'model', 'view']
+
+
+def __getattr__(name):
+    if name in ('controller', 'view'):
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
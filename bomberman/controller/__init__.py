@@ -1,9 +1,21 @@
 """Controller package.
 
 Use to handle user input
+
+The base and bot modules do not depend on pygame. The control and controller
+modules (keyboard inputs) are only imported when accessed.
 """
 
-from . import control
+import importlib
+
+from . import base
+from . import bot
+
+
+__all__ = ['base', 'bot', 'control', 'controller']
 
 
-__all__ = ['control']
+def __getattr__(name):
+    if name in ('control', 'controller'):
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
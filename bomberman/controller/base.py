@@ -0,0 +1,156 @@
+"""Base controllers of the game.
+
+They drive the model through actions and do not depend on pygame,
+so that the game can be simulated without any display.
+"""
+
+from typing import NamedTuple, Optional
+
+from ..model import danger
+from ..model import events
+from ..model import maze
+from ..model import pathfinding
+from ..model import player
+
+
+class Action(NamedTuple):
+    """Input of a player for a tick.
+
+    Attrs:
+        direction (Optional[player.Direction]): The direction to follow. None to stop.
+        bombs (bool): Whether to drop a bomb.
+    """
+    direction: Optional[player.Direction] = None
+    bombs: bool = False
+
+
+class BaseMazeController:
+    """Controller of a maze, independent of any input device.
+
+    Attrs:
+        maze (maze.Maze): The maze controlled.
+        players (List[BasePlayerController]): Controllers of the players of the maze. The controllers
+            of the players removed from the maze (eliminated, ...) are dropped, and they follow the
+            players of a restored snapshot. (See `snapshots.restore`)
+        recorder: Optional recorder of the inputs, called at the beginning of each tick with this
+            controller, once the players have acted. (See `simulation.replay.InputRecorder`)
+        pathfinder (pathfinding.PathFinder): The path finder of the maze, shared by the bots.
+            Created on first access. (See `bot.new_bot`)
+        danger_map (danger.DangerMap): The danger map of the maze, shared by the bots. Created on first access.
+    """
+    def __init__(self, maze_: maze.Maze):
+        self.maze: maze.Maze = maze_
+        self.players = []
+        self.recorder = None
+        self._pathfinder: Optional[pathfinding.PathFinder] = None
+        self._danger_map: Optional[danger.DangerMap] = None
+
+        for player_ in self.maze.players:
+            self.players.append(self.create_player_controller(player_))
+
+        self.maze.subscribe(events.DeletePlayerEvent, self.on_delete_player)
+        self.maze.subscribe(events.MazeRestoredEvent, self.on_maze_restored)
+
+    @property
+    def pathfinder(self) -> pathfinding.PathFinder:
+        if self._pathfinder is None:
+            self._pathfinder = pathfinding.PathFinder(self.maze)
+        return self._pathfinder
+
+    @property
+    def danger_map(self) -> danger.DangerMap:
+        if self._danger_map is None:
+            self._danger_map = danger.DangerMap(self.maze)
+        return self._danger_map
+
+    def create_player_controller(self, player_: player.Player):
+        return BasePlayerController(player_)
+
+    def new_player(self):
+        """Add a new player in the maze and control it.
+
+        Returns:
+            BasePlayerController: The controller of the new player.
+
+        Raises:
+            maze.MazeFullError: If the max amount of players has been reached.
+        """
+        player_controller = self.create_player_controller(self.maze.new_player())
+        self.players.append(player_controller)
+        return player_controller
+
+    def remove_player(self, player_controller: 'BasePlayerController'):
+        """Remove a player from the maze and stop controlling it. (No-op if it has already been removed)"""
+        self.players = [controller for controller in self.players if controller is not player_controller]
+        self.maze.remove_player(player_controller.player)
+
+    def on_delete_player(self, event_: events.DeletePlayerEvent):
+        if event_.player.alive:  # Restored since. (Deferred event)
+            return
+        self.players = [controller for controller in self.players if controller.player is not event_.player]
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):  # pylint: disable = unused-argument
+        """Drop the controllers of the players gone, and control the players restored."""
+        controllers = {controller.player: controller for controller in self.players}
+        self.players = [
+            controllers.get(player_) or self.create_player_controller(player_) for player_ in self.maze.players
+        ]
+
+    def time_spend(self, delta_time: float):
+        """Spend a tick.
+
+        To be deterministic, the same delta time should always be used. (See `Game.game`)
+        """
+        for player_ in self.players:
+            player_.start_tick()
+        if self.recorder is not None:
+            self.recorder.record(self)
+        for player_ in self.players:
+            player_.time_spend(delta_time)
+        self.maze.time_spend(delta_time)
+
+
+class BasePlayerController:
+    """Controller of a player, independent of any input device.
+
+    Attrs:
+        player (player.Player): The player controlled.
+        current_direction (Optional[player.Direction]): The direction followed by the player.
+        bombs_requested (bool): Whether the player has tried to drop a bomb since the last tick.
+    """
+    def __init__(self, player_: player.Player):
+        self.player = player_
+        self.current_direction = None
+        self.bombs_requested = False
+
+    def start_moving(self, direction: player.Direction):
+        self.current_direction = direction
+
+    def stop_moving(self, direction: player.Direction):
+        if direction == self.current_direction:
+            self.current_direction = None
+
+    def bombs(self):
+        self.player.bombs()
+        self.bombs_requested = True
+
+    def start_tick(self):
+        """Called at the beginning of each tick, before the inputs are recorded.
+
+        Controllers driven by a program (bots) apply their action here.
+        """
+
+    def apply(self, action: Action):
+        """Apply the action of the player for the current tick.
+
+        Args:
+            action (Action): The action to apply.
+        """
+        self.current_direction = action.direction
+        if action.bombs:
+            self.bombs()
+
+    def time_spend(self, delta_time: float):
+        if self.current_direction:
+            self.player.move(delta_time, self.current_direction)
+        self.bombs_requested = False
@@ -0,0 +1,230 @@
+"""Players controlled by the program.
+
+Bots find their way with a `pathfinding.PathFinder`: a search bounded around them for the moving
+or local targets (other players, safe boxes, walls to bomb), and the cached distance fields for the
+fixed goals. They avoid the explosions announced by a `danger.DangerMap`. Both are shared by all
+the bots of a maze. When their goal is walled in by wood, they bomb their way to it.
+They do not depend on pygame.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional, Tuple, Union
+
+from ..model import danger
+from ..model import maze
+from ..model import obstacle
+from ..model import pathfinding
+from ..model import player
+from . import base
+
+from ..model import BOX_SIZE
+
+
+class FixedGoal:
+    """Goal: a fixed box of the maze.
+
+    The bots heading to it follow its distance field, cached and shared by them.
+    """
+    def __init__(self, box: Tuple[int, int]):
+        self.box = box
+
+    def __call__(self, maze_: maze.Maze, player_: player.Player) -> Optional[Tuple[int, int]]:
+        return self.box
+
+
+# A goal gives the box that a bot should reach. (None to stay)
+Goal = Union[FixedGoal, Callable[[maze.Maze, player.Player], Optional[Tuple[int, int]]]]
+
+
+def box_of(player_: player.Player) -> Tuple[int, int]:
+    """Box (i, j) of the center of a player."""
+    x, y = player_.center
+    return int(y // BOX_SIZE), int(x // BOX_SIZE)
+
+
+def nearest_player(maze_: maze.Maze, player_: player.Player) -> Optional[Tuple[int, int]]:
+    """Goal: the box of the closest other player (as the crow flies)."""
+    i, j = box_of(player_)
+    boxes = [box_of(other) for other in maze_.players if other is not player_]
+    return min(boxes, key=lambda box: abs(box[0] - i) + abs(box[1] - j), default=None)
+
+
+def steer(player_: player.Player, box: Tuple[int, int]) -> Optional[player.Direction]:
+    """Direction to take to move the player into an adjacent (or its own) box.
+
+    The player is first aligned with the box across the axis of the move,
+    so that it does not hit the corners of the walls around it.
+    """
+    target = (box[1], box[0])  # (j, i) to match the axes of the positions (x, y).
+    current = box_of(player_)[::-1]
+    axis = 0 if target[0] != current[0] else 1
+    for axis_ in (1 - axis, axis):
+        if player_.pos[axis_] // BOX_SIZE < target[axis_]:
+            return player.Direction((axis_, 1))
+        if (player_.pos[axis_] + player_.size[axis_] - 1) // BOX_SIZE > target[axis_]:
+            return player.Direction((axis_, -1))
+    return None
+
+
+class BotController(base.BasePlayerController):
+    """Controller moving a player towards a goal along the shortest path.
+
+    It has the interface of `controller.PlayerController` and ignores the inputs.
+    The targets that move (other players) or that depend on the box of the bot are searched around it,
+    at most `search_radius` moves away: beyond it, the bot heads to the box of the search that is the
+    closest to its goal (as the crow flies).
+
+    With a danger map, the bot leaves the boxes that will be reached by an explosion for the
+    closest safe box, and does not enter them. It also opens the way to an unreachable goal:
+    it drops a bomb next to the wood wall that brings it closest to the goal (as the crow flies),
+    if it can then reach a safe box before the explosion.
+
+    Attrs:
+        pathfinder (pathfinding.PathFinder): The path finder of the maze, shared by the bots.
+        goal (Goal): Gives the box to reach at each tick.
+        danger_map (Optional[danger.DangerMap]): The danger map of the maze, shared by the bots.
+        search_radius (Optional[int]): Max number of moves of the searches around the bot. (Unbounded if None)
+    """
+    SEARCH_RADIUS = 16
+
+    def __init__(self, player_: player.Player, pathfinder: pathfinding.PathFinder, goal: Goal = nearest_player,
+                 danger_map: Optional[danger.DangerMap] = None, search_radius: Optional[int] = SEARCH_RADIUS):
+        super().__init__(player_)
+        self.pathfinder = pathfinder
+        self.goal = goal
+        self.danger_map = danger_map
+        self.search_radius = search_radius
+
+    def handle_event(self, event) -> bool:  # pylint: disable = unused-argument
+        return False
+
+    def action(self) -> base.Action:
+        """Action of the bot for the current tick."""
+        box = box_of(self.player)
+        if self.danger_map is not None and not self.danger_map.is_safe(*box):
+            return base.Action(steer(self.player, self.escape_move(box) or box))
+
+        target = self.goal(self.player.maze, self.player)
+        if target is None:
+            return base.Action(steer(self.player, box))
+
+        next_box = self.goal_move(box, target)
+        if next_box is None and box != target and self.danger_map is not None:
+            next_box = self.bombing_move(box, target)  # No path to the goal: bomb the wood walls in the way.
+            if next_box == box:
+                return base.Action(steer(self.player, box), self.can_escape(box))
+
+        next_box = next_box or box
+        if self.danger_map is not None and not self.danger_map.is_safe(*next_box):
+            next_box = box  # Wait for the explosion.
+        return base.Action(steer(self.player, next_box))
+
+    def goal_move(self, box: Tuple[int, int], target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Adjacent box to move to from the given one to get closer to the target.
+
+        Returns:
+            Optional[Tuple[int, int]]: None if the box is the target, or if there is no path to it
+                (or, beyond the search radius, to a box closer to it).
+        """
+        if isinstance(self.goal, FixedGoal):
+            return self.pathfinder.next_box(box, target)
+
+        width = self.pathfinder.maze.width
+        goal = self.pathfinder.maze.index(*target)
+        closest, closest_distance = -1, abs(box[0] - target[0]) + abs(box[1] - target[1])
+
+        def visit(index: int, distance: int) -> bool:  # pylint: disable = unused-argument
+            nonlocal closest, closest_distance
+            i, j = divmod(index, width)
+            distance_ = abs(i - target[0]) + abs(j - target[1])
+            if distance_ < closest_distance:
+                closest, closest_distance = index, distance_
+            return index == goal
+
+        parents = self.pathfinder.search(box, self.search_radius, visit)
+        if closest == -1:
+            return None
+        return self.pathfinder.first_move(parents, closest)
+
+    def escape_move(self, box: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Adjacent box to move to from the given one, towards the closest box that no explosion will reach.
+
+        Returns:
+            Optional[Tuple[int, int]]: None if no safe box is reachable within the search radius.
+        """
+        times = self.danger_map.times
+        safe = -1
+
+        def visit(index: int, distance: int) -> bool:  # pylint: disable = unused-argument
+            nonlocal safe
+            if index not in times:
+                safe = index
+                return True
+            return False
+
+        parents = self.pathfinder.search(box, self.search_radius, visit)
+        if safe == -1:
+            return None
+        return self.pathfinder.first_move(parents, safe)
+
+    def bombing_move(self, box: Tuple[int, int], target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Adjacent box to move to from the given one, towards the box next to the wood wall to bomb
+        to get closer to the target. (The given box itself if the bomb should be dropped there)
+
+        The box to bomb from minimizes the number of moves to reach it, plus the distance (as the crow flies)
+        from its wood wall to the target.
+
+        Returns:
+            Optional[Tuple[int, int]]: None if no wood wall is reachable within the search radius.
+        """
+        maze_ = self.pathfinder.maze
+        wood = obstacle.WoodWall.code
+        best, best_index = pathfinding.PathFinder.UNREACHABLE, -1
+
+        def visit(index: int, distance: int) -> bool:
+            nonlocal best, best_index
+            if distance >= best:  # The costs of the boxes further away are at least their distance.
+                return True
+            for neighbour in self.pathfinder.neighbours(index):
+                if maze_.cells[neighbour] == wood:
+                    i, j = divmod(neighbour, maze_.width)
+                    cost = distance + abs(i - target[0]) + abs(j - target[1])
+                    if cost < best:
+                        best, best_index = cost, index
+            return False
+
+        parents = self.pathfinder.search(box, self.search_radius, visit)
+        if best_index == -1:
+            return None
+        return self.pathfinder.first_move(parents, best_index)
+
+    def can_escape(self, box: Tuple[int, int]) -> bool:
+        """Whether a bomb dropped in the box leaves a safe box reachable before its explosion."""
+        bomb = obstacle.Bomb(self.player)  # Not added to the maze: only its rays are computed.
+        ray = set(self.danger_map.ray(bomb))
+        moves = bomb.timeout * self.player.speed // BOX_SIZE - 1  # One box of margin to align the player.
+        times = self.danger_map.times
+        escape = False
+
+        def visit(index: int, distance: int) -> bool:  # pylint: disable = unused-argument
+            nonlocal escape
+            escape = index not in times and index not in ray
+            return escape
+
+        self.pathfinder.search(box, max(int(moves), 0), visit)
+        return escape
+
+    def start_tick(self):
+        self.apply(self.action())
+
+
+def new_bot(maze_controller: base.BaseMazeController, goal: Goal = nearest_player) -> BotController:
+    """Add a new player in the maze, controlled by a bot.
+
+    Raises:
+        maze.MazeFullError: If the max amount of players has been reached.
+    """
+    bot = BotController(maze_controller.maze.new_player(), maze_controller.pathfinder, goal, maze_controller.danger_map)
+    maze_controller.players.append(bot)
+    return bot
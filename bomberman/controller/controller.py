@@ -3,18 +3,17 @@
 Handle all the events.
 """
 
+from typing import Optional
+
 from ..model import maze
 from ..model import player
+from . import base
 from . import control
 
 
-class MazeController:
-    def __init__(self, maze_: maze.Maze):
-        self.maze: maze.Maze = maze_
-        self.players = []
-
-        for player_ in self.maze.players:
-            self.players.append(PlayerController(player_))
+class MazeController(base.BaseMazeController):
+    def create_player_controller(self, player_: player.Player):
+        return PlayerController(player_)
 
     def handle_event(self, event) -> bool:
         """Handle all the events of the maze.
@@ -27,10 +26,9 @@ class MazeController:
         """
         if event.type == control.TypeControl.KEY_DOWN and event.key == control.BaseControl.RETURN:
             try:
-                player_ = self.maze.new_player()
+                self.new_player()
             except maze.MazeFullError:
                 return False
-            self.players.append(PlayerController(player_))
             return True
 
         handled = False
@@ -38,18 +36,17 @@ class MazeController:
             handled |= player_.handle_event(event)
         return handled
 
-    def time_spend(self, delta_time: float):
-        for player_ in self.players:
-            player_.time_spend(delta_time)
-        for bomb in self.maze.bombs:
-            bomb.time_spend(delta_time)
 
+class PlayerController(base.BasePlayerController):
+    def __init__(self, player_: player.Player, player_control: Optional[control.PlayerControl] = None):
+        """Constructor.
 
-class PlayerController:
-    def __init__(self, player_: player.Player):
-        self.player = player_
-        self.player_control = control.PlayerControl.from_id(self.player.id)
-        self.current_direction = None
+        Args:
+            player_ (player.Player): The player controlled.
+            player_control (control.PlayerControl): The keys of the player. Default to the keys of its id.
+        """
+        super().__init__(player_)
+        self.player_control = player_control or control.PlayerControl.from_id(self.player.id)
         self.event_to_direction = {
             self.player_control.up: player.Direction.UP,
             self.player_control.down: player.Direction.DOWN,
@@ -69,23 +66,18 @@ class PlayerController:
         if event.type == control.TypeControl.KEY_DOWN:
             direction = self.event_to_direction.get(event.key, None)
             if direction:
-                self.current_direction = direction
+                self.start_moving(direction)
                 return True
 
             if event.key == self.player_control.bombs:
-                self.player.bombs()
+                self.bombs()
                 return True
             return False
         if event.type == control.TypeControl.KEY_UP:
             direction = self.event_to_direction.get(event.key, None)
 
             if direction:
-                if direction == self.current_direction:
-                    self.current_direction = None
+                self.stop_moving(direction)
                 return True
             return False
         return False
-
-    def time_spend(self, delta_time: float):
-        if self.current_direction:
-            self.player.move(delta_time, self.current_direction)
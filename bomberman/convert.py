@@ -0,0 +1,36 @@
+"""Convert text mazes to the binary format. (See `mazefile`)
+
+Can be used from the command line: `bomberman-convert-maze --help`.
+"""
+
+import argparse
+import glob
+import os
+from typing import Optional
+
+from .model import mazefile
+
+
+def convert(text_file: str, binary_file: Optional[str] = None) -> str:
+    """Convert a text maze.
+
+    Args:
+        text_file (str): The maze in the text format.
+        binary_file (str): The file to write. Default to the text file with the `.bin` extension.
+
+    Returns:
+        str: The binary file written.
+    """
+    binary_file = binary_file or os.path.splitext(text_file)[0] + '.bin'
+    mazefile.save_binary(mazefile.load_text(text_file), binary_file)
+    return binary_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert text mazes to the binary format (next to them).")
+    parser.add_argument('files', nargs='*', help="The text mazes. Default to all the mazes of the data folder.")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'data', 'maze', '*.txt')))
+    for text_file in files:
+        print(f"{text_file} -> {convert(text_file)}")
@@ -1,8 +1,9 @@
 """Defines the main classes used in the observer/observable designe pattern."""
 
 from . import event
+from . import event_queue
 from . import observable
 from . import observer
 
 
-__all__ = ['event', 'observable', 'observer']
+__all__ = ['event', 'event_queue', 'observable', 'observer']
@@ -1,5 +1,7 @@
 """Provides the base Event class, used in our Observer/Observable pattern."""
 
+from __future__ import annotations
+
 
 class MetaEvent(type):
     """Metaclass of all the events.
@@ -14,4 +16,22 @@ class MetaEvent(type):
 
 
 class Event(metaclass=MetaEvent):
+    """Base class of the events.
+
+    Attrs:
+        ID (int): Unique id of the event class.
+        coalescing (bool): Whether successive events of this class from the same observable
+            can be merged when they are deferred. (See `EventQueue`)
+    """
     ID: int
+    coalescing = False
+
+    def merge(self, later: Event) -> Event:
+        """Merge a later event of the same class with this one. (Only for coalescing events)
+
+        By default the later event replaces this one.
+
+        Returns:
+            Event: The merged event.
+        """
+        return later
@@ -0,0 +1,41 @@
+"""Provides the EventQueue used to defer the events of observables."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from . import event
+from . import observable
+
+
+class EventQueue:
+    """Queue of the events of deferred observables. (See `Observable.event_queue`)
+
+    The events are dispatched in one batch when the queue is flushed (Typically once per tick).
+    Successive events of a coalescing type from the same observable are merged (See `Event.merge`),
+    and dispatched at the place of the first one.
+    """
+    def __init__(self):
+        self.events: List[Tuple[observable.Observable, event.Event]] = []
+        self._coalescing: Dict[Tuple[observable.Observable, int], int] = {}  # Position of the pending event.
+
+    def __len__(self):
+        return len(self.events)
+
+    def push(self, observable_: observable.Observable, event_: event.Event):
+        if event_.coalescing:
+            key = (observable_, event_.ID)
+            position = self._coalescing.get(key)
+            if position is not None:
+                self.events[position] = (observable_, self.events[position][1].merge(event_))
+                return
+            self._coalescing[key] = len(self.events)
+        self.events.append((observable_, event_))
+
+    def flush(self):
+        """Dispatch all the events queued (including the ones queued during the flush)."""
+        while self.events:
+            events, self.events = self.events, []
+            self._coalescing = {}
+            for observable_, event_ in events:
+                observable_.dispatch(event_)
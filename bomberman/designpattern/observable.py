@@ -1,16 +1,96 @@
 """Provides the Observable class of the design pattern observer/observable."""
 
-from . import observer
+from __future__ import annotations
+
+from typing import Callable, ClassVar, Counter, Dict, List, Optional, Type
+
 from . import event
+from . import event_queue as event_queue_
+from . import observer
 
 
 class Observable:
+    """Object that notifies events to its observers.
+
+    Observers either receive all the events (`add_observer`) or subscribe
+    a handler to specific event types (`subscribe`). Handlers are dispatched
+    by the `ID` of the event class (exact type, subclasses are not dispatched),
+    so that an event with no interested observer costs nothing.
+
+    If an `event_queue` is set, the events are deferred: they are queued and
+    only dispatched when the queue is flushed.
+
+    The observers and handlers containers are only created when needed, and the class
+    uses `__slots__`, so that unobserved observables (and their subclasses using `__slots__`)
+    stay small.
+
+    Attrs:
+        observers (Optional[List[observer.Observer]]): Observers notified of all the events.
+        handlers (Optional[Dict[int, List[Callable[[event.Event], None]]]]): Handlers subscribed for each event ID.
+        event_queue (Optional[event_queue_.EventQueue]): Queue of the deferred events. None to dispatch immediately.
+        dispatched (Optional[Counter[Type[event.Event]]]): Class attribute. Counts the events dispatched
+            by all the observables, by event class, while set. (See `count_dispatched`)
+    """
+    __slots__ = ('observers', 'handlers', 'event_queue')
+    dispatched: ClassVar[Optional[Counter[Type[event.Event]]]] = None
+
     def __init__(self):
-        self.observers = []
+        self.observers: Optional[List[observer.Observer]] = None
+        self.handlers: Optional[Dict[int, List[Callable[[event.Event], None]]]] = None
+        self.event_queue: Optional[event_queue_.EventQueue] = None
 
     def add_observer(self, observer_: observer.Observer):
+        if self.observers is None:
+            self.observers = []
         self.observers.append(observer_)
 
+    def subscribe(self, event_type: Type[event.Event], handler: Callable[[event.Event], None]):
+        """Call handler for each event of the given type.
+
+        Args:
+            event_type (Type[event.Event]): The class of the events.
+            handler (Callable[[event.Event], None]): Called with the event.
+        """
+        if self.handlers is None:
+            self.handlers = {}
+        self.handlers.setdefault(event_type.ID, []).append(handler)
+
+    def unsubscribe(self, event_type: Type[event.Event], handler: Callable[[event.Event], None]):
+        handlers = self.handlers.get(event_type.ID, []) if self.handlers else []
+        if handler in handlers:
+            handlers.remove(handler)
+
     def changed(self, event_: event.Event):
-        for observer_ in self.observers:
-            observer_.notify(event_)
+        if self.event_queue is not None:
+            self.event_queue.push(self, event_)
+        else:
+            self.dispatch(event_)
+
+    @staticmethod
+    def count_dispatched(counter: Optional[Counter[Type[event.Event]]]):
+        """Count the events dispatched by all the observables in counter, by event class. (None to stop)
+
+        `dispatch` is only replaced by a counting version while counting: it costs nothing otherwise.
+        (See `profiler.FrameProfiler`)
+        """
+        Observable.dispatched = counter
+        if counter is None:
+            Observable.dispatch = Observable._dispatch
+            return
+
+        def dispatch(self, event_: event.Event):
+            counter[event_.__class__] += 1
+            Observable._dispatch(self, event_)
+        Observable.dispatch = dispatch
+
+    def dispatch(self, event_: event.Event):
+        """Notify the event to the observers and the handlers."""
+        if self.observers:
+            for observer_ in self.observers:
+                observer_.notify(event_)
+        handlers = self.handlers.get(event_.ID) if self.handlers else None
+        if handlers:
+            for handler in handlers:
+                handler(event_)
+
+    _dispatch = dispatch  # Restored when the events are no longer counted.
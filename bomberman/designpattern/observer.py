@@ -4,5 +4,10 @@ from . import event
 
 
 class Observer:
+    """Receives all the events of the observables it is added to. (See `Observable.add_observer`)
+
+    To receive only specific event types, subscribe handlers instead (See `Observable.subscribe`):
+    their owners are not observers.
+    """
     def notify(self, event_: event.Event):
         raise NotImplementedError
@@ -0,0 +1,110 @@
+"""Procedural generation of mazes of any size, vectorized with numpy.
+
+The mazes follow the layout of the levels: stone walls on the boxes of odd row and column
+(a lattice of pillars), wood walls at random on the other boxes, and spawn points on boxes
+of even row and column, with the boxes around them cleared of wood walls.
+
+Requires numpy (`pip install bomberman[simulation]`).
+Can also be used from the command line: `bomberman-generate-maze --help`.
+"""
+
+import argparse
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .model import chunks
+from .model import maze
+from .model import mazefile
+
+
+def generate(width: int, height: int, *, seed: Optional[int] = None,  # pylint: disable = too-many-arguments
+             wood_density: float = 0.3, spawns: int = 8, clearance: int = 1) -> np.ndarray:
+    """Generate a maze as the characters of its text format.
+
+    Args:
+        width, height (int, int): Size of the maze in boxes.
+        seed (int): Seed of the random generator. The same seed gives the same maze.
+        wood_density (float): Probability of a wood wall on each box out of the lattice.
+        spawns (int): Number of spawn points.
+        clearance (int): Boxes closer to a spawn point than this (in moves) hold no wood wall.
+
+    Returns:
+        np.ndarray: The character of each box (See `Obstacle.from_char`, 'p' for spawn points). (H, W), uint8
+
+    Raises:
+        ValueError: If there are more spawn points than boxes of even row and column.
+    """
+    rng = np.random.default_rng(seed)
+    grid = place_wood(rng, width, height, wood_density)
+    grid[1::2, 1::2] = ord('s')  # The lattice of pillars.
+    spawn_i, spawn_j = place_spawns(rng, width, height, spawns)
+    clear_spawns(grid, spawn_i, spawn_j, clearance)
+    grid[spawn_i, spawn_j] = ord('p')
+    return grid
+
+
+def place_wood(rng: np.random.Generator, width: int, height: int, wood_density: float) -> np.ndarray:
+    """Grid of characters with wood walls at random, with the given probability on each box."""
+    return np.where(rng.random((height, width)) < wood_density, ord('w'), ord(' ')).astype(np.uint8)
+
+
+def place_spawns(rng: np.random.Generator, width: int, height: int, spawns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Spawn points (i, j): distinct boxes of even row and column, at random.
+
+    Raises:
+        ValueError: If there are more spawn points than boxes of even row and column.
+    """
+    rows, columns = (height + 1) // 2, (width + 1) // 2
+    if spawns > rows * columns:
+        raise ValueError(f"A {width}x{height} maze can not hold {spawns} spawn points.")
+    spawn_i, spawn_j = np.divmod(rng.choice(rows * columns, size=spawns, replace=False), columns)
+    return spawn_i * 2, spawn_j * 2
+
+
+def clear_spawns(grid: np.ndarray, spawn_i: np.ndarray, spawn_j: np.ndarray, clearance: int):
+    """Remove the wood walls closer to a spawn point than clearance (in moves)."""
+    height, width = grid.shape
+    for di in range(-clearance, clearance + 1):
+        for dj in range(abs(di) - clearance, clearance - abs(di) + 1):
+            i, j = spawn_i + di, spawn_j + dj
+            inside = (i >= 0) & (i < height) & (j >= 0) & (j < width)
+            i, j = i[inside], j[inside]
+            cleared = grid[i, j] == ord('w')
+            grid[i[cleared], j[cleared]] = ord(' ')
+
+
+def to_text(grid: np.ndarray) -> bytes:
+    """Text format of a generated maze. (See `mazefile.load_text`)"""
+    height, width = grid.shape
+    lines = np.full((height, width + 1), ord('\n'), dtype=np.uint8)
+    lines[:, :width] = grid
+    return lines.tobytes()[:-1]
+
+
+def to_maze(grid: np.ndarray) -> maze.Maze:
+    """Build the maze of a generated maze."""
+    height, width = grid.shape
+    maze_ = maze.Maze(width, height, bytearray(grid.tobytes().translate(chunks.TEXT_CODES)))
+    maze_.players_initial_positions = [(int(i), int(j)) for i, j in np.argwhere(grid == ord('p'))]
+    return maze_
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a random maze (text format, or binary with .bin).")
+    parser.add_argument('width', type=int)
+    parser.add_argument('height', type=int)
+    parser.add_argument('output', help="The file to write.")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--wood-density', type=float, default=0.3)
+    parser.add_argument('--spawns', type=int, default=8)
+    parser.add_argument('--clearance', type=int, default=1)
+    args = parser.parse_args()
+
+    grid = generate(args.width, args.height, seed=args.seed, wood_density=args.wood_density, spawns=args.spawns,
+                    clearance=args.clearance)
+    if args.output.endswith('.bin'):
+        mazefile.save_binary(to_maze(grid), args.output)
+    else:
+        with open(args.output, 'wb') as file:
+            file.write(to_text(grid))
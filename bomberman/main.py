@@ -1,49 +1,247 @@
-import os
+"""Local game: display, keyboard and program controlled players.
+
+Can also be used from the command line: `bomberman --help`.
+"""
+
+import argparse
+from typing import List, NamedTuple, Optional, Sequence
 
 import pygame
 
 from .controller import control
 from .controller import controller
+from . import profiler
+from .designpattern import event_queue
 from .model import maze
+from .simulation import match_log
+from .simulation import replay
+from .simulation import sandbox
 from .view import maze_view
+from .view import profiler_view
 from .view import view
 
 
+class GameOptions(NamedTuple):
+    """Options of a game. (See `Game.game`)
+
+    Attrs:
+        dirty_rects (bool): Only redraw the areas of the window that have changed.
+            (Not used for mazes larger than the window: the camera redraws the window at each frame)
+        defer_events (bool): Dispatch the events of the model once per frame, before rendering.
+        record (Optional[str]): File in which the inputs are recorded. (See `simulation.replay`)
+        log (Optional[str]): File in which the states of the match are logged. (See `simulation.match_log`)
+        profile (Optional[str]): File (.csv or .json) in which the rolling percentiles of the time spent
+            in each phase of the frames, and of the events dispatched, are exported. (See `profiler`)
+        overlay (bool): Display these measures over the maze. (The frames are profiled)
+        bots (Sequence[Sequence[str]]): Commands of sandboxed bots joining the game, one player each.
+            (See `simulation.sandbox`)
+        bots_timeout (float): Time given to the bots to answer at each tick (in seconds).
+    """
+    dirty_rects: bool = True
+    defer_events: bool = True
+    record: Optional[str] = None
+    log: Optional[str] = None
+    profile: Optional[str] = None
+    overlay: bool = False
+    bots: Sequence[Sequence[str]] = ()
+    bots_timeout: float = 0.01
+
+
+class GameLoop:
+    """Frames of a game: handle the inputs, step the model and render it.
+
+    Attrs:
+        maze_controller (controller.MazeController): The controller of the maze.
+        maze_view (maze_view.MazeView): The view of the maze.
+        queue (Optional[event_queue.EventQueue]): The queue of the deferred events of the maze, flushed at each frame.
+        log_writer (Optional[match_log.MatchLogWriter]): Logs the state of the match at each frame.
+        profiler (Optional[profiler.FrameProfiler]): Measures the phases of each frame.
+        profiler_view (Optional[profiler_view.ProfilerView]): Displays the measures of the profiler.
+        tick (int): Number of steps of the model done.
+    """
+    def __init__(self, maze_controller: controller.MazeController, maze_view_: maze_view.MazeView,
+                 queue: Optional[event_queue.EventQueue] = None):
+        self.maze_controller = maze_controller
+        self.maze_view = maze_view_
+        self.queue = queue
+        self.log_writer: Optional[match_log.MatchLogWriter] = None
+        self.profiler: Optional[profiler.FrameProfiler] = None
+        self.profiler_view: Optional[profiler_view.ProfilerView] = None
+        self.tick = 0
+
+    def profile(self, output: Optional[str] = None, overlay: bool = False):
+        """Profile the frames, export the measures to output (if any) and display them (if overlay)."""
+        self.profiler = profiler.FrameProfiler(output)
+        self.profiler.enable()
+        if overlay:
+            self.profiler_view = profiler_view.ProfilerView(self.profiler)
+
+    def lap(self, phase: str):
+        if self.profiler is not None:
+            self.profiler.lap(phase)
+
+    def run(self):
+        """Run the frames until the window is closed.
+
+        The real time elapsed is accumulated and consumed by steps of `Game.delta_time`.
+        """
+        timer = pygame.time.Clock()
+        accumulated_time = 0.0
+        while True:
+            if self.profiler is not None:
+                self.profiler.start_frame()
+            if not self.handle_events():
+                return
+            self.lap('events')
+
+            accumulated_time += min(timer.tick(Game.fps) / 1000, Game.max_frame_time)
+            self.lap('wait')
+            while accumulated_time >= Game.delta_time:
+                self.maze_controller.time_spend(Game.delta_time)
+                accumulated_time -= Game.delta_time
+                self.tick += 1
+            self.lap('time_spend')
+
+            if self.queue is not None:
+                self.queue.flush()
+            if self.log_writer is not None:
+                self.log_writer.frame(self.tick)
+            self.lap('dispatch')
+
+            rects = self.display()
+            self.lap('display')
+            pygame.display.update(rects)
+            self.lap('flip')
+            if self.profiler is not None:
+                self.profiler.end_frame()
+
+    def handle_events(self) -> bool:
+        """Handle the inputs. Returns False if the window is closed."""
+        for event in pygame.event.get():
+            if event.type == control.TypeControl.QUIT:
+                return False
+            self.maze_controller.handle_event(event)
+        return True
+
+    def display(self) -> List[pygame.Rect]:
+        """Draw the maze (and the overlay). Returns the areas of the window updated."""
+        if self.profiler_view is None:
+            return self.maze_view.display()
+        if self.profiler_view.image:
+            self.maze_view.mark_dirty(self.profiler_view.pos, self.profiler_view.image.get_size())
+        return self.maze_view.display() + self.profiler_view.display()
+
+    def close(self):
+        if self.log_writer is not None:
+            self.log_writer.close()
+        if self.profiler is not None:
+            self.profiler.close()
+
+
 class Game:
+    """The game.
+
+    The model is stepped with a fixed delta time: the real time elapsed is accumulated
+    and consumed by steps of `delta_time`, so that a game can be replayed exactly.
+    """
     name = 'Bomberman'
+    fps = 48
+    delta_time = 1 / 48
+    max_frame_time = 0.25  # Do not try to catch up more than this at once.
+    max_window_size = (1200, 800)  # Larger mazes are displayed through a camera.
+
     @staticmethod
-    def menu():
-        return Game.game(input("Enter the level id: "))
+    def menu(options: GameOptions = GameOptions()):
+        return Game.game(input("Enter the level id: "), options)
 
     @staticmethod
-    def game(maze_id):
-        path = os.path.join(os.path.dirname(__file__), 'data', 'maze', f'{maze_id}.txt')
-        maze_ = maze.Maze.from_file(path)
+    def game(maze_id, options: GameOptions = GameOptions()):
+        """Play a level.
 
-        pygame.display.set_mode(maze_.size)
-        pygame.display.set_caption(f'{Game.name} - level {maze_id}')
-        pygame.display.set_icon(view.View.load_image('boom.png', (10, 10)))
+        Args:
+            maze_id: The id of the maze.
+            options (GameOptions): The options of the game.
+        """
+        maze_ = maze.Maze.from_id(maze_id)
+        queue = None
+        if options.defer_events:
+            queue = event_queue.EventQueue()
+            maze_.defer_events(queue)
 
-        maze_view_ = maze_view.MazeView(maze_)
-        maze_controller = controller.MazeController(maze_)
+        maze_view_ = Game.open_window(maze_id, maze_, options.dirty_rects)
+        loop = GameLoop(controller.MazeController(maze_), maze_view_, queue)
+        if options.record:
+            loop.maze_controller.recorder = replay.InputRecorder(maze_id, Game.delta_time)
+        if options.log:
+            loop.log_writer = match_log.MatchLogWriter(options.log, maze_, Game.delta_time)
+        pool = None
+        try:
+            pool = Game.start_bots(loop.maze_controller, options.bots, options.bots_timeout)
+            if options.profile or options.overlay:
+                loop.profile(options.profile, options.overlay)
+            loop.run()
+        finally:  # Stop the bots and keep what has been recorded, even if the game crashes.
+            loop.close()
+            if pool is not None:
+                pool.close()
+            if options.record:
+                loop.maze_controller.recorder.log.save(options.record)
 
-        running = True
-        timer = pygame.time.Clock()
-        while running:
-            for event in pygame.event.get():
-                if event.type == control.TypeControl.QUIT:
-                    running = False
-                    break
-                maze_controller.handle_event(event)
+    @staticmethod
+    def open_window(maze_id, maze_: maze.Maze, dirty_rects: bool = True) -> maze_view.MazeView:
+        """Open the window of a maze. Returns the view of the maze to display in it."""
+        window_size = (min(maze_.size[0], Game.max_window_size[0]), min(maze_.size[1], Game.max_window_size[1]))
+        pygame.display.set_mode(window_size)
+        pygame.display.set_caption(f'{Game.name} - level {maze_id}')
+        pygame.display.set_icon(view.View.load_image('boom.png', (10, 10)))
 
-            delta_time = timer.tick(48)/1000
-            maze_controller.time_spend(delta_time)
+        if window_size != maze_.size:
+            return maze_view.CameraMazeView(maze_)
+        if dirty_rects:
+            return maze_view.DirtyMazeView(maze_)
+        return maze_view.MazeView(maze_)
 
-            maze_view_.display()
-            pygame.display.flip()
+    @staticmethod
+    def start_bots(maze_controller: controller.MazeController, bots: Sequence[Sequence[str]],
+                   timeout: float) -> Optional[sandbox.BotPool]:
+        """Add a player for each sandboxed bot, and wait for the bots to be ready. (None if there is no bot)"""
+        if not bots:
+            return None
+        pool = sandbox.BotPool(maze_controller.maze, Game.delta_time, timeout)
+        try:
+            for command in bots:
+                sandbox.new_sandboxed_player(maze_controller, pool, command)
+            pool.wait_ready()
+        except BaseException:
+            pool.close()  # Stop the bots already started.
+            raise
+        return pool
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Play bomberman.")
+    parser.add_argument('maze', nargs='?', help="Id of the maze. (Asked if not given)")
+    parser.add_argument('--record', help="File in which the inputs are recorded. (See bomberman-replay)")
+    parser.add_argument('--log', help="File in which the states of the match are logged.")
+    parser.add_argument('--profile', help="File (.csv or .json) in which the measures of the frames are exported.")
+    parser.add_argument('--overlay', action='store_true', help="Display the measures of the frames over the maze.")
+    parser.add_argument('--bot', action='append', default=[], metavar='MODULE:FACTORY',
+                        help="Python bot joining the game in its own process. (Can be repeated, POSIX only)")
+    parser.add_argument('--bots-timeout', type=float, default=GameOptions().bots_timeout,
+                        help="Time given to the bots to answer at each tick (in seconds).")
+    args = parser.parse_args()
+    options = GameOptions(
+        record=args.record,
+        log=args.log,
+        profile=args.profile,
+        overlay=args.overlay,
+        bots=[sandbox.worker_command(factory) for factory in args.bot],
+        bots_timeout=args.bots_timeout,
+    )
+
     assert pygame.init() == (6, 0)
-    Game.menu()
+    if args.maze is None:
+        Game.menu(options)
+    else:
+        Game.game(args.maze, options)
     pygame.quit()
@@ -3,12 +3,18 @@
 Defines all the data classes used in it.
 """
 
-__all__ = ['maze', 'obstacle', 'player']
+__all__ = ['blast', 'chunks', 'danger', 'delta', 'maze', 'obstacle', 'pathfinding', 'player', 'scheduler']
 
 BOX_SIZE = 50
 
 
 # pylint: disable = wrong-import-position
+from . import blast
+from . import chunks
+from . import danger
+from . import delta
 from . import maze
 from . import obstacle
+from . import pathfinding
 from . import player
+from . import scheduler
@@ -0,0 +1,92 @@
+"""Explosion of the bombs: rays and chain reactions.
+
+The bombs to detonate are processed from a work queue (no recursion), so that
+a chain of bombs is resolved in a single call, in a time linear in the boxes touched.
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import Iterable, Iterator, Set, Tuple
+
+from . import maze
+from . import obstacle
+from . import player
+
+from . import BOX_SIZE
+
+
+def explode(maze_: maze.Maze, bombs: Iterable[obstacle.Bomb]) -> Set[Tuple[int, int]]:
+    """Detonate bombs and all the bombs reached by their rays.
+
+    Each bomb sends a ray of `radius` boxes in the four directions. A ray stops at the first
+    obstacle or bomb it reaches: a bomb is detonated in turn, an obstacle is bombed (and destroyed
+    if it does not resist bombs). Boxes emptied by the explosion still stop the rays, so that the
+    result does not depend on the order in which the bombs are processed.
+
+    Once the chain is resolved, the players whose center is in a box reached are eliminated
+    (removed from the maze).
+
+    Args:
+        maze_ (maze.Maze): The maze holding the bombs.
+        bombs (Iterable[obstacle.Bomb]): The bombs to detonate.
+
+    Returns:
+        Set[Tuple[int, int]]: The boxes (i, j) reached by the explosion.
+    """
+    queue = collections.deque()
+    stops = set()  # Boxes of the obstacles and bombs already reached.
+    for bomb in bombs:
+        if (bomb.i, bomb.j) not in stops:
+            stops.add((bomb.i, bomb.j))
+            queue.append(bomb)
+
+    boxes = set()
+    while queue:
+        bomb = queue.popleft()
+        bomb.explode()
+        boxes.add((bomb.i, bomb.j))
+
+        for direction in player.Direction:
+            for i, j in ray(maze_, bomb, direction):
+                boxes.add((i, j))
+                if (i, j) in stops:
+                    break
+
+                other = maze_.bomb_in(i, j)
+                if other:
+                    stops.add((i, j))
+                    queue.append(other)
+                    break
+
+                obstacle_ = maze_.obstacle_in(i, j)
+                if obstacle_:
+                    stops.add((i, j))
+                    obstacle_.bombed()
+                    break
+
+    for player_ in [player_ for player_ in maze_.players if _box_of(player_) in boxes]:
+        maze_.remove_player(player_)
+
+    return boxes
+
+
+def ray(maze_: maze.Maze, bomb: obstacle.Bomb, direction: player.Direction) -> Iterator[Tuple[int, int]]:
+    """Boxes (i, j) of the ray of a bomb in a direction: up to `radius` boxes, inside the maze.
+
+    The ray is not stopped by the obstacles: the caller stops iterating at the first one.
+    (Shared by `explode` and `danger.DangerMap`)
+    """
+    axis, sign = direction.value
+    i, j = bomb.i, bomb.j
+    for _ in range(bomb.radius):
+        i += sign * (axis == 1)
+        j += sign * (axis == 0)
+        if not maze_.is_inside(i, j):
+            return
+        yield i, j
+
+
+def _box_of(player_: player.Player) -> Tuple[int, int]:
+    x, y = player_.center
+    return int(y // BOX_SIZE), int(x // BOX_SIZE)
@@ -0,0 +1,234 @@
+"""Cells of very large mazes, loaded lazily by chunks from their text file.
+
+The file is memory mapped: a chunk (a square of boxes) is only parsed when one of its boxes
+is accessed, and the chunks far from the players and the camera are evicted. The changes of the evicted
+chunks that have been modified are kept in compact deltas, and applied again when they are reloaded.
+"""
+
+from __future__ import annotations
+
+import array
+import mmap
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from . import obstacle
+
+
+INVALID = 255
+
+# Character of the text format -> type code of the cell. (Spawn points are empty boxes)
+TEXT_CODES = bytearray([INVALID]) * 256
+TEXT_CODES[ord(' ')] = 0
+TEXT_CODES[ord('p')] = 0
+for _char in ('s', 'w'):
+    TEXT_CODES[ord(_char)] = obstacle.Obstacle.from_char(_char).code
+TEXT_CODES = bytes(TEXT_CODES)
+
+# Changes of a chunk from its file: offsets of the cells changed in the chunk (array of 'I'), and their codes.
+Delta = Tuple[bytes, bytes]
+
+
+class ChunkedCells:
+    """Cells of a maze (See `Maze.cells`) parsed from its text file by chunks, when accessed.
+
+    They are indexed like the bytearray of the cells, by `i * width + j`. Iterating over
+    them (or converting them to bytes) reads the whole file without keeping the chunks.
+
+    All the lines of the file should have the same length.
+
+    Attrs:
+        width, height (int, int): Size of the maze in boxes.
+        chunk_size (int): Number of boxes on each side of a chunk.
+        chunks (Dict[Tuple[int, int], bytearray]): The chunks loaded, by chunk indexes.
+            (Rows of `chunk_size` cells, padded at the borders of the maze)
+        modified (Set[Tuple[int, int]]): The chunks modified since the loading of the maze. Each one is
+            either loaded, or evicted with its changes kept in `deltas`.
+        deltas (Dict[Tuple[int, int], Delta]): Changes of the modified chunks evicted.
+        camera (Optional[Tuple[int, int, int, int]]): Boxes (first_i, first_j, last_i, last_j) displayed
+            by a camera, if any. Their chunks are retained with the ones around the boxes given to `retain`.
+    """
+    def __init__(self, file_name: str, chunk_size: int = 64):
+        """Constructor.
+
+        Raises:
+            ValueError: If the lines of the file do not have the same length.
+        """
+        with open(file_name, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.width = self.data.find(b'\n')
+        if self.width < 0:
+            self.width = len(self.data)
+        self.stride = self.width + 1
+        self.height = (len(self.data) + 1) // self.stride
+        if len(self.data) not in (self.height * self.stride - 1, self.height * self.stride):
+            raise ValueError("All the lines of the maze should have the same length.")
+
+        self.chunk_size = chunk_size
+        self.chunks: Dict[Tuple[int, int], bytearray] = {}
+        self.modified: Set[Tuple[int, int]] = set()
+        self.deltas: Dict[Tuple[int, int], Delta] = {}
+        self.camera: Optional[Tuple[int, int, int, int]] = None
+        # Chunks of the boxes and of the camera at the last `retain`. (None if chunks have been loaded since)
+        self._retained: Optional[tuple] = None
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __getitem__(self, index: int) -> int:
+        i, j = divmod(index, self.width)
+        size = self.chunk_size
+        key = (i // size, j // size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.load(*key)
+        return chunk[(i % size) * size + j % size]
+
+    def __setitem__(self, index: int, code: int):
+        i, j = divmod(index, self.width)
+        size = self.chunk_size
+        key = (i // size, j // size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.load(*key)
+        chunk[(i % size) * size + j % size] = code
+        self.modified.add(key)
+
+    def __iter__(self) -> Iterator[int]:
+        for i in range(self.height):
+            yield from self.row(i)
+
+    def __bytes__(self):
+        return b''.join(self.row(i) for i in range(self.height))
+
+    def row(self, i: int) -> bytes:
+        """Cells of the i-th row of the maze."""
+        row = self.data[i * self.stride:i * self.stride + self.width].translate(TEXT_CODES)
+        if INVALID in row:
+            raise ValueError(f"Invalid character in the row {i} of the maze.")
+
+        size = self.chunk_size
+        ci = i // size
+        modified = [key for key in self.modified if key[0] == ci]
+        if not modified:
+            return row
+        row = bytearray(row)
+        offset = (i % size) * size
+        for key in modified:
+            start = key[1] * size
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                stop = min(self.width, start + size)
+                row[start:stop] = chunk[offset:offset + stop - start]
+                continue
+            offsets, codes = self.deltas[key]
+            for cell, code in zip(memoryview(offsets).cast('I'), codes):
+                if offset <= cell < offset + size:
+                    row[start + cell - offset] = code
+        return bytes(row)
+
+    def load(self, ci: int, cj: int) -> bytearray:
+        """Load the chunk (ci, cj): parse it from the file, and apply its changes if it has been evicted.
+
+        Raises:
+            ValueError: If the chunk holds an invalid character.
+        """
+        chunk = self.parse(ci, cj)
+        delta = self.deltas.pop((ci, cj), None)
+        if delta is not None:
+            for cell, code in zip(memoryview(delta[0]).cast('I'), delta[1]):
+                chunk[cell] = code
+        self.chunks[ci, cj] = chunk
+        self._retained = None
+        return chunk
+
+    def parse(self, ci: int, cj: int) -> bytearray:
+        """Cells of the chunk (ci, cj) in the file.
+
+        Raises:
+            ValueError: If the chunk holds an invalid character.
+        """
+        size = self.chunk_size
+        chunk = bytearray(size * size)
+        start = cj * size
+        stop = min(self.width, start + size)
+        for row, i in enumerate(range(ci * size, min(self.height, (ci + 1) * size))):
+            offset = i * self.stride
+            chunk[row * size:row * size + stop - start] = self.data[offset + start:offset + stop].translate(TEXT_CODES)
+        if INVALID in chunk:
+            raise ValueError(f"Invalid character in the chunk {(ci, cj)} of the maze.")
+        return chunk
+
+    def evict(self, ci: int, cj: int):
+        """Unload the chunk (ci, cj). If it has been modified, its changes are kept in `deltas`."""
+        chunk = self.chunks.pop((ci, cj))
+        if (ci, cj) not in self.modified:
+            return
+        original = self.parse(ci, cj)
+        offsets = array.array('I', (cell for cell, code in enumerate(chunk) if code != original[cell]))
+        if offsets:
+            self.deltas[ci, cj] = (offsets.tobytes(), bytes(chunk[cell] for cell in offsets))
+        else:  # Back to the cells of the file.
+            self.modified.discard((ci, cj))
+
+    def spawns(self) -> List[Tuple[int, int]]:
+        """Boxes of the spawn points ('p') of the file, in reading order."""
+        spawns = []
+        offset = self.data.find(b'p')
+        while offset >= 0:
+            spawns.append(divmod(offset, self.stride))
+            offset = self.data.find(b'p', offset + 1)
+        return spawns
+
+    def retain(self, boxes: Iterable[Tuple[int, int]], radius: int = 2):
+        """Load the chunks around the given boxes and the chunks of the camera, and evict the others.
+
+        The chunks loaded since the last call by other accesses (explosions, ...) are evicted too.
+        Nothing is done if no chunk has been loaded, and if the boxes and the camera are in the same
+        chunks as at the last call.
+
+        Args:
+            boxes (Iterable[Tuple[int, int]]): The boxes (i, j) of interest (players, ...).
+            radius (int): Number of chunks kept around each box.
+        """
+        size = self.chunk_size
+        centers = frozenset((i // size, j // size) for i, j in boxes)
+        camera = None if self.camera is None else tuple(box // size for box in self.camera)
+        if self._retained == (centers, camera, radius):
+            return
+
+        kept = set()
+        for ci, cj in centers:
+            kept.update((ci + di, cj + dj) for di in range(-radius, radius + 1) for dj in range(-radius, radius + 1))
+        if camera is not None:
+            first_ci, first_cj, last_ci, last_cj = camera
+            kept.update((ci, cj) for ci in range(first_ci, last_ci + 1) for cj in range(first_cj, last_cj + 1))
+        kept = {key for key in kept if 0 <= key[0] * size < self.height and 0 <= key[1] * size < self.width}
+
+        for key in [key for key in self.chunks if key not in kept]:
+            self.evict(*key)
+        for key in kept:
+            if key not in self.chunks:
+                self.load(*key)
+        self._retained = (centers, camera, radius)
+
+    def snapshot(self) -> Dict[Tuple[int, int], Union[bytes, Delta]]:
+        """State of the modified chunks: a copy of the loaded ones, the delta of the evicted ones.
+
+        (The other chunks are the ones of the file)
+        """
+        return {key: bytes(self.chunks[key]) if key in self.chunks else self.deltas[key] for key in self.modified}
+
+    def restore(self, snapshot: Dict[Tuple[int, int], Union[bytes, Delta]]):
+        for key in self.modified - snapshot.keys():
+            self.chunks.pop(key, None)
+            self.deltas.pop(key, None)
+        for key, state in snapshot.items():
+            if isinstance(state, bytes):
+                self.chunks[key] = bytearray(state)
+                self.deltas.pop(key, None)
+            else:
+                self.chunks.pop(key, None)
+                self.deltas[key] = state
+        self.modified = set(snapshot)
+        self._retained = None  # Reload the chunks retained that have been dropped.
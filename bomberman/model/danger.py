@@ -0,0 +1,187 @@
+"""Danger of the boxes of a maze: when they will be reached by an explosion.
+
+The map follows the model events and is updated incrementally: adding or removing a bomb or a wall
+only recomputes the rays that cross its box, and the detonation times of the bombs chained with them.
+(Same rules as `blast.explode`: a ray stops at the first obstacle or bomb it reaches, and reached
+bombs explode at the same time)
+"""
+
+from __future__ import annotations
+
+import collections
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Set
+
+from . import blast
+from . import events
+from . import follower
+from . import maze
+from . import obstacle
+from . import player
+
+
+class DangerMap(follower.MazeFollower):
+    """Earliest detonation time of each box of a maze.
+
+    The times are the deadlines of the bombs on the game time: a box is reached at the first
+    tick after its time. Chain reactions are taken into account, walls destroyed before are not.
+
+    Attrs:
+        maze (maze.Maze): The maze.
+        times (Dict[int, float]): Earliest game time at which each box is reached by an explosion,
+            indexed by `i * width + j`. Only the boxes reached by a ray are held. (See `time_at`)
+        rays (Dict[obstacle.Bomb, List[int]]): Indexes of the boxes reached by each bomb (its box first).
+        detonations (Dict[obstacle.Bomb, float]): Detonation time of each bomb, chain reactions included.
+        covering (Dict[int, Set[obstacle.Bomb]]): Bombs whose rays reach each box, by index.
+    """
+    def __init__(self, maze_: maze.Maze):
+        super().__init__(maze_)
+        self.times: Dict[int, float] = {}
+        self.rays: Dict[obstacle.Bomb, List[int]] = {}
+        self.detonations: Dict[obstacle.Bomb, float] = {}
+        self.covering: Dict[int, Set[obstacle.Bomb]] = collections.defaultdict(set)
+        self.update(self.maze.bombs)
+
+    def time_at(self, i: int, j: int) -> float:
+        """Game time at which the box (i, j) is reached by an explosion. (Infinite if none)"""
+        return self.times.get(self.maze.index(i, j), math.inf)
+
+    def time_left(self, i: int, j: int) -> float:
+        """Time before the box (i, j) is reached by an explosion. (Infinite if none)"""
+        return self.times.get(self.maze.index(i, j), math.inf) - self.maze.time
+
+    def is_safe(self, i: int, j: int, duration: Optional[float] = None) -> bool:
+        """Whether the box (i, j) is not reached by an explosion in the next `duration` seconds. (Ever if None)"""
+        if duration is None:
+            return self.maze.index(i, j) not in self.times
+        return self.times.get(self.maze.index(i, j), math.inf) - self.maze.time > duration
+
+    def ray(self, bomb: obstacle.Bomb) -> List[int]:
+        """Indexes of the boxes reached by the rays of a bomb in the current maze."""
+        maze_ = self.maze
+        boxes = [maze_.index(bomb.i, bomb.j)]
+        for direction in player.Direction:
+            for i, j in blast.ray(maze_, bomb, direction):
+                index = maze_.index(i, j)
+                boxes.append(index)
+                if maze_.cells[index] or index in maze_.bomb_grid:
+                    break
+        return boxes
+
+    def update(self, bombs: Iterable[obstacle.Bomb]):
+        """Recompute the rays of the given bombs, and the times of the bombs and boxes chained with them.
+
+        Bombs no longer in the maze are dropped.
+        """
+        boxes = set()
+        seeds = self._cast(bombs, boxes)
+        chained = self._chain(seeds, boxes)
+        self._detonate(chained)
+        for bomb in chained:
+            boxes.update(self.rays[bomb])
+        for index in boxes:
+            covering = self.covering.get(index)
+            if covering:
+                self.times[index] = min(self.detonations[bomb] for bomb in covering)
+            else:
+                self.times.pop(index, None)
+                self.covering.pop(index, None)
+
+    def _cast(self, bombs: Iterable[obstacle.Bomb], boxes: Set[int]) -> List[obstacle.Bomb]:
+        """Recompute the rays of the bombs (dropped if they are no longer in the maze).
+
+        Args:
+            bombs (Iterable[obstacle.Bomb]): The bombs.
+            boxes (Set[int]): Indexes of the boxes whose time may change. The boxes of the former rays are added.
+
+        Returns:
+            List[obstacle.Bomb]: The bombs, and the bombs chained with them before the update.
+        """
+        seeds = []
+        for bomb in bombs:
+            seeds.append(bomb)
+            seeds.extend(self._chained(bomb))
+            boxes.update(self._drop(bomb))
+            if bomb in self.maze.bombs:
+                self.rays[bomb] = self.ray(bomb)
+                for index in self.rays[bomb]:
+                    self.covering[index].add(bomb)
+        return seeds
+
+    def _chain(self, seeds: List[obstacle.Bomb], boxes: Set[int]) -> Set[obstacle.Bomb]:
+        """Bombs of the maze chained (in any direction) with the seeds: their detonation times may change.
+
+        The bombs already removed (whose event is deferred) are dropped, and their boxes added to boxes.
+        """
+        chained = set()
+        queue = collections.deque(seeds)
+        while queue:
+            bomb = queue.popleft()
+            if bomb in chained or bomb not in self.rays:
+                continue
+            queue.extend(self._chained(bomb))
+            if bomb in self.maze.bombs:
+                chained.add(bomb)
+            else:
+                boxes.update(self._drop(bomb))
+        return chained
+
+    def _detonate(self, chained: Set[obstacle.Bomb]):
+        """Propagate the earliest deadlines along the rays of the bombs. (Dijkstra with null weights)"""
+        heap = [(self._deadline(bomb), id(bomb), bomb) for bomb in chained]
+        heapq.heapify(heap)
+        for bomb in chained:
+            self.detonations.pop(bomb, None)
+        while heap:
+            time, _, bomb = heapq.heappop(heap)
+            if bomb in self.detonations:
+                continue
+            self.detonations[bomb] = time
+            for index in self.rays[bomb][1:]:
+                for other in self._bombs_in(index):
+                    if other not in self.detonations:
+                        heapq.heappush(heap, (time, id(other), other))
+
+    def _chained(self, bomb: obstacle.Bomb) -> List[obstacle.Bomb]:
+        """Bombs whose rays reach the bomb, and bombs reached by its rays."""
+        ray = self.rays.get(bomb)
+        if ray is None:
+            return []
+        return [*self.covering[ray[0]], *(other for index in ray[1:] for other in self._bombs_in(index))]
+
+    def _deadline(self, bomb: obstacle.Bomb) -> float:
+        scheduler = self.maze.scheduler
+        return scheduler.deadline(bomb) if bomb in scheduler else self.maze.time  # Unscheduled: exploding.
+
+    def _bombs_in(self, index: int) -> List[obstacle.Bomb]:
+        bomb = self.maze.bomb_grid.get(index)
+        return [bomb] if bomb is not None and bomb in self.rays else []
+
+    def _drop(self, bomb: obstacle.Bomb) -> List[int]:
+        """Forget the rays of a bomb. Returns the boxes they reached."""
+        ray = self.rays.pop(bomb, [])
+        for index in ray:
+            self.covering[index].discard(bomb)
+        self.detonations.pop(bomb, None)
+        return ray
+
+    def obstacle_changed(self, obstacle_: obstacle.Obstacle):
+        """Update the rays crossing the box of an obstacle added or removed (and the rays of the bomb)."""
+        bombs = list(self.covering.get(self.maze.index(obstacle_.i, obstacle_.j), ()))
+        if isinstance(obstacle_, obstacle.Bomb):
+            bombs.append(obstacle_)
+        self.update(bombs)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        self.obstacle_changed(event_.obstacle)
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        self.obstacle_changed(event_.obstacle)
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):  # pylint: disable = unused-argument
+        self.times.clear()
+        self.rays.clear()
+        self.detonations.clear()
+        self.covering.clear()
+        self.update(self.maze.bombs)
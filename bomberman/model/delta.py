@@ -0,0 +1,215 @@
+"""Compact binary deltas of the state of a maze, built from the model events.
+
+A delta is a sequence of operations (new, moved and deleted players, new and deleted walls and bombs).
+They are used to log a match (See `simulation.match_log`) and to broadcast the state of a networked
+game (See `network`). A keyframe is the full state of a maze: its cells followed by the operations
+that add its players and bombs.
+
+Applying an operation that is already part of the state is a no-op, so that a keyframe can be
+followed by a delta that overlaps it.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import events
+from . import maze
+from . import obstacle
+from . import player
+
+
+# Operations, with the layout of their arguments.
+NEW_PLAYER = 1  # player id, x, y
+MOVE_PLAYER = 2  # player id, x, y
+DELETE_PLAYER = 3  # player id
+NEW_WALL = 4  # code, i, j
+DELETE_WALL = 5  # i, j
+NEW_BOMB = 6  # owner id, i, j, radius, deadline (game time)
+DELETE_BOMB = 7  # i, j
+
+OPERATIONS = {
+    NEW_PLAYER: struct.Struct('<Bdd'),
+    MOVE_PLAYER: struct.Struct('<Bdd'),
+    DELETE_PLAYER: struct.Struct('<B'),
+    NEW_WALL: struct.Struct('<BHH'),
+    DELETE_WALL: struct.Struct('<HH'),
+    NEW_BOMB: struct.Struct('<BHHBd'),
+    DELETE_BOMB: struct.Struct('<HH'),
+}
+
+
+def pack(operation: int, *args) -> bytes:
+    return bytes((operation,)) + OPERATIONS[operation].pack(*args)
+
+
+def unpack(data, offset: int = 0, end: Optional[int] = None):
+    """Iterate over the operations stored in data[offset:end].
+
+    Yields:
+        Tuple[int, tuple]: The operation and its arguments.
+    """
+    end = len(data) if end is None else end
+    while offset < end:
+        operation = data[offset]
+        layout = OPERATIONS[operation]
+        yield operation, layout.unpack_from(data, offset + 1)
+        offset += 1 + layout.size
+
+
+def keyframe(maze_: maze.Maze) -> bytes:
+    """Full state of a maze: its cells, then its players and bombs as operations."""
+    operations = [bytes(maze_.cells)]
+    for player_ in maze_.players:
+        operations.append(pack(NEW_PLAYER, player_.id, *player_.pos))
+    for bomb in maze_.bombs:
+        operations.append(pack(NEW_BOMB, bomb.player.id, bomb.i, bomb.j, bomb.radius, maze_.time + bomb.time_to_leave))
+    return b''.join(operations)
+
+
+def from_keyframe(width: int, height: int, data, time: float = 0.0) -> maze.Maze:
+    """Build a maze from a keyframe, taken at the given game time.
+
+    Bombs never explode in it: it mirrors a remote state. Its time should follow the remote one,
+    so that the time left before the explosions is the remote one. (See `obstacle.Bomb.time_to_leave`)
+    """
+    maze_ = maze.Maze(width, height)
+    maze_.scheduler.time = time
+    maze_.cells[:] = data[:width * height]
+    apply(maze_, data, width * height)
+    return maze_
+
+
+def apply(maze_: maze.Maze, data, offset: int = 0, end: Optional[int] = None):
+    """Apply the operations stored in data[offset:end] to a maze, through its methods (and events).
+
+    The bombs are scheduled at their remote deadline. The bombs whose owner is not in the maze
+    (eliminated since) are given a placeholder owner, that is not added to the maze.
+    """
+    players: Dict[int, player.Player] = {player_.id: player_ for player_ in maze_.players}
+    for operation, args in unpack(data, offset, end):
+        _HANDLERS[operation](maze_, players, args)
+
+
+def _move_player(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):
+    """NEW_PLAYER and MOVE_PLAYER: the player is added if it is not in the maze."""
+    player_ = players.get(args[0])
+    if player_ is None:
+        player_ = player.Player(args[0], 0, 0)
+        player_.pos = (args[1], args[2])
+        maze_.add_player(player_)
+        players[player_.id] = player_
+    else:
+        player_.set_pos((args[1], args[2]))
+
+
+def _delete_player(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):
+    player_ = players.pop(args[0], None)
+    if player_ is not None:
+        maze_.remove_player(player_)
+
+
+def _new_wall(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):  # pylint: disable = unused-argument
+    maze_.add_obstacle(obstacle.Obstacle.from_code(args[0])(args[1], args[2]))
+
+
+def _delete_wall(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):  # pylint: disable = unused-argument
+    obstacle_ = maze_.obstacle_in(*args)
+    if obstacle_ is not None:
+        maze_.remove_obstacle(obstacle_)
+
+
+def _new_bomb(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):
+    if maze_.bomb_in(args[1], args[2]) is None:
+        owner = players.get(args[0]) or player.Player(args[0], args[1], args[2])
+        bomb = obstacle.Bomb(owner)
+        bomb.i, bomb.j, bomb.radius = args[1], args[2], args[3]
+        maze_.add_bomb(bomb)
+        maze_.scheduler.schedule(bomb, args[4])
+
+
+def _delete_bomb(maze_: maze.Maze, players: Dict[int, player.Player], args: tuple):  # pylint: disable = unused-argument
+    bomb = maze_.bomb_in(*args)
+    if bomb is not None:
+        maze_.remove_bomb(bomb)
+
+
+# Applies an operation (See `apply`), by operation.
+_HANDLERS: Dict[int, Callable[[maze.Maze, Dict[int, player.Player], tuple], None]] = {
+    NEW_PLAYER: _move_player,
+    MOVE_PLAYER: _move_player,
+    DELETE_PLAYER: _delete_player,
+    NEW_WALL: _new_wall,
+    DELETE_WALL: _delete_wall,
+    NEW_BOMB: _new_bomb,
+    DELETE_BOMB: _delete_bomb,
+}
+
+
+class DeltaRecorder:
+    """Gather the changes of a maze as operations, from its events.
+
+    The successive moves of a player are merged. `take` returns the operations since its last call.
+
+    Attrs:
+        maze (maze.Maze): The maze observed.
+        restored (bool): Whether the maze has been restored since the last `take`. (The delta is then
+            not enough to follow the state: a keyframe is needed)
+    """
+    def __init__(self, maze_: maze.Maze):
+        self.maze = maze_
+        self.operations: List[bytes] = []
+        self.moves: Dict[int, Tuple[float, float]] = {}
+        self.restored = False
+
+        self.maze.subscribe(events.NewObstacleEvent, self.on_new_obstacle)
+        self.maze.subscribe(events.DeleteObstacleEvent, self.on_delete_obstacle)
+        self.maze.subscribe(events.NewPlayerEvent, self.on_new_player)
+        self.maze.subscribe(events.DeletePlayerEvent, self.on_delete_player)
+        self.maze.subscribe(events.MazeRestoredEvent, self.on_maze_restored)
+        for player_ in self.maze.players:
+            player_.subscribe(events.PlayerMovedEvent, self.on_player_moved)
+
+    def take(self) -> bytes:
+        """The operations gathered since the last call."""
+        operations = self.operations
+        for player_id, pos in self.moves.items():
+            operations.append(pack(MOVE_PLAYER, player_id, *pos))
+        self.operations = []
+        self.moves = {}
+        self.restored = False
+        return b''.join(operations)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        obstacle_ = event_.obstacle
+        if isinstance(obstacle_, obstacle.Bomb):
+            deadline = self.maze.time + obstacle_.time_to_leave
+            self.operations.append(pack(NEW_BOMB, obstacle_.player.id, obstacle_.i, obstacle_.j, obstacle_.radius,
+                                        deadline))
+        else:
+            self.operations.append(pack(NEW_WALL, obstacle_.code, obstacle_.i, obstacle_.j))
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        obstacle_ = event_.obstacle
+        operation = DELETE_BOMB if isinstance(obstacle_, obstacle.Bomb) else DELETE_WALL
+        self.operations.append(pack(operation, obstacle_.i, obstacle_.j))
+
+    def on_new_player(self, event_: events.NewPlayerEvent):
+        player_: player.Player = event_.player
+        self.operations.append(pack(NEW_PLAYER, player_.id, *player_.pos))
+        player_.subscribe(events.PlayerMovedEvent, self.on_player_moved)
+
+    def on_delete_player(self, event_: events.DeletePlayerEvent):
+        self.moves.pop(event_.player.id, None)
+        self.operations.append(pack(DELETE_PLAYER, event_.player.id))
+        event_.player.unsubscribe(events.PlayerMovedEvent, self.on_player_moved)
+
+    def on_player_moved(self, event_: events.PlayerMovedEvent):
+        self.moves[event_.player.id] = event_.new_pos
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):  # pylint: disable = unused-argument
+        for player_ in self.maze.players:  # Removed players may have been restored.
+            player_.unsubscribe(events.PlayerMovedEvent, self.on_player_moved)
+            player_.subscribe(events.PlayerMovedEvent, self.on_player_moved)
+        self.restored = True
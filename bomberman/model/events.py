@@ -20,10 +20,17 @@ class DeletePlayerEvent(Event):
 
 
 class PlayerMovedEvent(Event):
-    def __init__(self, former_pos: Tuple[float, float], new_pos: Tuple[float, float]):
+    coalescing = True
+
+    def __init__(self, player_: player.Player, former_pos: Tuple[float, float], new_pos: Tuple[float, float]):
+        self.player = player_
         self.former_pos = former_pos
         self.new_pos = new_pos
 
+    def merge(self, later: PlayerMovedEvent) -> PlayerMovedEvent:
+        self.new_pos = later.new_pos
+        return self
+
 
 # class PlayerBlockedEvent(Event):
 #     pass
@@ -41,3 +48,7 @@ class DeleteObstacleEvent(Event):
 
 class ObstacleBombedEvent(Event):
     pass
+
+
+class MazeRestoredEvent(Event):
+    """The whole state of the maze has been restored from a snapshot. (See `snapshots.restore`)"""
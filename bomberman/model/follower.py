@@ -0,0 +1,34 @@
+"""Provides the MazeFollower base class of the caches that follow the obstacles of a maze."""
+
+from . import events
+from . import maze
+
+
+class MazeFollower:
+    """Follows the walls and bombs added to and removed from a maze, and its restorations, from its events.
+
+    Subclasses override the handlers they need. (They do nothing by default)
+
+    Attrs:
+        maze (maze.Maze): The maze followed.
+    """
+    def __init__(self, maze_: maze.Maze):
+        self.maze = maze_
+        self.maze.subscribe(events.NewObstacleEvent, self.on_new_obstacle)
+        self.maze.subscribe(events.DeleteObstacleEvent, self.on_delete_obstacle)
+        self.maze.subscribe(events.MazeRestoredEvent, self.on_maze_restored)
+
+    def close(self):
+        """Stop following the changes of the maze."""
+        self.maze.unsubscribe(events.NewObstacleEvent, self.on_new_obstacle)
+        self.maze.unsubscribe(events.DeleteObstacleEvent, self.on_delete_obstacle)
+        self.maze.unsubscribe(events.MazeRestoredEvent, self.on_maze_restored)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        pass
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        pass
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):
+        pass
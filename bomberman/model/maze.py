@@ -5,12 +5,19 @@ It holds all the data of the game.
 
 from __future__ import annotations
 
-from typing import Tuple
+import os
+from typing import Dict, List, Optional, Tuple, Union
 
+from ..designpattern import event_queue
 from ..designpattern import observable
+from . import blast
+from . import chunks
 from . import events
+from . import mazefile
 from . import obstacle
 from . import player
+from . import scheduler
+from . import snapshots
 
 from . import BOX_SIZE
 
@@ -28,122 +35,236 @@ class Maze(observable.Observable):
         width (int): Number of boxes in a row.
         height (int): Number of boxes in a columns.
         size (Tuple[int, int]): Size in pixel of the maze.
-        players_number (int): Number of players that have joined this maze.
         players_initial_positions (List[Tuple[int, int]]): Available initial positions for players.
+            The player of id k starts at the k-th one.
         players (List[player.Player]): List of the players.
-        obstacles (List[obstacle.Obstacle]): List of the obstacles (except bombs).
-        bombs (List[bomb.Bomb]): List of the bombs.
+        cells (bytearray): Type code of the obstacle (except bombs) of each box, indexed by `i * width + j`.
+            0 for an empty box. (See `obstacle.Obstacle.code`) Large mazes are loaded lazily in
+            `chunks.ChunkedCells`, or mapped from their binary file in a memoryview, indexed the same way.
+            Once a snapshot has been taken, they should only be changed by `add_obstacle` and `remove_obstacle`.
+        cells_delta (Optional[snapshots.CellsDelta]): Changes of the cells since their last copy by a snapshot.
+            (None before the first one, See `snapshots.take`)
+        bombs (Dict[bomb.Bomb, None]): The bombs, as an ordered set.
+        bomb_grid (Dict[int, obstacle.Bomb]): Bomb of each box holding one, indexed by `i * width + j`.
+        scheduler (scheduler.Scheduler): Deadlines of the timed entities (bombs) on the game time.
     """
-    def __init__(self, width: int, height: int):
+    DATA_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'data', 'maze')
+
+    def __init__(self, width: int, height: int,
+                 cells: Optional[Union[bytearray, chunks.ChunkedCells, memoryview]] = None):
         """Initialise an empty maze.
 
         Args:
             width (int): Number of boxes in a row.
             height (int): Number of boxes in a columns.
+            cells (Union[bytearray, chunks.ChunkedCells, memoryview]): Cells already loaded.
+                Default to an empty maze.
         """
         super().__init__()
         self.width = width
         self.height = height
-        self.size = (self.width * BOX_SIZE, self.height * BOX_SIZE)
 
-        self.players_number = 0
         self.players_initial_positions = []
         self.players = []
-        self.obstacles = []
-        self.bombs = []
+        self.bombs: Dict[obstacle.Bomb, None] = {}
+
+        self.cells = bytearray(self.width * self.height) if cells is None else cells
+        self.bomb_grid: Dict[int, obstacle.Bomb] = {}
+        self.cells_delta: Optional[snapshots.CellsDelta] = None
+
+        self.scheduler = scheduler.Scheduler()
 
     def __str__(self):
         tmp = ([' '] * (self.width) + ['\n']) * self.height
 
         for i, j in self.players_initial_positions:
             tmp[i * (self.width + 1) + j] = 'p'
-        for obstacle_ in self.obstacles:
-            tmp[obstacle_.i * (self.width + 1) + obstacle_.j] = str(obstacle_)
+        chars = {code: wall.__name__[0].lower() for code, wall in obstacle.WALLS.items()}  # See `Obstacle.__str__`
+        for index, code in enumerate(self.cells):
+            if code:
+                i, j = divmod(index, self.width)
+                tmp[i * (self.width + 1) + j] = chars[code]
         for bomb in self.bombs:
             tmp[bomb.i * (self.width + 1) + bomb.j] = str(bomb)
         for player_ in self.players:
-            i = player_.pos[1] // BOX_SIZE
-            j = player_.pos[0] // BOX_SIZE
+            i = int(player_.pos[1] // BOX_SIZE)
+            j = int(player_.pos[0] // BOX_SIZE)
             tmp[i * (self.width + 1) + j] = str(player_)
 
         return super().__str__() + '\n\n' + ''.join(tmp)
 
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Size of the maze (in pixels)."""
+        return self.width * BOX_SIZE, self.height * BOX_SIZE
+
+    @property
+    def time(self) -> float:
+        """Game time (in seconds)."""
+        return self.scheduler.time
+
+    def time_spend(self, delta_time: float):
+        """Spend time and handle the entities that expire.
+
+        Args:
+            delta_time (float): The time spent.
+        """
+        expired = self.scheduler.advance(delta_time)
+        if expired:
+            blast.explode(self, [bomb for bomb in expired if isinstance(bomb, obstacle.Bomb)])
+
+        if isinstance(self.cells, chunks.ChunkedCells):
+            self.cells.retain((int(y // BOX_SIZE), int(x // BOX_SIZE)) for x, y in (p.center for p in self.players))
+
+    def defer_events(self, queue: Optional[event_queue.EventQueue]):
+        """Defer the events of the maze and of all its elements in the given queue.
+
+        The elements added later on use the same queue.
+
+        Args:
+            queue (Optional[event_queue.EventQueue]): The queue. None to dispatch the events immediately.
+        """
+        self.event_queue = queue
+        for element in (*self.players, *self.bombs):
+            element.event_queue = queue
+
     def new_player(self) -> player.Player:
         """Create and add a new player to the maze.
 
+        It takes the first id (and initial position) that no player of the maze holds:
+        the slots of the players removed are reused.
+
         Raises:
             MazeFullError: If the max amount of players has been reached.
         """
-        if self.players_number >= len(self.players_initial_positions):
+        ids = {player_.id for player_ in self.players}
+        id_ = next((id_ for id_ in range(len(self.players_initial_positions)) if id_ not in ids), None)
+        if id_ is None:
             raise MazeFullError("No more players can be added to this maze.")
-        i, j = self.players_initial_positions[self.players_number]
-        player_ = player.Player(self.players_number, i, j)
-        player_.set_maze(self)
+        i, j = self.players_initial_positions[id_]
+        player_ = player.Player(id_, i, j)
+        self.add_player(player_)
+        return player_
 
-        self.players_number += 1
+    def add_player(self, player_: player.Player):
+        """Add a player created outside of the maze. (Use `new_player` to join the maze)"""
+        player_.set_maze(self)
+        player_.alive = True
         self.players.append(player_)
         self.changed(events.NewPlayerEvent(player_))
-        return player_
 
     def remove_player(self, player_: player.Player):
+        if not player_.alive:
+            return
+        player_.alive = False
         self.players.remove(player_)
-        self.changed(events.DeletePlayerEvent(player))
+        self.changed(events.DeletePlayerEvent(player_))
 
     def add_bomb(self, bomb: obstacle.Bomb):
-        if bomb in self.bombs:
+        index = self.index(bomb.i, bomb.j)
+        if self.bomb_grid.get(index) is bomb:
             return
-        self.bombs.append(bomb)
+        self.bombs[bomb] = None
+        self.bomb_grid[index] = bomb
         bomb.set_maze(self)
+        self.scheduler.schedule(bomb, self.time + bomb.timeout)
         self.changed(events.NewObstacleEvent(bomb))
 
     def remove_bomb(self, bomb: obstacle.Bomb):
-        self.bombs.remove(bomb)
+        del self.bombs[bomb]
+        self.scheduler.cancel(bomb)
+        index = self.index(bomb.i, bomb.j)
+        if self.bomb_grid.get(index) is bomb:
+            del self.bomb_grid[index]
         self.changed(events.DeleteObstacleEvent(bomb))
 
     def add_obstacle(self, obstacle_: obstacle.Obstacle):
-        if obstacle_ in self.obstacles:
+        index = self.index(obstacle_.i, obstacle_.j)
+        if self.cells[index] == obstacle_.code:
             return
-        self.obstacles.append(obstacle_)
+        self.cells[index] = obstacle_.code
+        if self.cells_delta is not None:
+            self.cells_delta.changes[index] = obstacle_.code
         obstacle_.set_maze(self)
         self.changed(events.NewObstacleEvent(obstacle_))
 
     def remove_obstacle(self, obstacle_: obstacle.Obstacle):
-        self.obstacles.remove(obstacle_)
+        index = self.index(obstacle_.i, obstacle_.j)
+        if self.cells[index] != obstacle_.code:
+            return
+        self.cells[index] = 0
+        if self.cells_delta is not None:
+            self.cells_delta.changes[index] = 0
         self.changed(events.DeleteObstacleEvent(obstacle_))
 
-    def obstacle_at(self, pos: Tuple[float, float]) -> obstacle.Obstacle:
-        i = pos[1] // BOX_SIZE
-        j = pos[0] // BOX_SIZE
-        if i < 0 or j < 0 or  i >= self.height or j >= self.width:
+    def index(self, i: int, j: int) -> int:
+        """Index of the box (i, j) in the grids.
+
+        Args:
+            i, j (int, int): The box indexes. (Should be inside the maze)
+
+        Returns:
+            int: The index in `cells` and `bomb_grid`.
+        """
+        return int(i) * self.width + int(j)
+
+    def is_inside(self, i: int, j: int) -> bool:
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def obstacle_in(self, i: int, j: int) -> obstacle.Obstacle:
+        """Obstacle in the box (i, j).
+
+        Walls are transient values, built at each call: the events they send (`ObstacleBombedEvent`)
+        only reach the handlers subscribed to this value. Use `is_blocking` or `cells` to test a box
+        without building its wall. Boxes outside the maze hold a blocking obstacle.
+        """
+        if not self.is_inside(i, j):
             return obstacle.Obstacle(i, j)
-        for obstacle_ in self.obstacles:
-            if obstacle_.i == i and obstacle_.j == j:
-                return obstacle_
-        return None
+        code = self.cells[self.index(i, j)]
+        if not code:
+            return None
+        obstacle_ = obstacle.Obstacle.from_code(code)(i, j)
+        obstacle_.set_maze(self)
+        return obstacle_
+
+    def is_blocking(self, i: int, j: int) -> bool:
+        """Whether the box (i, j) holds a blocking obstacle. (Without building the obstacle)
+
+        Boxes outside the maze are blocking.
+        """
+        if not self.is_inside(i, j):
+            return True
+        code = self.cells[self.index(i, j)]
+        return bool(code) and obstacle.Obstacle.from_code(code).blocking
+
+    def bomb_in(self, i: int, j: int) -> obstacle.Bomb:
+        """Bomb in the box (i, j)."""
+        if not self.is_inside(i, j):
+            return None
+        return self.bomb_grid.get(self.index(i, j))
+
+    def obstacle_at(self, pos: Tuple[float, float]) -> obstacle.Obstacle:
+        return self.obstacle_in(int(pos[1] // BOX_SIZE), int(pos[0] // BOX_SIZE))
 
     def bomb_at(self, pos: Tuple[float, float]) -> obstacle.Bomb:
-        i = pos[1] // BOX_SIZE
-        j = pos[0] // BOX_SIZE
-        for bomb in self.bombs:
-            if bomb.i == i and bomb.j == j:
-                return bomb
-        return None
+        return self.bomb_in(int(pos[1] // BOX_SIZE), int(pos[0] // BOX_SIZE))
 
     @staticmethod
-    def from_file(file_name: str) -> Maze:
-        description = ''
-        with open(file_name, 'r') as file:
-            description = file.read().split('\n')
-
-        maze = Maze(len(description[0]), len(description))
-
-        for i, line in enumerate(description):
-            for j, char in enumerate(line):
-                if char == ' ':
-                    pass
-                elif char == 'p':
-                    maze.players_initial_positions.append((i, j))
-                else:
-                    maze.add_obstacle(obstacle.Obstacle.from_char(char)(i, j))
-
-        return maze
+    def ids() -> List[str]:
+        """Ids of the mazes of the data folder. (See `from_id`)"""
+        names = os.listdir(Maze.DATA_FOLDER)
+        return sorted({name[:-4] for name in names if name.endswith(('.txt', '.bin'))})
+
+    @staticmethod
+    def from_id(maze_id) -> Maze:
+        """Load one of the mazes of the data folder.
+
+        The binary file of the maze is used if there is one, else its text file.
+
+        Args:
+            maze_id: The id of the maze. (Name of the file without extension)
+        """
+        path = os.path.join(Maze.DATA_FOLDER, f'{maze_id}')
+        if os.path.exists(f'{path}.bin'):
+            return mazefile.load_binary(f'{path}.bin')
+        return mazefile.load_text(f'{path}.txt')
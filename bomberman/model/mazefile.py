@@ -0,0 +1,98 @@
+"""Files of the mazes: the text format and the binary format.
+
+Text format: one line per row of boxes, one character per box. (See `obstacle.Obstacle.from_char`,
+' ' for an empty box and 'p' for a spawn point)
+
+Binary format: header (magic, version, width, height, number of spawn points), spawn points (i, j),
+then the type code of each cell (one byte, indexed by `i * width + j`).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Optional
+
+from . import chunks
+from . import maze
+from . import obstacle
+
+
+CHUNKED_FILE_SIZE = 1 << 22  # Text files larger than this are loaded lazily by chunks.
+
+BINARY_MAGIC = b'BMBM'
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<4sBIII')
+_BINARY_SPAWN = struct.Struct('<II')
+
+
+def load_text(file_name: str, chunk_size: Optional[int] = None) -> maze.Maze:
+    """Load a maze from its text file.
+
+    Args:
+        file_name (str): The file.
+        chunk_size (int): Load the cells lazily by chunks of this size (See `chunks.ChunkedCells`).
+            Default to chunks of 64 boxes for files larger than `CHUNKED_FILE_SIZE`, else load all.
+    """
+    if chunk_size is None and os.path.getsize(file_name) > CHUNKED_FILE_SIZE:
+        chunk_size = 64
+    if chunk_size:
+        cells = chunks.ChunkedCells(file_name, chunk_size)
+        maze_ = maze.Maze(cells.width, cells.height, cells)
+        maze_.players_initial_positions = cells.spawns()
+        return maze_
+
+    with open(file_name, 'r', encoding='utf-8') as file:
+        description = file.read().split('\n')
+
+    maze_ = maze.Maze(len(description[0]), len(description))
+    for i, line in enumerate(description):
+        for j, char in enumerate(line):
+            if char == ' ':
+                pass
+            elif char == 'p':
+                maze_.players_initial_positions.append((i, j))
+            else:
+                maze_.cells[maze_.index(i, j)] = obstacle.Obstacle.from_char(char).code
+
+    return maze_
+
+
+def load_binary(file_name: str) -> maze.Maze:
+    """Load a maze from its binary file. (See `save_binary`)
+
+    The file is memory mapped (copy on write) and its cells are used in place: they are only read
+    from the disk when accessed, and the changes of the maze are not written back to the file.
+
+    Raises:
+        ValueError: If the file is not a valid maze.
+    """
+    with open(file_name, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(data) < _BINARY_HEADER.size:
+        raise ValueError("Truncated maze file.")
+    magic, version, width, height, spawns = _BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("Not a binary maze file (or unsupported version).")
+    offset = _BINARY_HEADER.size + spawns * _BINARY_SPAWN.size
+    if len(data) != offset + width * height:
+        raise ValueError("Truncated maze file.")
+
+    maze_ = maze.Maze(width, height, memoryview(data)[offset:])
+    maze_.players_initial_positions = [
+        tuple(spawn) for spawn in _BINARY_SPAWN.iter_unpack(data[_BINARY_HEADER.size:offset])
+    ]
+    return maze_
+
+
+def save_binary(maze_: maze.Maze, file_name: str):
+    """Save the walls and spawn points of a maze in the binary format."""
+    with open(file_name, 'wb') as file:
+        file.write(_BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, maze_.width, maze_.height, len(maze_.players_initial_positions)
+        ))
+        for i, j in maze_.players_initial_positions:
+            file.write(_BINARY_SPAWN.pack(i, j))
+        file.write(bytes(maze_.cells))
@@ -3,13 +3,30 @@
 from __future__ import annotations
 
 from ..designpattern import observable
+from . import blast
 from . import events
 from . import maze
 from . import player
 
 from . import BOX_SIZE
 
+
 class Obstacle(observable.Observable):
+    """Obstacle in a box of the maze.
+
+    Walls are only stored as type codes in the maze (See `Maze.cells`): the wall objects
+    are transient values built at each lookup (See `Maze.obstacle_in`), equal if they have
+    the same type and box. They should not be kept nor observed: follow the events of the maze instead.
+    Bombs are stored as objects.
+
+    Attrs:
+        code (int): Type code of the obstacle in the maze cells. (0 is kept for empty boxes)
+        i, j (int, int): The box indexes of the obstacle.
+        maze (maze.Maze): The maze holding the obstacle.
+    """
+    __slots__ = ('i', 'j', 'maze')
+
+    code = 3
     blocking = True
     resists_bomb = True
 
@@ -19,18 +36,29 @@ class Obstacle(observable.Observable):
         super().__init__()
         self.i = i
         self.j = j
-        self.pos = (j * BOX_SIZE, i * BOX_SIZE)
         self.maze: maze.Maze = None
 
     def __str__(self):
         return self.__class__.__name__[0].lower()
 
+    def __eq__(self, other):
+        return type(self) is type(other) and self.i == other.i and self.j == other.j
+
+    def __hash__(self):
+        return hash((type(self), self.i, self.j))
+
+    @property
+    def pos(self):
+        return (self.j * BOX_SIZE, self.i * BOX_SIZE)
+
     def set_maze(self, maze_: maze.Maze):
         if self.maze is None:
             self.maze = maze_
+            if maze_.event_queue is not None:
+                self.event_queue = maze_.event_queue
 
     def bombed(self):  # Could transform self.resists_bomb in an int.
-        self.changed(events.ObstacleBombedEvent)
+        self.changed(events.ObstacleBombedEvent())
         if not self.resists_bomb:
             self.maze.remove_obstacle(self)
 
@@ -42,16 +70,36 @@ class Obstacle(observable.Observable):
             'b': Bomb,
         }[char]
 
+    @staticmethod
+    def from_code(code: int):
+        return WALLS[code]
+
 
 class StoneWall(Obstacle):
-    pass
+    __slots__ = ()
+
+    code = 1
 
 
 class WoodWall(Obstacle):
+    __slots__ = ()
+
+    code = 2
     resists_bomb = False
 
 
+# Type code -> wall class.
+WALLS = {wall.code: wall for wall in (Obstacle, StoneWall, WoodWall)}
+
+
 class Bomb(Obstacle):
+    """Bomb dropped by a player.
+
+    Unlike walls, bombs are entities: they are compared by identity.
+    """
+    __slots__ = ('player', 'timeout', 'radius')
+
+    code = None
     blocking = False
     resists_bomb = False
 
@@ -60,21 +108,28 @@ class Bomb(Obstacle):
 
     def __init__(self, player_: player.Player):
         super().__init__(
-            (player_.pos[1] + player_.size[1]/2) // BOX_SIZE,
-            (player_.pos[0] + player_.size[0]/2) // BOX_SIZE,
+            int(player_.center[1] // BOX_SIZE),
+            int(player_.center[0] // BOX_SIZE),
         )
         self.player = player_
-        self.time_to_leave = self.player.bombs_timeout
+        self.timeout = self.player.bombs_timeout
         self.radius = self.player.bombs_radius
 
-    def time_spend(self, delta_time: float):
-        self.time_to_leave -= delta_time
-        if self.time_to_leave < 0:
-            self.bombed()
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    @property
+    def time_to_leave(self) -> float:
+        """Time before the explosion. (Its deadline is held by the scheduler of the maze)"""
+        if self.maze is None or self not in self.maze.scheduler:
+            return self.timeout
+        return self.maze.scheduler.deadline(self) - self.maze.time
 
     def bombed(self):
-        self.changed(events.ObstacleBombedEvent)
-        if not self.resists_bomb:
-            self.maze.remove_bomb(self)
-        #TODO: Generate ray
+        blast.explode(self.maze, [self])
+
+    def explode(self):
+        """Remove the bomb from the maze. (Its rays are handled by `blast.explode`)"""
+        self.changed(events.ObstacleBombedEvent())
+        self.maze.remove_bomb(self)
         self.player.bomb_explodes()
@@ -0,0 +1,186 @@
+"""Distance fields over the walkable boxes of a maze, shared by the bots.
+
+A distance field gives, for each box of the maze, the number of moves (between adjacent boxes)
+needed to reach a target box. Following decreasing distances from any box leads to the target,
+so that one field serves all the players heading to the same target.
+
+Fields are cached, and updated incrementally when a wall is destroyed: opening a box can only
+shorten the paths, so that only the boxes whose distance decreases are visited again.
+They suit static targets shared by many players. Moving or local targets are rather found by
+a breadth first search bounded around the player (See `PathFinder.search`), that costs nothing
+to keep up to date.
+"""
+
+from __future__ import annotations
+
+import array
+import collections
+from typing import Callable, Deque, Dict, List, Optional, OrderedDict, Tuple
+
+from . import events
+from . import follower
+from . import maze
+from . import obstacle
+
+
+class PathFinder(follower.MazeFollower):
+    """Cache of the distance fields of a maze.
+
+    Boxes holding a blocking obstacle are not walkable (bombs are not blocking). The target itself
+    is at distance 0 even if it is not walkable, so that the boxes next to a wall can be found.
+
+    A field holds 4 bytes per box of the maze, whatever the part of it that is reachable: a 1000x1000
+    maze costs 4 MB per field. The cache is thus bounded by its total number of boxes, rather than by
+    its number of fields, so that its memory does not grow with the size of the maze. (At least the
+    field in use is kept)
+
+    Attrs:
+        maze (maze.Maze): The maze.
+        max_cells (int): Total number of boxes of the fields kept in cache (4 bytes each).
+            The least recently used fields are dropped.
+        fields (OrderedDict[int, array.array]): The cached fields, by index of their target box.
+            Distance of each box (indexed by `i * width + j`), `UNREACHABLE` if there is no path.
+    """
+    UNREACHABLE = 0x7FFFFFFF
+
+    def __init__(self, maze_: maze.Maze, max_cells: int = 1 << 20):
+        super().__init__(maze_)
+        self.max_cells = max_cells
+        self.fields: OrderedDict[int, array.array] = collections.OrderedDict()
+
+    def close(self):
+        super().close()
+        self.fields.clear()
+
+    def field(self, i: int, j: int) -> array.array:
+        """Distance field to the box (i, j). (Computed if not cached)
+
+        Should not be modified.
+        """
+        target = self.maze.index(i, j)
+        field = self.fields.get(target)
+        if field is None:
+            field = self._compute(target)
+            self.fields[target] = field
+            max_fields = max(self.max_cells // len(field), 1)
+            while len(self.fields) > max_fields:
+                self.fields.popitem(last=False)
+        else:
+            self.fields.move_to_end(target)
+        return field
+
+    def distance(self, start: Tuple[int, int], target: Tuple[int, int]) -> int:
+        """Number of moves from the box start to the box target. `UNREACHABLE` if there is no path."""
+        return self.field(*target)[self.maze.index(*start)]
+
+    def next_box(self, start: Tuple[int, int], target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Adjacent box to move to from start to get closer to target.
+
+        Returns:
+            Optional[Tuple[int, int]]: The next box on a shortest path. None if start is the target
+                or if there is no path.
+        """
+        field = self.field(*target)
+        distance = field[self.maze.index(*start)]
+        if distance in (0, self.UNREACHABLE):
+            return None
+        for index in self.neighbours(self.maze.index(*start)):
+            if field[index] == distance - 1:
+                return divmod(index, self.maze.width)
+        return None
+
+    def search(self, start: Tuple[int, int], radius: Optional[int] = None,
+               visit: Optional[Callable[[int, int], bool]] = None) -> Dict[int, int]:
+        """Breadth first search from the box start, over the boxes at most `radius` moves away.
+
+        Nothing is cached: the cost only depends on the number of boxes visited.
+
+        Args:
+            start (Tuple[int, int]): The box to start from. (Visited even if it is not walkable)
+            radius (Optional[int]): Max number of moves from start. (Unbounded if None)
+            visit (Optional[Callable[[int, int], bool]]): Called with the index and the distance of each box
+                visited, closest first. The search stops as soon as it returns True.
+
+        Returns:
+            Dict[int, int]: Index of the previous box on the path from start, of each box reached.
+                (-1 for start) See `first_move`.
+        """
+        first = self.maze.index(*start)
+        parents = {first: -1}
+        queue = collections.deque([(first, 0)])
+        while queue:
+            index, distance = queue.popleft()
+            if visit is not None and visit(index, distance):
+                break
+            if distance == radius:
+                continue
+            for neighbour in self.neighbours(index):
+                if neighbour not in parents and self._walkable(neighbour):
+                    parents[neighbour] = index
+                    queue.append((neighbour, distance + 1))
+        return parents
+
+    def first_move(self, parents: Dict[int, int], index: int) -> Tuple[int, int]:
+        """Adjacent box to move to from the start of a search, to follow its path to the box index.
+
+        Returns the start itself if index is the start.
+        """
+        while parents[index] != -1 and parents[parents[index]] != -1:
+            index = parents[index]
+        return divmod(index, self.maze.width)
+
+    def neighbours(self, index: int) -> List[int]:
+        """Indexes of the boxes adjacent to a box. (Up, down, right and left, inside the maze)"""
+        width = self.maze.width
+        i, j = divmod(index, width)
+        neighbours = []
+        if i > 0:
+            neighbours.append(index - width)
+        if i < self.maze.height - 1:
+            neighbours.append(index + width)
+        if j < width - 1:
+            neighbours.append(index + 1)
+        if j > 0:
+            neighbours.append(index - 1)
+        return neighbours
+
+    def _walkable(self, index: int) -> bool:
+        return not self.maze.is_blocking(*divmod(index, self.maze.width))
+
+    def _compute(self, target: int) -> array.array:
+        """Breadth first search from the target."""
+        field = array.array('i', [self.UNREACHABLE]) * (self.maze.width * self.maze.height)
+        field[target] = 0
+        self._propagate(field, collections.deque([target]))
+        return field
+
+    def _propagate(self, field: array.array, queue: Deque[int]):
+        """Decrease the distances of the neighbours of the queued boxes, until no distance decreases."""
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            for neighbour in self.neighbours(index):
+                if distance < field[neighbour] and self._walkable(neighbour):
+                    field[neighbour] = distance
+                    queue.append(neighbour)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        if event_.obstacle.blocking:  # Walls are only added by restorations: paths may lengthen.
+            self.fields.clear()
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        obstacle_: obstacle.Obstacle = event_.obstacle
+        if not obstacle_.blocking:
+            return
+        index = self.maze.index(obstacle_.i, obstacle_.j)
+        if not self._walkable(index):  # Already replaced (deferred event)
+            return
+
+        for field in self.fields.values():
+            distance = min(field[neighbour] for neighbour in self.neighbours(index)) + 1
+            if distance < field[index]:
+                field[index] = distance
+                self._propagate(field, collections.deque([index]))
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):  # pylint: disable = unused-argument
+        self.fields.clear()
@@ -30,8 +30,10 @@ class Player(observable.Observable):
     """Player class.
 
     A player has basically a position in the maze and can move inside the maze.
-    It can also drop bombs.
+    It can also drop bombs. Once removed from its maze (eliminated or gone), it does nothing.
     """
+    __slots__ = ('maze', 'alive', 'id', 'pos', 'size', 'speed', 'bombs_capacity', 'bombs_timeout', 'bombs_radius')
+
     DEFAULT_SPEED = 2 * BOX_SIZE  # pixels/seconds
     DEFAULT_BOMB_CAPACITY = 6
 
@@ -44,6 +46,7 @@ class Player(observable.Observable):
         """
         super().__init__()
         self.maze: maze.Maze = None
+        self.alive = False  # Whether the player is in its maze. (See `Maze.add_player`)
 
         self.id = id_  # pylint: disable = invalid-name
 
@@ -65,22 +68,32 @@ class Player(observable.Observable):
     def set_maze(self, maze_: maze.Maze):
         if self.maze is None:
             self.maze = maze_
+            if maze_.event_queue is not None:
+                self.event_queue = maze_.event_queue
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        """Position of the center of the player. Bombs are dropped in its box."""
+        return (self.pos[0] + self.size[0] / 2, self.pos[1] + self.size[1] / 2)
 
     def set_pos(self, pos: Tuple[float, float]):
-        event = events.PlayerMovedEvent(self.pos, pos)
+        event = events.PlayerMovedEvent(self, self.pos, pos)
         self.pos = pos
         self.changed(event)
 
     def move(self, time: float, direction: Direction):
         """Move the player along the given axis.
 
-        Warning: Do not work if the player move more than a box at once.
-            But it should never happen (The player should not be teleported)
+        The move is swept: the boxes entered by the front edge of the player are checked in order,
+        and the player stops against the first blocking one. It is correct whatever the distance
+        travelled, and only the boxes along the path are checked.
 
         Args:
             time (float): The time spend moving.
             direction (Direction): The direction to take.
         """
+        if not self.alive:
+            return
         axis, direction = direction.value
         x_axis = (axis == 0)
         y_axis = not x_axis
@@ -89,43 +102,26 @@ class Player(observable.Observable):
             self.pos[0] + x_axis * direction * time * self.speed,
             self.pos[1] + y_axis * direction * time * self.speed,
         )
-        next_pos_right = (next_pos[0] + self.size[0] - 1, next_pos[1])
-        next_pos_down = (next_pos[0], next_pos[1] + self.size[1] - 1)
-        next_pos_opposite = (next_pos_right[0], next_pos_down[1])
-
-        if direction == 1:
-            obstacle_ = self.maze.obstacle_at(next_pos_opposite)
-            if obstacle_ and obstacle_.blocking:
-                next_pos = (
-                    obstacle_.pos[0] - self.size[0] if x_axis else self.pos[0],
-                    obstacle_.pos[1] - self.size[1] if y_axis else self.pos[1],
-                )
-            obstacle_ = self.maze.obstacle_at(next_pos_right if x_axis else next_pos_down)
-            if obstacle_ and obstacle_.blocking:
-                next_pos = (
-                    obstacle_.pos[0] - self.size[0] if x_axis else self.pos[0],
-                    obstacle_.pos[1] - self.size[1] if y_axis else self.pos[1],
-                )
-        else:
-            obstacle_ = self.maze.obstacle_at(next_pos)
-            if obstacle_ and obstacle_.blocking:
-                next_pos = (
-                    obstacle_.pos[0] + obstacle_.size[0] if x_axis else self.pos[0],
-                    obstacle_.pos[1] + obstacle_.size[1] if y_axis else self.pos[1],
-                )
-            obstacle_ = self.maze.obstacle_at(next_pos_down if x_axis else next_pos_right)
-            if obstacle_ and obstacle_.blocking:
-                next_pos = (
-                    obstacle_.pos[0] + obstacle_.size[0] if x_axis else self.pos[0],
-                    obstacle_.pos[1] + obstacle_.size[1] if y_axis else self.pos[1],
-                )
+
+        # Boxes covered across the axis, and boxes of the front edge along it (before and after the move).
+        first = int(self.pos[1 - axis] // BOX_SIZE)
+        last = int((self.pos[1 - axis] + self.size[1 - axis] - 1) // BOX_SIZE)
+        front = self.size[axis] - 1 if direction == 1 else 0
+        start = int((self.pos[axis] + front) // BOX_SIZE)
+        stop = int((next_pos[axis] + front) // BOX_SIZE)
+
+        for edge in range(start, stop + direction, direction):
+            if any(self.maze.is_blocking(*((k, edge) if x_axis else (edge, k))) for k in range(first, last + 1)):
+                contact = edge * BOX_SIZE - self.size[axis] if direction == 1 else (edge + 1) * BOX_SIZE
+                next_pos = (contact, self.pos[1]) if x_axis else (self.pos[0], contact)
+                break
 
         if next_pos != self.pos:
             self.set_pos(next_pos)
 
     def bombs(self):
-        if self.bombs_capacity > 0:
-            if self.maze.bomb_at(self.pos):
+        if self.alive and self.bombs_capacity > 0:
+            if self.maze.bomb_at(self.center):
                 return
             self.maze.add_bomb(obstacle.Bomb(self))
             self.bombs_capacity -= 1
@@ -0,0 +1,84 @@
+"""Provides the Scheduler of the timed entities of the game (bombs, ...)."""
+
+import heapq
+import itertools
+from typing import Any, Dict, Iterable, List
+
+
+class Scheduler:
+    """Deadlines of timed entities on the game time.
+
+    The deadlines are held in a min-heap: advancing the time only touches the entities
+    whose deadline has passed, whatever the number of entities scheduled.
+    Cancelled entities are dropped lazily from the heap.
+
+    Attrs:
+        time (float): Current game time (in seconds).
+    """
+    def __init__(self):
+        self.time = 0.0
+        self._heap = []
+        self._entries: Dict[Any, list] = {}
+        self._counter = itertools.count()  # Keep the scheduling order between equal deadlines.
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entity):
+        return entity in self._entries
+
+    def schedule(self, entity, deadline: float) -> float:
+        """Schedule an entity (replace its former deadline if any).
+
+        Args:
+            entity: The entity to schedule. It should be hashable.
+            deadline (float): Absolute game time at which the entity expires.
+
+        Returns:
+            float: The deadline.
+        """
+        self.cancel(entity)
+        entry = [deadline, next(self._counter), entity]
+        self._entries[entity] = entry
+        heapq.heappush(self._heap, entry)
+        return deadline
+
+    def cancel(self, entity):
+        entry = self._entries.pop(entity, None)
+        if entry is not None:
+            entry[2] = None
+
+    def deadline(self, entity) -> float:
+        return self._entries[entity][0]
+
+    def restore(self, time: float, entities: Iterable, deadlines: Iterable[float]):
+        """Reset the time and the scheduled entities.
+
+        Args:
+            time (float): The game time.
+            entities (Iterable): The entities, in scheduling order.
+            deadlines (Iterable[float]): The deadline of each entity.
+        """
+        self.time = time
+        self._counter = itertools.count()
+        self._heap = [[deadline, next(self._counter), entity] for entity, deadline in zip(entities, deadlines)]
+        self._entries = {entry[2]: entry for entry in self._heap}
+        heapq.heapify(self._heap)
+
+    def advance(self, delta_time: float) -> List:
+        """Spend time.
+
+        Args:
+            delta_time (float): The time spent.
+
+        Returns:
+            List: The entities whose deadline has passed, by deadline. They are unscheduled.
+        """
+        self.time += delta_time
+        expired = []
+        while self._heap and self._heap[0][0] < self.time:
+            _, _, entity = heapq.heappop(self._heap)
+            if entity is not None:
+                del self._entries[entity]
+                expired.append(entity)
+        return expired
@@ -0,0 +1,116 @@
+"""Snapshots of the state of a maze, to roll it back. (See `take` and `restore`)
+
+The cells are not copied at each snapshot: the snapshots share a copy of them, and hold the changes
+since it (tracked by the maze, See `Maze.cells_delta`). The copy is only taken again once
+1 / `CELLS_DELTA_RATIO` of the cells have changed, so that the cost of a snapshot follows the number
+of walls destroyed rather than the size of the maze.
+"""
+
+from __future__ import annotations
+
+import array
+from typing import Dict, NamedTuple, Tuple, Union
+
+from . import chunks
+from . import events
+from . import maze
+from . import obstacle
+from . import player
+
+
+CELLS_DELTA_RATIO = 64
+
+
+class CellsDelta(NamedTuple):
+    """Cells of a maze, as the changes since a copy of them.
+
+    Attrs:
+        base (bytes): Copy of the cells, shared by the successive snapshots.
+        changes (Dict[int, int]): Type code of the boxes changed since the copy, by index.
+    """
+    base: bytes
+    changes: Dict[int, int]
+
+
+class MazeSnapshot(NamedTuple):
+    """State of a maze at a given time. (See `take`)
+
+    The state is held in flat arrays. Players and bombs are entities: they are referenced
+    and not copied, and their values are restored from the arrays.
+
+    Attrs:
+        time (float): The game time.
+        cells (Union[CellsDelta, Dict[Tuple[int, int], Union[bytes, chunks.Delta]]]): The changes of the cells
+            of the maze since their last copy. For chunked cells, the state of their modified chunks.
+            (See `chunks.ChunkedCells.snapshot`)
+        players (Tuple[player.Player, ...]): The players of the maze.
+        players_state (array.array): Position (x, y) and bombs capacity of each player, flattened.
+        bombs (Tuple[obstacle.Bomb, ...]): The bombs of the maze, in scheduling order.
+        bombs_deadline (array.array): Deadline of each bomb.
+    """
+    time: float
+    cells: Union[CellsDelta, Dict[Tuple[int, int], Union[bytes, chunks.Delta]]]
+    players: Tuple[player.Player, ...]
+    players_state: array.array
+    bombs: Tuple[obstacle.Bomb, ...]
+    bombs_deadline: array.array
+
+
+def take(maze_: maze.Maze) -> MazeSnapshot:
+    """Save the state of the game. (Observers and views are not part of it)"""
+    players_state = array.array('d')
+    for player_ in maze_.players:
+        players_state.extend((player_.pos[0], player_.pos[1], player_.bombs_capacity))
+    bombs = tuple(maze_.bombs)
+    deadline = maze_.scheduler.deadline
+    if isinstance(maze_.cells, chunks.ChunkedCells):
+        cells = maze_.cells.snapshot()
+    else:
+        delta = maze_.cells_delta
+        if delta is None or len(delta.changes) * CELLS_DELTA_RATIO > len(maze_.cells):
+            delta = maze_.cells_delta = CellsDelta(bytes(maze_.cells), {})
+        cells = CellsDelta(delta.base, dict(delta.changes))
+    return MazeSnapshot(
+        maze_.time, cells, tuple(maze_.players), players_state,
+        bombs, array.array('d', [deadline(bomb) for bomb in bombs]),
+    )
+
+
+def restore(maze_: maze.Maze, snapshot: MazeSnapshot):
+    """Restore the state of the game from a snapshot of the same maze.
+
+    No event is sent for each change: a single MazeRestoredEvent is sent so that
+    the observers resynchronise with the whole state.
+    """
+    if isinstance(maze_.cells, chunks.ChunkedCells):
+        maze_.cells.restore(snapshot.cells)
+    else:
+        _restore_cells(maze_, snapshot.cells)
+    for player_ in maze_.players:
+        player_.alive = False
+    maze_.players[:] = snapshot.players
+    state = snapshot.players_state
+    for k, player_ in enumerate(maze_.players):
+        player_.alive = True
+        player_.pos = (state[3 * k], state[3 * k + 1])
+        player_.bombs_capacity = int(state[3 * k + 2])
+
+    maze_.bombs = dict.fromkeys(snapshot.bombs)
+    maze_.bomb_grid = {maze_.index(bomb.i, bomb.j): bomb for bomb in snapshot.bombs}
+    maze_.scheduler.restore(snapshot.time, snapshot.bombs, snapshot.bombs_deadline)
+    maze_.changed(events.MazeRestoredEvent())
+
+
+def _restore_cells(maze_: maze.Maze, delta: CellsDelta):
+    """Restore the cells from their changes since a copy. Only the boxes changed are written if
+    the copy is the current one."""
+    base, changes = delta
+    current = maze_.cells_delta
+    if current is not None and current.base is base:
+        for index in current.changes.keys() - changes.keys():
+            maze_.cells[index] = base[index]
+    else:
+        maze_.cells[:] = base
+    for index, code in changes.items():
+        maze_.cells[index] = code
+    maze_.cells_delta = CellsDelta(base, dict(changes))
@@ -0,0 +1,23 @@
+"""Networked multiplayer.
+
+An authoritative server runs the rooms (one maze each) at a fixed tick. The clients send
+the inputs of their player and receive the changes of the maze at each tick (See `model.delta`).
+
+The protocol, server and client modules do not depend on pygame. The game module
+(display and keyboard of a client) is only imported when accessed.
+"""
+
+import importlib
+
+from . import client
+from . import protocol
+from . import server
+
+
+__all__ = ['client', 'game', 'protocol', 'server']
+
+
+def __getattr__(name):
+    if name == 'game':
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
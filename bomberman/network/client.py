@@ -0,0 +1,103 @@
+"""Client of a networked game.
+
+The client mirrors the maze of its room: the changes received from the server are applied
+to a local maze through its methods, so that its events drive the views as in a local game.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Optional
+
+from ..model import delta
+from ..model import player
+from ..simulation import replay
+from . import protocol
+
+
+class ServerError(Exception):
+    pass
+
+
+class Client:
+    """Connection to a room of a server.
+
+    Attrs:
+        reader, writer (asyncio.StreamReader, asyncio.StreamWriter): The streams of the connection.
+        player_id (int): The id of the player of the client.
+        maze (maze.Maze): The mirror of the maze of the room.
+        delta_time (float): Time spent at each tick by the server (in seconds).
+        tick (int): Last tick received.
+        time (float): Game time of the server at the last tick received.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, welcome: bytes):
+        self.reader = reader
+        self.writer = writer
+
+        self.player_id, height, width, self.delta_time, self.tick, self.time = \
+            protocol.WELCOME_HEADER.unpack_from(welcome)
+        self.maze = delta.from_keyframe(width, height, memoryview(welcome)[protocol.WELCOME_HEADER.size:], self.time)
+
+    @staticmethod
+    async def connect(host: str, port: int, room: str, maze_id) -> Client:
+        """Join a room of a server.
+
+        Args:
+            host, port (str, int): Address of the server.
+            room (str): Name of the room.
+            maze_id: Id of the maze, used if the room does not exist yet.
+
+        Raises:
+            ServerError: If the server refuses the client.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(protocol.encode(protocol.JOIN, json.dumps({'room': room, 'maze': str(maze_id)}).encode()))
+        kind, payload = await protocol.read_message(reader)
+        if kind != protocol.WELCOME:
+            writer.close()
+            raise ServerError(payload.decode(errors='replace'))
+        return Client(reader, writer, payload)
+
+    @property
+    def player(self) -> Optional[player.Player]:
+        for player_ in self.maze.players:
+            if player_.id == self.player_id:
+                return player_
+        return None
+
+    def send_input(self, direction: Optional[player.Direction], bombs: bool = False):
+        """Send the input of the player: the direction to follow from now on, and whether to drop a bomb."""
+        if not self.writer.is_closing():
+            message = protocol.INPUT_MESSAGE.pack(replay.DIRECTION_CODES[direction], bombs)
+            self.writer.write(protocol.encode(protocol.INPUT, message))
+
+    async def receive(self) -> bool:
+        """Receive and apply the next message of the server.
+
+        Returns:
+            bool: False once the connection is closed.
+
+        Raises:
+            ServerError: If the server closes the connection on an error.
+        """
+        try:
+            kind, payload = await protocol.read_message(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+
+        if kind == protocol.STATE:
+            self.tick, self.time = protocol.STATE_HEADER.unpack_from(payload)
+            self.maze.scheduler.time = self.time  # The mirror does not spend time: it follows the server.
+            delta.apply(self.maze, payload, protocol.STATE_HEADER.size)
+        elif kind == protocol.ERROR:
+            raise ServerError(payload.decode(errors='replace'))
+        return True
+
+    async def run(self):
+        """Apply the messages of the server until the connection is closed."""
+        while await self.receive():
+            pass
+
+    def close(self):
+        self.writer.close()
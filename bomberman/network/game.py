@@ -0,0 +1,90 @@
+"""Display and keyboard of a networked game.
+
+Can also be used from the command line: `bomberman-client --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+import pygame
+
+from ..controller import control
+from ..controller import controller
+from ..model import player
+from ..view import maze_view
+from ..view import view
+from . import client
+
+
+class RemotePlayerController(controller.PlayerController):
+    """Send the inputs of the keyboard to the server instead of applying them to the mirror maze.
+
+    Every client uses the keys of the first player.
+    """
+    def __init__(self, client_: client.Client):
+        super().__init__(client_.player, control.PlayerControl.from_id(0))
+        self.client = client_
+
+    def start_moving(self, direction: player.Direction):
+        super().start_moving(direction)
+        self.client.send_input(self.current_direction)
+
+    def stop_moving(self, direction: player.Direction):
+        super().stop_moving(direction)
+        self.client.send_input(self.current_direction)
+
+    def bombs(self):
+        self.client.send_input(self.current_direction, True)
+
+
+class RemoteGame:
+    name = 'Bomberman'
+    fps = 48
+    max_window_size = (1200, 800)  # Larger mazes are displayed through a camera following the player.
+
+    @staticmethod
+    async def game(host: str, port: int, room: str, maze_id):
+        """Join a room of a server and play until the window or the connection is closed."""
+        client_ = await client.Client.connect(host, port, room, maze_id)
+
+        size = client_.maze.size
+        window_size = (min(size[0], RemoteGame.max_window_size[0]), min(size[1], RemoteGame.max_window_size[1]))
+        pygame.display.set_mode(window_size)
+        pygame.display.set_caption(f'{RemoteGame.name} - room {room}')
+        pygame.display.set_icon(view.View.load_image('boom.png', (10, 10)))
+
+        if window_size != size:
+            maze_view_ = maze_view.CameraMazeView(client_.maze, client_.player)
+        else:
+            maze_view_ = maze_view.DirtyMazeView(client_.maze)
+        player_controller = RemotePlayerController(client_)
+
+        receiving = asyncio.ensure_future(client_.run())
+        running = True
+        while running and not receiving.done():
+            for event in pygame.event.get():
+                if event.type == control.TypeControl.QUIT:
+                    running = False
+                    break
+                player_controller.handle_event(event)
+
+            pygame.display.update(maze_view_.display())
+            await asyncio.sleep(1 / RemoteGame.fps)
+
+        client_.close()
+        receiving.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join a room of a bomberman server.")
+    parser.add_argument('room', help="Name of the room.")
+    parser.add_argument('--maze', default='1', help="Id of the maze, used if the room does not exist yet.")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=7777)
+    args = parser.parse_args()
+
+    assert pygame.init() == (6, 0)
+    asyncio.run(RemoteGame.game(args.host, args.port, args.room, args.maze))
+    pygame.quit()
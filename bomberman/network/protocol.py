@@ -0,0 +1,89 @@
+"""Messages exchanged between the server and the clients over TCP.
+
+Each message is framed by its payload size and its kind:
+    JOIN (client): json {"room": name, "maze": maze id}. The maze is only used if the room is created.
+    WELCOME (server): player id, height, width, delta time, tick, game time, then the keyframe of the maze.
+    INPUT (client): direction code (See `simulation.replay.DIRECTIONS`), whether to drop a bomb.
+    STATE (server): tick, game time, then the operations of the tick. (See `model.delta`)
+    ERROR (server): utf-8 message. The connection is then closed.
+
+Sandboxed bots use the same framing over pipes (See `simulation.sandbox`): they receive WELCOME
+and STATE messages and answer each of them with:
+    ACTION (bot): tick answered, direction code, whether to drop a bomb.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from typing import List, Tuple
+
+
+JOIN = 1
+WELCOME = 2
+INPUT = 3
+STATE = 4
+ERROR = 5
+ACTION = 6
+
+HEADER = struct.Struct('<IB')
+WELCOME_HEADER = struct.Struct('<BHHdId')
+INPUT_MESSAGE = struct.Struct('<BB')
+STATE_HEADER = struct.Struct('<Id')
+ACTION_MESSAGE = struct.Struct('<IBB')
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode(kind: int, payload: bytes = b'') -> bytes:
+    return HEADER.pack(len(payload), kind) + payload
+
+
+async def read_message(reader: asyncio.StreamReader, max_size: int = 1 << 24) -> Tuple[int, bytes]:
+    """Read the next message.
+
+    Args:
+        reader (asyncio.StreamReader): The stream.
+        max_size (int): Maximum size of the payload.
+
+    Returns:
+        Tuple[int, bytes]: The kind and the payload of the message.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream is closed.
+        ProtocolError: If the message is too large.
+    """
+    size, kind = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if size > max_size:
+        raise ProtocolError(f"Message too large ({size} bytes).")
+    return kind, await reader.readexactly(size)
+
+
+def split(buffer: bytearray, max_size: int = 1 << 24) -> List[Tuple[int, bytes]]:
+    """Extract the complete messages at the beginning of a buffer. (For non-blocking streams)
+
+    Args:
+        buffer (bytearray): The bytes received. The messages extracted are removed from it.
+        max_size (int): Maximum size of a payload.
+
+    Returns:
+        List[Tuple[int, bytes]]: The kind and the payload of each message.
+
+    Raises:
+        ProtocolError: If a message is too large.
+    """
+    messages = []
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        size, kind = HEADER.unpack_from(buffer, offset)
+        if size > max_size:
+            raise ProtocolError(f"Message too large ({size} bytes).")
+        if len(buffer) - offset - HEADER.size < size:
+            break
+        offset += HEADER.size
+        messages.append((kind, bytes(buffer[offset:offset + size])))
+        offset += size
+    del buffer[:offset]
+    return messages
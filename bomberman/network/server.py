@@ -0,0 +1,211 @@
+"""Authoritative asyncio server of networked games.
+
+Each room runs its own maze at a fixed tick in a task of the event loop, so that one process
+holds many rooms. After each tick, only the changes of the maze (gathered from the model events)
+are sent to the clients of the room.
+
+Can also be used from the command line: `bomberman-server --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import struct
+from typing import Dict, List, Optional
+
+from ..controller import base
+from ..model import delta
+from ..model import maze
+from ..simulation import replay
+from . import protocol
+
+
+class Connection:
+    """Connection to a client.
+
+    Attrs:
+        reader, writer (asyncio.StreamReader, asyncio.StreamWriter): The streams of the connection.
+        player_controller (Optional[base.BasePlayerController]): Controller of the player of the client.
+    """
+    MAX_BUFFER_SIZE = 1 << 20  # Clients that do not read their messages are dropped.
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.player_controller: Optional[base.BasePlayerController] = None
+
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send(self, message: bytes):
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > self.MAX_BUFFER_SIZE:
+            self.writer.close()
+            return
+        self.writer.write(message)
+
+    def close(self, error: Optional[str] = None):
+        if error is not None:
+            self.send(protocol.encode(protocol.ERROR, error.encode()))
+        self.writer.close()
+
+
+class Room:
+    """A maze played by the clients connected to it.
+
+    Attrs:
+        name (str): The name of the room.
+        maze (maze.Maze): The maze played.
+        controller (base.BaseMazeController): The controller of the maze.
+        recorder (delta.DeltaRecorder): Gather the changes of the maze to broadcast.
+        delta_time (float): Time spent at each tick (in seconds).
+        tick (int): Number of ticks done.
+        connections (List[Connection]): The connections of the clients. (Their player may have been eliminated)
+        task (Optional[asyncio.Future]): The task running the room.
+    """
+    def __init__(self, name: str, maze_: maze.Maze, delta_time: float):
+        self.name = name
+        self.maze = maze_
+        self.controller = base.BaseMazeController(self.maze)
+        self.recorder = delta.DeltaRecorder(self.maze)
+        self.delta_time = delta_time
+        self.tick = 0
+        self.connections: List[Connection] = []
+        self.task: Optional[asyncio.Future] = None
+
+    def join(self, connection: Connection):
+        """Add a player for the connection and send it the state of the maze.
+
+        Raises:
+            maze.MazeFullError: If the max amount of players has been reached.
+        """
+        connection.player_controller = self.controller.new_player()
+        player_id = connection.player_controller.player.id
+        self.connections.append(connection)
+
+        # The pending changes are sent again at the next tick: applying them is a no-op.
+        header = protocol.WELCOME_HEADER.pack(
+            player_id, self.maze.height, self.maze.width, self.delta_time, self.tick, self.maze.time
+        )
+        connection.send(protocol.encode(protocol.WELCOME, header + delta.keyframe(self.maze)))
+
+    def leave(self, connection: Connection):
+        """Remove the player of the connection. Its slot can be taken by the next client joining."""
+        if connection.player_controller is not None:
+            self.connections.remove(connection)
+            self.controller.remove_player(connection.player_controller)
+            connection.player_controller = None
+
+    def step(self):
+        """Spend a tick and broadcast the changes of the maze."""
+        self.controller.time_spend(self.delta_time)
+        self.tick += 1
+
+        operations = self.recorder.take()
+        if operations:
+            message = protocol.encode(
+                protocol.STATE, protocol.STATE_HEADER.pack(self.tick, self.maze.time) + operations
+            )
+            for connection in self.connections:
+                connection.send(message)
+
+    async def run(self):
+        """Tick at a fixed rate until the room is empty."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self.connections:
+            self.step()
+            next_tick += self.delta_time
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+class Server:
+    """Server of the rooms.
+
+    Rooms are created when a client joins them, and removed once empty. Their maze is one of
+    the data folder (See `maze.Maze.ids`): other maze ids are refused.
+
+    Attrs:
+        delta_time (float): Time spent at each tick of the rooms (in seconds).
+        rooms (Dict[str, Room]): The rooms, by name.
+    """
+    MAX_MESSAGE_SIZE = 1024
+    MAZE_ID = re.compile(r'[0-9A-Za-z_-]{1,64}')
+
+    def __init__(self, delta_time: float = 1 / 48):
+        self.delta_time = delta_time
+        self.rooms: Dict[str, Room] = {}
+
+    async def start(self, host: str = 'localhost', port: int = 0) -> asyncio.AbstractServer:
+        """Start listening. (Port 0 picks a free port: see the sockets of the returned server)"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def room(self, name: str, maze_id: str) -> Room:
+        """The room of the given name. It is created with the maze if it does not exist.
+
+        Raises:
+            protocol.ProtocolError: If the room is created with an unknown maze.
+        """
+        room = self.rooms.get(name)
+        if room is None:
+            if not self.MAZE_ID.fullmatch(maze_id) or maze_id not in maze.Maze.ids():
+                raise protocol.ProtocolError(f"Unknown maze {maze_id[:64]!r}.")
+            room = Room(name, maze.Maze.from_id(maze_id), self.delta_time)
+            self.rooms[name] = room
+        return room
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(reader, writer)
+        room = None
+        try:
+            kind, payload = await protocol.read_message(reader, self.MAX_MESSAGE_SIZE)
+            if kind != protocol.JOIN:
+                raise protocol.ProtocolError("The first message should be JOIN.")
+            join = json.loads(payload)
+            if not isinstance(join, dict) or not all(isinstance(join.get(key), str) for key in ('room', 'maze')):
+                raise protocol.ProtocolError("JOIN should give the names of the room and of the maze.")
+            room = self.room(join['room'], join['maze'])
+            room.join(connection)
+            if room.task is None or room.task.done():
+                room.task = asyncio.ensure_future(self._run_room(room))
+
+            while True:
+                kind, payload = await protocol.read_message(reader, self.MAX_MESSAGE_SIZE)
+                if kind != protocol.INPUT:
+                    raise protocol.ProtocolError(f"Unexpected message {kind}.")
+                direction, bombs = protocol.INPUT_MESSAGE.unpack(payload)
+                connection.player_controller.apply(base.Action(replay.DIRECTIONS[direction], bool(bombs)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (protocol.ProtocolError, maze.MazeFullError, OSError, ValueError, KeyError, IndexError,
+                struct.error) as error:
+            connection.close(str(error))
+        finally:
+            if room is not None:
+                room.leave(connection)
+            connection.close()
+
+    async def _run_room(self, room: Room):
+        await room.run()
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a bomberman server.")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=7777)
+    args = parser.parse_args()
+
+    async def serve():
+        server = await Server().start(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
@@ -0,0 +1,149 @@
+"""Per-frame profiling of the game loop.
+
+The time spent in each phase of a frame is measured between successive laps, and the
+events dispatched by the observables are counted by event class during the frame. (See
+`Observable.count_dispatched`) Rolling percentiles over the last frames are exported to a csv
+or json file, and can be displayed by `view.profiler_view.ProfilerView`.
+
+When the game is not profiled, no profiler is created and the events are not counted:
+the only cost left is a test per phase.
+"""
+
+from __future__ import annotations
+
+import collections
+import csv
+import json
+import time
+from typing import Deque, Dict, List, Optional, Sequence
+
+from .designpattern import observable
+
+
+class RollingSamples:
+    """Last values of named series, and their percentiles.
+
+    Attrs:
+        window (int): Number of values kept for each series.
+        percentiles (Sequence[int]): The percentiles reported.
+        samples (Dict[str, Deque[float]]): Last values of each series.
+    """
+    def __init__(self, window: int = 240, percentiles: Sequence[int] = (50, 90, 99)):
+        self.window = window
+        self.percentiles = percentiles
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def add(self, name: str, value: float):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = collections.deque(maxlen=self.window)
+        samples.append(value)
+
+    def stats(self) -> List[str]:
+        """Names of the statistics of a report, in order. (See `report`)"""
+        return ['frame'] + [f'p{percentile}' for percentile in self.percentiles] + ['max']
+
+    def report(self, frame: int) -> Dict[str, Dict[str, float]]:
+        """Percentiles (and max) of each series over its last values.
+
+        Returns:
+            Dict[str, Dict[str, float]]: For each series, {'frame': frame, 'p50': ..., 'max': ...}.
+        """
+        report = {}
+        for name, samples in sorted(self.samples.items()):
+            values = sorted(samples)
+            stats = {'frame': frame}
+            for percentile in self.percentiles:
+                stats[f'p{percentile}'] = values[min(len(values) - 1, len(values) * percentile // 100)]
+            stats['max'] = values[-1]
+            report[name] = stats
+        return report
+
+
+class FrameProfiler:
+    """Measure the phases of each frame and the events dispatched during it.
+
+    Usage:
+        profiler.start_frame()
+        ...  # Handle the inputs
+        profiler.lap('events')
+        ...  # Display
+        profiler.lap('display')
+        profiler.end_frame()
+
+    Time spent between `end_frame` and the next `start_frame` is not measured.
+
+    Attrs:
+        interval (int): A report is added every `interval` frames. (See `reports`)
+        output (Optional[str]): File (.csv or .json) in which the reports are written on `close`.
+        rolling (RollingSamples): Last values of each series, over `window` frames: the time of each phase and of
+            the whole frame (in seconds), and the number of events dispatched of each class ('events/<class>').
+        reports (List[Dict[str, Dict[str, float]]]): Percentiles of each series, every `interval` frames.
+        frame (int): Number of frames done.
+    """
+    def __init__(self, output: Optional[str] = None, window: int = 240, interval: int = 48,
+                 percentiles: Sequence[int] = (50, 90, 99)):
+        self.interval = interval
+        self.output = output
+        self.rolling = RollingSamples(window, percentiles)
+        self.reports: List[Dict[str, Dict[str, float]]] = []
+        self.frame = 0
+
+        self.dispatched: collections.Counter = collections.Counter()
+        self._times: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def enable(self):
+        """Start counting the events dispatched by all the observables."""
+        observable.Observable.count_dispatched(self.dispatched)
+
+    def disable(self):
+        if observable.Observable.dispatched is self.dispatched:
+            observable.Observable.count_dispatched(None)
+
+    def start_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """End the current phase of the frame. (It starts at the previous lap or at the start of the frame)"""
+        now = time.perf_counter()
+        self._times[phase] = self._times.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        self._times['frame'] = self._last - self._frame_start
+        for event_type, count in self.dispatched.items():
+            self._times[f'events/{event_type.__name__}'] = count
+        for name in self.rolling.samples:
+            if name not in self._times:  # No event of this class dispatched during the frame
+                self._times[name] = 0
+        for name, value in self._times.items():
+            self.rolling.add(name, value)
+        self._times = {}
+        self.dispatched.clear()
+
+        self.frame += 1
+        if self.frame % self.interval == 0:
+            self.reports.append(self.report())
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles (and max) of each series over the last frames. (See `RollingSamples.report`)"""
+        return self.rolling.report(self.frame)
+
+    def close(self):
+        """Stop counting the events and write the reports in the output file (if any)."""
+        self.disable()
+        if not self.output:
+            return
+        if self.output.endswith('.json'):
+            with open(self.output, 'w', encoding='utf-8') as file:
+                json.dump(self.reports, file, indent=2)
+            return
+        with open(self.output, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            stats = self.rolling.stats()
+            writer.writerow(['series'] + stats)
+            for report in self.reports:
+                for name, values in report.items():
+                    writer.writerow([name] + [values[stat] for stat in stats])
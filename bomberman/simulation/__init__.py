@@ -0,0 +1,16 @@
+"""Simulation of the game without display.
+
+Runs the model as fast as possible, driven by programmatic inputs.
+This package does not depend on pygame.
+
+The batch module requires numpy and is not imported by default.
+"""
+
+from . import headless
+from . import match_log
+from . import replay
+from . import runner
+from . import sandbox
+
+
+__all__ = ['batch', 'headless', 'match_log', 'replay', 'runner', 'sandbox']
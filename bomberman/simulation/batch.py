@@ -0,0 +1,327 @@
+"""Batch engine: steps many independent mazes at once with numpy.
+
+The state of all the games is held in numpy arrays, and each step advances all of them
+with the same rules as `Player.move` (movement and collisions), `Maze.time_spend` (bombs deadlines)
+and `blast.explode` (rays, chain reactions and eliminations).
+
+Requires numpy (`pip install bomberman[simulation]`).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..model import maze
+from ..model import obstacle
+from ..model import player
+
+from ..model import BOX_SIZE
+
+
+class Rules(NamedTuple):
+    """Rules shared by all the games of a batch. (Defaults of `player.Player` and `obstacle.Bomb`)
+
+    Attrs:
+        player_size (int): Width and height of the players (in pixels).
+        speed (float): Speed of the players (in pixels per second).
+        bombs_timeout (float): Time before the bombs explode (in seconds).
+        bombs_radius (int): Number of boxes reached by the rays of the bombs.
+    """
+    player_size: int = BOX_SIZE * 8 // 10
+    speed: float = player.Player.DEFAULT_SPEED
+    bombs_timeout: float = obstacle.Bomb.DEFAULT_TIMEOUT
+    bombs_radius: int = obstacle.Bomb.DEFAULT_RADIUS
+
+
+class BombGrids(NamedTuple):
+    """The bomb of each box of the games. (N, H, W) each
+
+    Attrs:
+        owner (np.ndarray): Player that dropped the bomb. -1 if no bomb. int64
+        deadline (np.ndarray): Game time at which the bomb explodes. float64
+        radius (np.ndarray): Radius of the bomb. int64
+    """
+    owner: np.ndarray
+    deadline: np.ndarray
+    radius: np.ndarray
+
+
+class _Wave(NamedTuple):
+    """Boxes of a wave of explosions. (See `BatchGame._explode`) (N, H, W) each, bool
+
+    Attrs:
+        stops (np.ndarray): Boxes of the walls and bombs already reached (by the former waves too).
+        blasted (np.ndarray): Boxes reached by the explosion (by the former waves too).
+        reached (np.ndarray): Bombs reached by the rays of the wave: they explode in the next one.
+        destroyed (np.ndarray): Wood walls destroyed by the wave.
+    """
+    stops: np.ndarray
+    blasted: np.ndarray
+    reached: np.ndarray
+    destroyed: np.ndarray
+
+
+class BatchGame:
+    """Batch of games stepped in lockstep.
+
+    All the mazes should have the same width and height. Each game has the same number of players,
+    who have all joined at the creation of the batch.
+
+    Cell codes of `walls` are the type codes of the maze cells (See `obstacle.Obstacle.code`):
+    0 for an empty box, 2 for a WoodWall (destroyed by bombs), others resist bombs.
+
+    Actions of the players are given as direction codes (See `DIRECTIONS`) and a boolean to drop a bomb.
+    The actions of the eliminated players are ignored.
+
+    Attrs:
+        batch_size (int): Number of games N.
+        players_number (int): Number of players P in each game.
+        height, width (int, int): Size of the mazes (H, W) in boxes.
+        delta_time (float): Time spent at each step (in seconds).
+        rules (Rules): The rules of the games.
+        time (float): Game time of all the games (in seconds).
+        walls (np.ndarray): Cell codes of the walls. (N, H, W), int8
+        positions (np.ndarray): Position in pixels of the players. (N, P, 2), float64
+        alive (np.ndarray): Whether each player is still in its game (not eliminated). (N, P), bool
+        bombs_capacity (np.ndarray): Number of bombs that each player can still drop. (N, P), int64
+        bombs (BombGrids): The bomb of each box.
+    """
+    EMPTY = 0
+    STONE_WALL = obstacle.StoneWall.code
+    WOOD_WALL = obstacle.WoodWall.code
+
+    # Direction code -> player.Direction. (0 stands for no move)
+    DIRECTIONS = (None, player.Direction.UP, player.Direction.DOWN, player.Direction.RIGHT, player.Direction.LEFT)
+    _AXIS = np.array([0] + [direction.value[0] for direction in DIRECTIONS[1:]])
+    _SIGN = np.array([0] + [direction.value[1] for direction in DIRECTIONS[1:]])
+
+    def __init__(self, mazes: Sequence[maze.Maze], players_number: int,
+                 delta_time: float = 1 / 48, rules: Rules = Rules()):
+        """Constructor.
+
+        Args:
+            mazes (Sequence[maze.Maze]): The initial state of each game.
+            players_number (int): Number of players in each game.
+            delta_time (float): Time spent at each step (in seconds).
+            rules (Rules): The rules of the games.
+
+        Raises:
+            ValueError: If the mazes do not have the same size.
+            maze.MazeFullError: If a maze does not have enough initial positions.
+        """
+        self.players_number = players_number
+        self.delta_time = delta_time
+        self.rules = rules
+        self.time = 0.0
+
+        shape = (len(mazes), mazes[0].height, mazes[0].width)
+        self.walls = np.zeros(shape, dtype=np.int8)
+        self.bombs = BombGrids(
+            np.full(shape, -1, dtype=np.int64), np.zeros(shape, dtype=np.float64), np.zeros(shape, dtype=np.int64)
+        )
+
+        self.positions = np.zeros((len(mazes), players_number, 2), dtype=np.float64)
+        self.alive = np.ones((len(mazes), players_number), dtype=bool)
+        self.bombs_capacity = np.full((len(mazes), players_number), player.Player.DEFAULT_BOMB_CAPACITY)
+
+        for n, maze_ in enumerate(mazes):
+            self._load(n, maze_)
+
+    @property
+    def batch_size(self) -> int:
+        return self.walls.shape[0]
+
+    @property
+    def height(self) -> int:
+        return self.walls.shape[1]
+
+    @property
+    def width(self) -> int:
+        return self.walls.shape[2]
+
+    @staticmethod
+    def from_maze(maze_: maze.Maze, batch_size: int, players_number: int, delta_time: float = 1 / 48) -> BatchGame:
+        """Create a batch of games starting from the same maze."""
+        return BatchGame([maze_] * batch_size, players_number, delta_time)
+
+    def _load(self, n: int, maze_: maze.Maze):
+        if (maze_.height, maze_.width) != (self.height, self.width):
+            raise ValueError("All the mazes of a batch should have the same size.")
+        if len(maze_.players_initial_positions) < self.players_number:
+            raise maze.MazeFullError("No more players can be added to this maze.")
+
+        self.walls[n] = np.frombuffer(bytes(maze_.cells), dtype=np.int8).reshape(self.height, self.width)
+
+        offset = (BOX_SIZE - self.rules.player_size) / 2
+        for p in range(self.players_number):
+            i, j = maze_.players_initial_positions[p]
+            self.positions[n, p] = (j * BOX_SIZE + offset, i * BOX_SIZE + offset)
+
+    def step(self, directions: np.ndarray, bombs: Optional[np.ndarray] = None):
+        """Apply the actions of all the players and spend `delta_time` in all the games.
+
+        Same order as the headless engine: bombs are dropped, then players move and
+        finally the time is spent and the bombs whose deadline has passed explode.
+
+        Args:
+            directions (np.ndarray): Direction code of each player. (N, P), int
+            bombs (np.ndarray): Whether each player drops a bomb. (N, P), bool
+        """
+        if bombs is not None:
+            self._drop_bombs(np.asarray(bombs, dtype=bool))
+        self._move(np.asarray(directions))
+        self._spend_time()
+
+    def _cells(self, positions: np.ndarray):
+        """Box indexes (i, j) of positions in pixels."""
+        cells = np.floor_divide(positions, BOX_SIZE).astype(np.int64)
+        return cells[..., 1], cells[..., 0]
+
+    def _drop_bombs(self, bombs: np.ndarray):
+        games = np.arange(self.batch_size)
+        for p in range(self.players_number):  # Sequential: players of the same game may compete for a box.
+            center_i, center_j = self._cells(self.positions[:, p] + self.rules.player_size / 2)
+            dropping = (
+                bombs[:, p]
+                & self.alive[:, p]
+                & (self.bombs_capacity[:, p] > 0)
+                & (self.bombs.owner[games, center_i, center_j] < 0)
+            )
+            games_, center_i, center_j = games[dropping], center_i[dropping], center_j[dropping]
+            self.bombs.owner[games_, center_i, center_j] = p
+            self.bombs.deadline[games_, center_i, center_j] = self.time + self.rules.bombs_timeout
+            self.bombs.radius[games_, center_i, center_j] = self.rules.bombs_radius
+            self.bombs_capacity[games_, p] -= 1
+
+    def _blocking(self, games: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Whether the boxes are blocking. Boxes outside the maze are blocking."""
+        inside = (i >= 0) & (j >= 0) & (i < self.height) & (j < self.width)
+        blocking = ~inside
+        blocking[inside] = self.walls[games[inside], i[inside], j[inside]] != self.EMPTY
+        return blocking
+
+    def _move(self, directions: np.ndarray):
+        games, players = np.nonzero(directions * self.alive)
+        if games.size == 0:
+            return
+        codes = directions[games, players]
+        axis = self._AXIS[codes]
+        sign = self._SIGN[codes]
+
+        positions = self.positions[games, players]
+        along = positions[np.arange(games.size), axis] + sign * (self.delta_time * self.rules.speed)
+        edge, blocked = self._sweep(games, axis, sign, self._front_boxes(positions, axis, sign, along))
+        along = np.where(
+            blocked,
+            np.where(sign > 0, edge * BOX_SIZE - self.rules.player_size, (edge + 1) * BOX_SIZE),
+            along,
+        )
+        self.positions[games, players, axis] = along
+
+    def _front_boxes(self, positions: np.ndarray, axis: np.ndarray, sign: np.ndarray,
+                     along: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Boxes of the moves: of the front edge along the axis (before and after the move), and covered across it.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The first and last boxes of the front edge
+                along the axis, and the two boxes covered across it.
+        """
+        moves = np.arange(axis.size)
+        cross = positions[moves, 1 - axis]
+        front = np.where(sign > 0, self.rules.player_size - 1, 0)
+        return (
+            np.floor_divide(positions[moves, axis] + front, BOX_SIZE).astype(np.int64),
+            np.floor_divide(along + front, BOX_SIZE).astype(np.int64),
+            np.floor_divide(cross, BOX_SIZE).astype(np.int64),
+            np.floor_divide(cross + self.rules.player_size - 1, BOX_SIZE).astype(np.int64),
+        )
+
+    def _sweep(self, games: np.ndarray, axis: np.ndarray, sign: np.ndarray,
+               boxes: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Check in order the boxes entered by the front edge of the moves. (Swept collision, as in `Player.move`)
+
+        Args:
+            boxes (Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]): The boxes of the moves. (See `_front_boxes`)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The last box of the front edge checked along the axis,
+                and whether it blocks the move.
+        """
+        start, stop, first, second = boxes
+        x_axis = axis == 0
+        span = np.abs(stop - start)
+        blocked = np.zeros(games.size, dtype=bool)
+        edge = start.copy()
+        for k in range(int(span.max()) + 1):
+            active = ~blocked & (k <= span)
+            edge[active] = start[active] + sign[active] * k
+            blocked |= active & (
+                self._blocking(games, np.where(x_axis, first, edge), np.where(x_axis, edge, first))
+                | self._blocking(games, np.where(x_axis, second, edge), np.where(x_axis, edge, second))
+            )
+        return edge, blocked
+
+    def _spend_time(self):
+        self.time += self.delta_time
+        exploding = (self.bombs.owner >= 0) & (self.bombs.deadline < self.time)
+        if exploding.any():
+            self._explode(exploding)
+
+    def _explode(self, exploding: np.ndarray):
+        """Detonate bombs and all the bombs reached by their rays. (Same rules as `blast.explode`)
+
+        The chain reaction is resolved wave by wave: the bombs reached by the rays of a wave
+        explode in the next one. The players whose center is in a box reached are then eliminated.
+
+        Args:
+            exploding (np.ndarray): The bombs to detonate. (N, H, W), bool
+        """
+        stops = exploding.copy()
+        blasted = exploding.copy()
+        while exploding.any():
+            wave = _Wave(stops, blasted, np.zeros_like(exploding), np.zeros_like(exploding))
+            self._detonate(exploding, wave)
+            self.walls[wave.destroyed] = self.EMPTY
+            stops |= wave.reached | wave.destroyed
+            exploding = wave.reached
+
+        center_i, center_j = self._cells(self.positions + self.rules.player_size / 2)
+        games = np.arange(self.batch_size)[:, None]
+        self.alive &= ~blasted[games, center_i, center_j]
+
+    def _detonate(self, exploding: np.ndarray, wave: _Wave):
+        """Remove the bombs of a wave, and cast their rays."""
+        games, i, j = np.nonzero(exploding)
+        radius = self.bombs.radius[games, i, j]
+        np.add.at(self.bombs_capacity, (games, self.bombs.owner[games, i, j]), 1)
+        self.bombs.owner[games, i, j] = -1
+        for direction in self.DIRECTIONS[1:]:
+            self._ray(wave, direction, (games, i, j), radius)
+
+    def _ray(self, wave: _Wave, direction: player.Direction, bombs: Tuple[np.ndarray, np.ndarray, np.ndarray],
+             radius: np.ndarray):
+        """Cast the rays of the bombs (games, i, j) in a direction, until they stop."""
+        games, i, j = bombs
+        axis, sign = direction.value
+        active = np.ones(games.size, dtype=bool)
+        for k in range(1, radius.max() + 1):
+            ray_i = i + sign * k * (axis == 1)
+            ray_j = j + sign * k * (axis == 0)
+            active &= (k <= radius) & (ray_i >= 0) & (ray_j >= 0) & (ray_i < self.height) & (ray_j < self.width)
+            rays = np.nonzero(active)[0]
+            if rays.size == 0:
+                break
+            active[rays[self._reach(wave, games[rays], ray_i[rays], ray_j[rays])]] = False
+
+    def _reach(self, wave: _Wave, games: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Blast the boxes reached by rays. Returns whether each ray stops there (on a wall or a bomb)."""
+        wave.blasted[games, i, j] = True
+        stop = wave.stops[games, i, j]
+        bomb = ~stop & (self.bombs.owner[games, i, j] >= 0)
+        wall = ~stop & ~bomb & (self.walls[games, i, j] != self.EMPTY)
+        wave.reached[games[bomb], i[bomb], j[bomb]] = True
+        wood = wall & (self.walls[games, i, j] == self.WOOD_WALL)
+        wave.destroyed[games[wood], i[wood], j[wood]] = True
+        return stop | bomb | wall
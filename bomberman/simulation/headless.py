@@ -0,0 +1,145 @@
+"""Headless engine: runs a maze with scripted or programmatic inputs.
+
+The model is stepped with a fixed delta time, without any window nor frame rate limit.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, Optional
+
+from ..controller import base
+from ..designpattern import event_queue
+from ..model import maze
+from ..model import player
+
+
+# A policy gives the action of a player at each tick.
+Policy = Callable[['HeadlessGame', player.Player], base.Action]
+
+
+def idle(game: HeadlessGame, player_: player.Player) -> base.Action:  # pylint: disable = unused-argument
+    """Policy of a player that does nothing."""
+    return base.Action()
+
+
+class ScriptedPolicy:
+    """Policy following a script of actions.
+
+    The direction of the last action is kept until the next scripted action.
+    Bombs are only dropped at the exact tick of their action.
+    """
+    def __init__(self, script: Dict[int, base.Action]):
+        """Constructor.
+
+        Args:
+            script (Dict[int, base.Action]): The action to apply at each tick.
+        """
+        self.script = script
+        self.direction = None
+
+    def __call__(self, game: HeadlessGame, player_: player.Player) -> base.Action:
+        action = self.script.get(game.tick, None)
+        if action is None:
+            return base.Action(self.direction)
+        self.direction = action.direction
+        return action
+
+
+class RandomPolicy:
+    """Policy of a player that wanders randomly and drops bombs from time to time."""
+    def __init__(self, seed: Optional[int] = None, change_probability: float = 0.05,
+                 bombs_probability: float = 0.01):
+        """Constructor.
+
+        Args:
+            seed (int): Seed of the random generator.
+            change_probability (float): Probability to change of direction at each tick.
+            bombs_probability (float): Probability to drop a bomb at each tick.
+        """
+        self.random = random.Random(seed)
+        self.change_probability = change_probability
+        self.bombs_probability = bombs_probability
+        self.direction = None
+
+    def __call__(self, game: HeadlessGame, player_: player.Player) -> base.Action:
+        if self.random.random() < self.change_probability:
+            self.direction = self.random.choice([None, *player.Direction])
+        return base.Action(self.direction, self.random.random() < self.bombs_probability)
+
+
+class HeadlessGame:
+    """Run a maze without display.
+
+    Attrs:
+        maze (maze.Maze): The maze simulated.
+        controller (base.BaseMazeController): The controller of the maze.
+        delta_time (float): Time spent at each step (in seconds).
+        tick (int): Number of steps done.
+        policies (Dict[int, Policy]): The policy of each player, by player id.
+        event_queue (Optional[event_queue.EventQueue]): If the events of the model are deferred,
+            the queue flushed at the end of each step.
+    """
+    DEFAULT_DELTA_TIME = 1 / 48
+
+    def __init__(self, maze_: maze.Maze, delta_time: float = DEFAULT_DELTA_TIME, defer_events: bool = False):
+        """Constructor.
+
+        Args:
+            maze_ (maze.Maze): The maze to simulate.
+            delta_time (float): Time spent at each step (in seconds).
+            defer_events (bool): Defer the events of the model and dispatch them once per step,
+                merging the successive moves of a player.
+        """
+        self.maze = maze_
+        self.event_queue = None
+        if defer_events:
+            self.event_queue = event_queue.EventQueue()
+            self.maze.defer_events(self.event_queue)
+        self.controller = base.BaseMazeController(self.maze)
+        self.delta_time = delta_time
+        self.tick = 0
+        self.policies: Dict[int, Policy] = {}
+
+    @property
+    def time(self) -> float:
+        return self.tick * self.delta_time
+
+    def add_player(self, policy: Policy = idle) -> player.Player:
+        """Add a new player in the maze, driven by the given policy.
+
+        Raises:
+            maze.MazeFullError: If the max amount of players has been reached.
+        """
+        player_controller = self.controller.new_player()
+        self.policies[player_controller.player.id] = policy
+        return player_controller.player
+
+    def step(self):
+        """Apply the actions of the players and spend `delta_time`."""
+        for player_controller in self.controller.players:
+            policy = self.policies.get(player_controller.player.id, None)
+            if policy:
+                player_controller.apply(policy(self, player_controller.player))
+
+        self.controller.time_spend(self.delta_time)
+        self.tick += 1
+
+        if self.event_queue is not None:
+            self.event_queue.flush()
+
+    def run(self, ticks: int, until: Optional[Callable[[HeadlessGame], bool]] = None) -> int:
+        """Step the game several times.
+
+        Args:
+            ticks (int): Max number of steps.
+            until (Callable[[HeadlessGame], bool]): Optional stop condition checked after each step.
+
+        Returns:
+            int: The number of steps done.
+        """
+        for done in range(1, ticks + 1):
+            self.step()
+            if until and until(self):
+                return done
+        return ticks
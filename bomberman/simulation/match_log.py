@@ -0,0 +1,281 @@
+"""Binary log of the states of a match, to spectate or analyse it at any moment.
+
+The log is built from the events of the model. It is a sequence of records, each one for a tick:
+    * Keyframes hold a full snapshot of the maze (cells, players and bombs).
+    * Frames hold the changes of a tick: players moves, new and deleted players and obstacles.
+(See `delta` for the encoding of the states and changes)
+A keyframe is written every `keyframe_interval` ticks, and an index of the keyframes is appended
+when the log is closed, so that any tick is reached in O(log n) plus at most one interval of frames.
+
+The records are written to disk by a background thread, and the log is read through mmap.
+As the keyframes copy all the cells of the maze in the game loop, only mazes up to `MAX_CELLS`
+boxes can be logged (and their sides, as the boxes of the operations, are stored on 16 bits).
+
+Layout (little endian):
+    Header: magic, version, height, width, delta time
+    Record: kind, tick, game time, payload size, payload (cells for a keyframe, then operations)
+    Index: (tick, offset) of each keyframe
+    Trailer: offset of the index, number of keyframes, magic
+"""
+
+from __future__ import annotations
+
+import mmap
+import queue
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..model import delta
+from ..model import maze
+
+
+KEYFRAME = 1
+FRAME = 2
+
+MAGIC = b'BMBL'
+VERSION = 2
+_HEADER = struct.Struct('<4sBHHd')
+_RECORD = struct.Struct('<BIdI')
+_INDEX_ENTRY = struct.Struct('<Iq')
+_TRAILER = struct.Struct('<qI4s')
+_INDEX_MAGIC = b'BMBX'
+
+MAX_SIDE = 0xFFFF
+MAX_CELLS = 1 << 22
+
+
+class MatchState:
+    """State of a match at a tick, as read from a log.
+
+    Attrs:
+        tick (int): The tick.
+        time (float): Game time of the last record applied (in seconds).
+        height, width (int, int): Size of the maze in boxes.
+        cells (bytearray): Type code of the wall of each box. (See `maze.Maze.cells`)
+        players (Dict[int, Tuple[float, float]]): Position of each player, by id.
+        bombs (Dict[Tuple[int, int], int]): Owner id of the bomb of each box.
+    """
+    def __init__(self, height: int, width: int):
+        self.tick = 0
+        self.time = 0.0
+        self.height = height
+        self.width = width
+        self.cells = bytearray(height * width)
+        self.players: Dict[int, Tuple[float, float]] = {}
+        self.bombs: Dict[Tuple[int, int], int] = {}
+
+    def apply(self, data, offset: int, end: int):
+        """Apply the operations stored in data[offset:end]. (See `delta`)"""
+        for operation, args in delta.unpack(data, offset, end):
+            if operation in (delta.NEW_PLAYER, delta.MOVE_PLAYER):
+                self.players[args[0]] = (args[1], args[2])
+            elif operation == delta.DELETE_PLAYER:
+                self.players.pop(args[0], None)
+            elif operation == delta.NEW_WALL:
+                self.cells[args[1] * self.width + args[2]] = args[0]
+            elif operation == delta.DELETE_WALL:
+                self.cells[args[0] * self.width + args[1]] = 0
+            elif operation == delta.NEW_BOMB:
+                self.bombs[args[1], args[2]] = args[0]
+            else:
+                self.bombs.pop(args, None)
+
+
+class MatchLogWriter:
+    """Write the log of a match while it is played.
+
+    The changes of the maze are gathered from its events during a tick (See `delta.DeltaRecorder`),
+    and `frame` should be called at the end of each tick (after the events have been dispatched
+    if they are deferred). The records are packed in the game loop, but the writes to the file
+    are done by a background thread.
+
+    Attrs:
+        maze (maze.Maze): The maze logged.
+        keyframe_interval (int): Number of ticks between two keyframes.
+        index (List[Tuple[int, int]]): Tick and offset of each keyframe written.
+    """
+    def __init__(self, file_name: str, maze_: maze.Maze, delta_time: float, keyframe_interval: int = 240):
+        """Constructor. Write the header and the keyframe of the initial state (tick 0).
+
+        Args:
+            file_name (str): The file to write.
+            maze_ (maze.Maze): The maze to log.
+            delta_time (float): The fixed delta time of the ticks (in seconds).
+            keyframe_interval (int): Number of ticks between two keyframes.
+
+        Raises:
+            ValueError: If the maze is too large to be logged. (See `MAX_SIDE` and `MAX_CELLS`)
+        """
+        if max(maze_.width, maze_.height) > MAX_SIDE or maze_.width * maze_.height > MAX_CELLS:
+            raise ValueError(f"A {maze_.width}x{maze_.height} maze is too large to be logged "
+                             f"(at most {MAX_SIDE} boxes per side and {MAX_CELLS} boxes).")
+        self.maze = maze_
+        self.keyframe_interval = keyframe_interval
+        self.index: List[Tuple[int, int]] = []
+        self.recorder = delta.DeltaRecorder(maze_)
+        self.offset = 0
+
+        self.chunks: queue.SimpleQueue = queue.SimpleQueue()
+        self.file = open(file_name, 'wb')  # pylint: disable = consider-using-with
+        self.thread = threading.Thread(target=self._write_chunks, daemon=True)
+        self.thread.start()
+
+        self._write(_HEADER.pack(MAGIC, VERSION, self.maze.height, self.maze.width, delta_time))
+        self._write_keyframe(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _write_chunks(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                break
+            self.file.write(chunk)
+        self.file.close()
+
+    def _write(self, chunk: bytes):
+        self.chunks.put(chunk)
+        self.offset += len(chunk)
+
+    def _write_record(self, kind: int, tick: int, payload: bytes):
+        self._write(_RECORD.pack(kind, tick, self.maze.time, len(payload)) + payload)
+
+    def _write_keyframe(self, tick: int):
+        self.index.append((tick, self.offset))
+        self._write_record(KEYFRAME, tick, delta.keyframe(self.maze))
+
+    def frame(self, tick: int):
+        """Write the record of a tick. (A keyframe every `keyframe_interval` ticks)
+
+        Ticks can be skipped (for instance when several ticks are run for one rendered frame):
+        the record then holds the changes of all the ticks since the previous one.
+        """
+        restored = self.recorder.restored
+        operations = self.recorder.take()
+        if restored or tick >= self.index[-1][0] + self.keyframe_interval:
+            self._write_keyframe(tick)
+        elif operations:
+            self._write_record(FRAME, tick, operations)
+
+    def close(self):
+        """Write the index and wait for the end of the writes."""
+        if self.file.closed or not self.thread.is_alive():
+            return
+        index = b''.join(_INDEX_ENTRY.pack(tick, offset) for tick, offset in self.index)
+        self.chunks.put(index + _TRAILER.pack(self.offset, len(self.index), _INDEX_MAGIC))
+        self.chunks.put(None)
+        self.thread.join()
+
+
+class MatchLogReader:
+    """Read a match log through mmap.
+
+    Logs that have not been closed (still written, or interrupted) can also be read:
+    their keyframes are then found by scanning the records.
+
+    Attrs:
+        height, width (int, int): Size of the maze in boxes.
+        delta_time (float): The fixed delta time of the ticks (in seconds).
+        last_tick (int): Tick of the last record of the log.
+    """
+    def __init__(self, file_name: str):
+        """Constructor.
+
+        Raises:
+            ValueError: If the file is not a match log.
+        """
+        with open(file_name, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.data) < _HEADER.size:
+            raise ValueError("Truncated match log.")
+        magic, version, self.height, self.width, self.delta_time = _HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a match log (or unsupported version).")
+
+        self.index_offset = None
+        self.index: Optional[List[Tuple[int, int]]] = None
+        self.records_end = len(self.data)
+        if len(self.data) >= _HEADER.size + _TRAILER.size:
+            index_offset, keyframes, magic = _TRAILER.unpack_from(self.data, len(self.data) - _TRAILER.size)
+            if magic == _INDEX_MAGIC:
+                self.index_offset = index_offset
+                self.keyframes = keyframes
+                self.records_end = index_offset
+        if self.index_offset is None:
+            self._scan()
+
+        self.last_tick = 0
+        offset = self._keyframe(self.keyframes - 1)[1]
+        while offset < self.records_end:
+            _, self.last_tick, _, size = _RECORD.unpack_from(self.data, offset)
+            offset += _RECORD.size + size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def _scan(self):
+        """Build the index of an unclosed log. (Its last record may be partially written)"""
+        self.index = []
+        offset = _HEADER.size
+        while offset + _RECORD.size <= len(self.data):
+            kind, tick, _, size = _RECORD.unpack_from(self.data, offset)
+            if offset + _RECORD.size + size > len(self.data):
+                break
+            if kind == KEYFRAME:
+                self.index.append((tick, offset))
+            offset += _RECORD.size + size
+        self.records_end = offset
+        self.keyframes = len(self.index)
+        if not self.index:
+            raise ValueError("Truncated match log.")
+
+    def _keyframe(self, k: int) -> Tuple[int, int]:
+        """Tick and offset of the k-th keyframe."""
+        if self.index is not None:
+            return self.index[k]
+        return _INDEX_ENTRY.unpack_from(self.data, self.index_offset + k * _INDEX_ENTRY.size)
+
+    def seek(self, tick: int) -> MatchState:
+        """State of the match at the end of a tick.
+
+        The last keyframe before the tick is found by binary search, then the following frames are applied.
+        """
+        low, high = 0, self.keyframes
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._keyframe(middle)[0] <= tick:
+                low = middle
+            else:
+                high = middle
+        offset = self._keyframe(low)[1]
+
+        state = MatchState(self.height, self.width)
+        cells_size = self.height * self.width
+        while offset < self.records_end:
+            kind, record_tick, time, size = _RECORD.unpack_from(self.data, offset)
+            if record_tick > tick:
+                break
+            offset += _RECORD.size
+            if kind == KEYFRAME:
+                state = MatchState(self.height, self.width)
+                state.cells[:] = self.data[offset:offset + cells_size]
+                state.apply(self.data, offset + cells_size, offset + size)
+            else:
+                state.apply(self.data, offset, offset + size)
+            state.time = time
+            offset += size
+
+        state.tick = tick
+        return state
@@ -0,0 +1,203 @@
+"""Record the inputs of a game and replay them in the headless engine.
+
+The log only holds, for each tick, the inputs that differ from the previous tick:
+players joining, changes of direction and bombs dropped. As the model is stepped
+with a fixed delta time, a replay reproduces the recorded game bit for bit.
+
+Can also be used from the command line: `bomberman-replay --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import struct
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from ..controller import base
+from ..model import maze
+from ..model import player
+from . import headless
+from . import match_log
+
+
+# Direction code -> player.Direction. (0 stands for no move, same codes as the batch engine)
+DIRECTIONS = (None, player.Direction.UP, player.Direction.DOWN, player.Direction.RIGHT, player.Direction.LEFT)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+NEW_PLAYER = 255
+
+
+class InputEntry(NamedTuple):
+    """Input of a player at a tick.
+
+    Attrs:
+        tick (int): The tick at which the input is applied.
+        player_id (int): Id of the player.
+        direction (int): Code of the direction followed from this tick (See `DIRECTIONS`),
+            or NEW_PLAYER when the player joins the game.
+        bombs (bool): Whether the player drops a bomb.
+    """
+    tick: int
+    player_id: int
+    direction: int
+    bombs: bool = False
+
+
+class InputLog:
+    """Inputs of a game.
+
+    Attrs:
+        maze_id (str): The id of the maze played.
+        delta_time (float): The fixed delta time of the ticks (in seconds).
+        ticks (int): Number of ticks recorded.
+        entries (List[InputEntry]): The inputs, by tick.
+    """
+    MAGIC = b'BMBI'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sBdIH')
+    _ENTRY = struct.Struct('<IBBB')
+
+    def __init__(self, maze_id: str, delta_time: float):
+        self.maze_id = str(maze_id)
+        self.delta_time = delta_time
+        self.ticks = 0
+        self.entries: List[InputEntry] = []
+
+    def to_bytes(self) -> bytes:
+        maze_id = self.maze_id.encode()
+        header = self._HEADER.pack(self.MAGIC, self.VERSION, self.delta_time, self.ticks, len(maze_id))
+        return b''.join([header, maze_id, *(self._ENTRY.pack(*entry) for entry in self.entries)])
+
+    @staticmethod
+    def from_bytes(data: bytes) -> InputLog:
+        """Parse a log.
+
+        Raises:
+            ValueError: If the data is not a valid input log.
+        """
+        header = InputLog._HEADER
+        if len(data) < header.size:
+            raise ValueError("Truncated input log.")
+        magic, version, delta_time, ticks, maze_id_size = header.unpack_from(data)
+        if magic != InputLog.MAGIC or version != InputLog.VERSION:
+            raise ValueError("Not an input log (or unsupported version).")
+
+        offset = header.size + maze_id_size
+        log = InputLog(data[header.size:offset].decode(), delta_time)
+        log.ticks = ticks
+        log.entries = [
+            InputEntry(tick, player_id, direction, bool(bombs))
+            for tick, player_id, direction, bombs in InputLog._ENTRY.iter_unpack(data[offset:])
+        ]
+        return log
+
+    def save(self, file_name: str):
+        with open(file_name, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @staticmethod
+    def load(file_name: str) -> InputLog:
+        with open(file_name, 'rb') as file:
+            return InputLog.from_bytes(file.read())
+
+
+class InputRecorder:
+    """Record the inputs of the players of a maze controller.
+
+    Set it as `recorder` of the controller: it is called at the beginning of each tick.
+    A player joining in the slot (id) of a removed player is recorded as a new player.
+
+    Attrs:
+        log (InputLog): The log recorded.
+    """
+    def __init__(self, maze_id: str, delta_time: float):
+        self.log = InputLog(maze_id, delta_time)
+        self.players: Dict[int, player.Player] = {}
+        self.directions: Dict[int, Optional[player.Direction]] = {}
+
+    def record(self, controller: base.BaseMazeController):
+        tick = self.log.ticks
+        for player_controller in controller.players:
+            player_id = player_controller.player.id
+            if self.players.get(player_id) is not player_controller.player:
+                self.log.entries.append(InputEntry(tick, player_id, NEW_PLAYER))
+                self.players[player_id] = player_controller.player
+                self.directions[player_id] = None
+
+            direction = player_controller.current_direction
+            if direction != self.directions[player_id] or player_controller.bombs_requested:
+                self.log.entries.append(
+                    InputEntry(tick, player_id, DIRECTION_CODES[direction], player_controller.bombs_requested)
+                )
+                self.directions[player_id] = direction
+        self.log.ticks += 1
+
+
+def replay(log: InputLog, maze_: Optional[maze.Maze] = None, ticks: Optional[int] = None,
+           match_log_file: Optional[str] = None) -> headless.HeadlessGame:
+    """Replay a log in the headless engine.
+
+    Args:
+        log (InputLog): The inputs to replay.
+        maze_ (maze.Maze): The initial maze. Default to load `log.maze_id`.
+        ticks (int): Number of ticks to replay. Default to the whole log.
+        match_log_file (str): Optional file in which the states of the match are logged.
+            (See `match_log.MatchLogWriter`)
+
+    Returns:
+        headless.HeadlessGame: The game, after the replay.
+    """
+    game = headless.HeadlessGame(maze_ or maze.Maze.from_id(log.maze_id), log.delta_time)
+    ticks = log.ticks if ticks is None else min(ticks, log.ticks)
+
+    new_players: Dict[int, List[int]] = {}
+    scripts: Dict[int, Dict[int, base.Action]] = {}
+    for entry in log.entries:
+        if entry.direction == NEW_PLAYER:
+            new_players.setdefault(entry.tick, []).append(entry.player_id)
+            scripts.setdefault(entry.player_id, {})  # Kept if the player joins again in the same slot.
+        else:
+            scripts[entry.player_id][entry.tick] = base.Action(DIRECTIONS[entry.direction], entry.bombs)
+
+    log_writer = None
+    if match_log_file:
+        log_writer = match_log.MatchLogWriter(match_log_file, game.maze, log.delta_time)
+
+    while game.tick < ticks:
+        for player_id in new_players.get(game.tick, ()):
+            game.add_player(headless.ScriptedPolicy(scripts[player_id]))
+        game.step()
+        if log_writer is not None:
+            log_writer.frame(game.tick)
+
+    if log_writer is not None:
+        log_writer.close()
+    return game
+
+
+def digest(maze_: maze.Maze) -> str:
+    """Digest of the state of a maze, to compare games."""
+    state = hashlib.sha1(bytes(maze_.cells))
+    for player_ in maze_.players:
+        state.update(struct.pack('<Iddi', player_.id, *player_.pos, player_.bombs_capacity))
+    for bomb in maze_.bombs:
+        state.update(struct.pack('<iidi', bomb.i, bomb.j, bomb.time_to_leave, bomb.radius))
+    return state.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded bomberman game without display.")
+    parser.add_argument('log', help="The input log recorded. (See `bomberman --record`)")
+    parser.add_argument('--ticks', type=int, default=None, help="Stop after this number of ticks.")
+    parser.add_argument('--match-log', default=None, help="Log the states of the match in this file.")
+    args = parser.parse_args()
+
+    log = InputLog.load(args.log)
+    start = time.perf_counter()
+    game = replay(log, ticks=args.ticks, match_log_file=args.match_log)
+    duration = time.perf_counter() - start
+
+    print(f"Replayed {game.tick} ticks ({game.time:.1f}s of game) in {duration:.3f}s: "
+          f"x{game.time / max(duration, 1e-9):.0f} real time.")
+    print(f"State digest: {digest(game.maze)}")
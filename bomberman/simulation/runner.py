@@ -0,0 +1,150 @@
+"""Run many headless matches in parallel over a process pool.
+
+Each match is described by a `MatchSpec` (maze, seed, policies of the players) and produces a
+`MatchResult`. Results are streamed back as soon as the matches finish.
+
+Can also be used from the command line: `bomberman-matches --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import random
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+from ..model import events
+from ..model import maze
+from ..model import obstacle
+from . import headless
+
+
+# A policy factory builds the policy of a player from a seed.
+PolicyFactory = Callable[[int], headless.Policy]
+
+DEFAULT_MAX_TICKS = 48 * 180  # 3 minutes of game at the default delta time.
+
+
+POLICIES: Dict[str, PolicyFactory] = {
+    'idle': lambda seed: headless.idle,
+    'random': headless.RandomPolicy,
+}
+
+
+class MatchSpec(NamedTuple):
+    """Description of a match.
+
+    Attrs:
+        maze_id: The id of the maze to play in. (See `maze.Maze.from_id`)
+        seed (int): Seed of the match. The seeds of the policies are derived from it.
+        policies (Sequence[Union[str, PolicyFactory]]): Policy of each player, either
+            a name of `POLICIES` or a picklable factory.
+        max_ticks (int): Maximum number of steps of the match.
+        delta_time (float): Time spent at each step (in seconds).
+    """
+    maze_id: str
+    seed: int
+    policies: Sequence[Union[str, PolicyFactory]]
+    max_ticks: int = DEFAULT_MAX_TICKS
+    delta_time: float = headless.HeadlessGame.DEFAULT_DELTA_TIME
+
+
+class MatchResult(NamedTuple):
+    """Result of a match.
+
+    Attrs:
+        maze_id: The id of the maze.
+        seed (int): Seed of the match.
+        winner (Optional[int]): Id of the last player standing (the others have been eliminated by the bombs).
+            None if there is none (draw, match stopped after `max_ticks` or single player).
+        duration (float): Game time of the match (in seconds).
+        bombs_placed (int): Number of bombs dropped by the players.
+        walls_destroyed (int): Number of obstacles (except bombs) removed from the maze.
+    """
+    maze_id: str
+    seed: int
+    winner: Optional[int]
+    duration: float
+    bombs_placed: int
+    walls_destroyed: int
+
+
+class MatchStatistics:
+    """Count the bombs placed and the walls destroyed in a maze."""
+    def __init__(self, maze_: maze.Maze):
+        self.bombs_placed = 0
+        self.walls_destroyed = 0
+        maze_.subscribe(events.NewObstacleEvent, self.on_new_obstacle)
+        maze_.subscribe(events.DeleteObstacleEvent, self.on_delete_obstacle)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        if isinstance(event_.obstacle, obstacle.Bomb):
+            self.bombs_placed += 1
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        if not isinstance(event_.obstacle, obstacle.Bomb):
+            self.walls_destroyed += 1
+
+
+def play_match(spec: MatchSpec) -> MatchResult:
+    """Play a match in the headless engine."""
+    game = headless.HeadlessGame(maze.Maze.from_id(spec.maze_id), spec.delta_time)
+    statistics = MatchStatistics(game.maze)
+
+    seeds = random.Random(spec.seed)
+    for policy in spec.policies:
+        factory = POLICIES[policy] if isinstance(policy, str) else policy
+        game.add_player(factory(seeds.getrandbits(64)))
+
+    players_number = len(game.maze.players)
+    game.run(spec.max_ticks, until=lambda game_: len(game_.maze.players) <= 1 < players_number)
+
+    winner = None
+    if players_number > 1 and len(game.maze.players) == 1:
+        winner = game.maze.players[0].id
+    return MatchResult(spec.maze_id, spec.seed, winner, game.time, statistics.bombs_placed, statistics.walls_destroyed)
+
+
+def run_matches(specs: Iterable[MatchSpec], processes: Optional[int] = None,
+                chunksize: Optional[int] = None) -> Iterator[MatchResult]:
+    """Play matches over a pool of processes.
+
+    Args:
+        specs (Iterable[MatchSpec]): The matches to play.
+        processes (int): Number of worker processes. Default to the number of cpus.
+        chunksize (int): Number of matches sent at once to a worker.
+            Default to split the matches in about 4 chunks per worker.
+
+    Yields:
+        MatchResult: The results, in the order in which the matches finish.
+    """
+    specs = list(specs)
+    processes = processes or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (4 * processes))
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(play_match, specs, chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play headless bomberman matches and print their results as json lines."
+    )
+    parser.add_argument('--mazes', nargs='+', default=['1'], help="Ids of the mazes.")
+    parser.add_argument('--seeds', type=int, default=100, help="Number of matches (seeds) per maze.")
+    parser.add_argument('--policies', nargs='+', default=['random', 'random'], choices=list(POLICIES),
+                        help="Policy of each player.")
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args()
+
+    specs = (
+        MatchSpec(maze_id, seed, args.policies, args.max_ticks)
+        for maze_id in args.mazes
+        for seed in range(args.seeds)
+    )
+    for result in run_matches(specs, args.processes, args.chunksize):
+        print(json.dumps(result._asdict()), flush=True)
@@ -0,0 +1,375 @@
+"""Bots running in their own worker processes, with a time budget at each tick.
+
+Each bot is a process talking over its stdin and stdout with the messages of `network.protocol`:
+it receives the keyframe of the maze (WELCOME), then the changes of each tick (STATE), and answers
+each tick with an ACTION. The states are sent to all the bots at once and their pipes are polled
+together (non-blocking), until all have answered or the deadline of the tick has passed: the latency
+of a tick is the one of the slowest bot. A bot that misses the deadline, crashes or floods its pipes
+does nothing for the tick (or for the rest of the game).
+
+The processes are isolated from the game, and their memory can be limited (whatever the language of the
+bot: the limit is set by a launcher before it executes the command), but they are not a security sandbox:
+they run with the rights of the game. Pipes are polled with `selectors`: POSIX only.
+
+Python bots are run by this module: `bomberman-bot module:factory`, where the factory builds the policy
+of the player from the mirror of the maze. (See `run` and `chaser`)
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import selectors
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..controller import base
+from ..controller import bot
+from ..model import danger
+from ..model import delta
+from ..model import maze
+from ..model import pathfinding
+from ..model import player
+from ..network import protocol
+from . import replay
+
+
+# Limits the address space of the process (in bytes, first argument), then executes the command that follows.
+# The limit is inherited by the command: it does not rely on the bot. (No preexec_fn: it is not fork safe)
+LAUNCHER = (
+    'import os, resource, sys; limit = int(sys.argv[1]); '
+    'resource.setrlimit(resource.RLIMIT_AS, (limit, limit)); os.execvp(sys.argv[2], sys.argv[2:])'
+)
+
+# A factory builds the policy of a bot from the mirror of the maze and its player.
+# The policy gives the action of the player for the current state of the mirror.
+Factory = Callable[[maze.Maze, player.Player], Callable[[], base.Action]]
+
+
+class SandboxedBot:
+    """A worker process controlling a player.
+
+    Attrs:
+        player (player.Player): The player controlled.
+        process (subprocess.Popen): The worker process.
+        alive (bool): Whether the process still follows the protocol.
+        action (base.Action): The action received for the current tick. (No-op if none)
+        answered (bool): Whether the current tick has been answered.
+    """
+    MAX_BUFFER_SIZE = 1 << 20  # Bots that do not read their messages are stopped.
+
+    def __init__(self, player_: player.Player, command: Sequence[str], memory_limit: Optional[int] = None):
+        """Constructor.
+
+        Args:
+            player_ (player.Player): The player controlled.
+            command (Sequence[str]): The command starting the worker.
+            memory_limit (int): Optional limit of the address space of the worker (in bytes). It is set
+                before the command is executed. (See `LAUNCHER`)
+        """
+        self.player = player_
+        if memory_limit:
+            command = [sys.executable, '-c', LAUNCHER, str(memory_limit), *command]
+        self.process = subprocess.Popen(  # pylint: disable = consider-using-with
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0, start_new_session=True,
+        )
+        os.set_blocking(self.process.stdin.fileno(), False)
+        os.set_blocking(self.process.stdout.fileno(), False)
+        self.alive = True
+        self.action = base.Action()
+        self.answered = False
+        self._input = bytearray()
+        self._output = bytearray()
+
+    @property
+    def pending(self) -> bool:
+        """Whether some messages are not written yet."""
+        return bool(self._output)
+
+    def send(self, message: bytes):
+        if not self.alive:
+            return
+        self._output += message
+        if len(self._output) > self.MAX_BUFFER_SIZE:
+            self.close()
+            return
+        self.flush()
+
+    def flush(self):
+        """Write as much of the pending messages as the pipe accepts."""
+        try:
+            written = os.write(self.process.stdin.fileno(), self._output)
+        except BlockingIOError:
+            return
+        except OSError:
+            self.close()
+            return
+        del self._output[:written]
+
+    def receive(self, tick: int):
+        """Read the answers available. Answers to former ticks are ignored."""
+        try:
+            data = os.read(self.process.stdout.fileno(), 1 << 16)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:  # The worker has exited.
+            self.close()
+            return
+
+        self._input += data
+        try:
+            messages = protocol.split(self._input, protocol.ACTION_MESSAGE.size)
+        except protocol.ProtocolError:
+            self.close()
+            return
+        for kind, payload in messages:
+            if kind != protocol.ACTION or len(payload) != protocol.ACTION_MESSAGE.size:
+                self.close()
+                return
+            answered_tick, direction, bombs = protocol.ACTION_MESSAGE.unpack(payload)
+            if answered_tick == tick and direction < len(replay.DIRECTIONS):
+                self.action = base.Action(replay.DIRECTIONS[direction], bool(bombs))
+                self.answered = True
+
+    def close(self):
+        """Stop the worker. The player does nothing from now on."""
+        self.alive = False
+        self.action = base.Action()
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+
+class BotPool:
+    """The sandboxed bots of a maze.
+
+    At each tick, the first bot asking for its action triggers the exchange with all the bots.
+    (See `action`)
+
+    Attrs:
+        maze (maze.Maze): The maze played.
+        delta_time (float): Time spent at each tick (in seconds), sent to the bots.
+        timeout (float): Time given to the bots to answer at each tick (in seconds).
+        bots (Dict[int, SandboxedBot]): The bots, by player id.
+        recorder (delta.DeltaRecorder): Gather the changes of the maze to send.
+        tick (int): Number of ticks sent.
+    """
+    def __init__(self, maze_: maze.Maze, delta_time: float = 1 / 48, timeout: float = 0.01):
+        self.maze = maze_
+        self.delta_time = delta_time
+        self.timeout = timeout
+        self.bots: Dict[int, SandboxedBot] = {}
+        self.recorder = delta.DeltaRecorder(self.maze)
+        self.tick = 0
+        self._time: Optional[float] = None
+
+    def add(self, player_: player.Player, command: Sequence[str], memory_limit: Optional[int] = None) -> SandboxedBot:
+        """Start a worker controlling the player, and send it the state of the maze.
+
+        Args:
+            player_ (player.Player): The player controlled. It should already be in the maze.
+            command (Sequence[str]): The command starting the worker. (See `worker_command`)
+            memory_limit (int): Optional limit of the address space of the worker (in bytes).
+        """
+        self.remove(player_)  # The bot of a former player in the same slot.
+        bot_ = SandboxedBot(player_, command, memory_limit)
+        self.bots[player_.id] = bot_
+        bot_.send(self.welcome(player_))
+        return bot_
+
+    def welcome(self, player_: player.Player) -> bytes:
+        header = protocol.WELCOME_HEADER.pack(
+            player_.id, self.maze.height, self.maze.width, self.delta_time, self.tick, self.maze.time
+        )
+        return protocol.encode(protocol.WELCOME, header + delta.keyframe(self.maze))
+
+    def remove(self, player_: player.Player):
+        bot_ = self.bots.pop(player_.id, None)
+        if bot_ is not None:
+            bot_.close()
+
+    def wait_ready(self, timeout: float = 5.0):
+        """Wait for the bots to answer their WELCOME (They may take time to start)."""
+        self._exchange(self.tick, time.perf_counter() + timeout)
+
+    def action(self, player_: player.Player) -> base.Action:
+        """Action of the bot of the player for the current tick.
+
+        The first call of a tick sends the state to all the bots and waits for their answers.
+        """
+        if self._time != self.maze.time:
+            self._time = self.maze.time
+            self.step()
+        bot_ = self.bots.get(player_.id)
+        return bot_.action if bot_ is not None else base.Action()
+
+    def policy(self, game, player_: player.Player) -> base.Action:  # pylint: disable = unused-argument
+        """Policy of the sandboxed players of a `headless.HeadlessGame`."""
+        return self.action(player_)
+
+    def step(self):
+        """Send the changes of the maze to all the bots, and wait for their actions until the deadline."""
+        deadline = time.perf_counter() + self.timeout
+        self.tick += 1
+        restored = self.recorder.restored
+        operations = self.recorder.take()
+        message = protocol.encode(protocol.STATE, protocol.STATE_HEADER.pack(self.tick, self.maze.time) + operations)
+        for bot_ in self.bots.values():
+            bot_.send(self.welcome(bot_.player) if restored else message)
+        self._exchange(self.tick, deadline)
+
+    def _exchange(self, tick: int, deadline: float):
+        """Write the pending messages and read the answers of all the bots, until they have all answered."""
+        waiting: List[SandboxedBot] = []
+        selector = selectors.DefaultSelector()
+        for bot_ in self.bots.values():
+            bot_.action = base.Action()
+            bot_.answered = False
+            if bot_.alive:
+                waiting.append(bot_)
+                selector.register(bot_.process.stdout, selectors.EVENT_READ, bot_)
+                if bot_.pending:
+                    selector.register(bot_.process.stdin, selectors.EVENT_WRITE, bot_)
+
+        while waiting:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                bot_: SandboxedBot = key.data
+                if bot_ not in waiting:
+                    continue
+                if key.fileobj is bot_.process.stdin:
+                    bot_.flush()
+                    if not bot_.pending and bot_.alive:
+                        selector.unregister(bot_.process.stdin)
+                else:
+                    bot_.receive(tick)
+                if bot_.answered or not bot_.alive:
+                    waiting.remove(bot_)
+                    selector.unregister(bot_.process.stdout)
+                    if bot_.pending:
+                        selector.unregister(bot_.process.stdin)
+        selector.close()
+
+    def close(self):
+        for bot_ in self.bots.values():
+            bot_.close()
+        self.bots = {}
+
+
+class SandboxedPlayerController(base.BasePlayerController):
+    """Controller of a player driven by a sandboxed bot. It has the interface of `controller.PlayerController`."""
+    def __init__(self, player_: player.Player, pool: BotPool):
+        super().__init__(player_)
+        self.pool = pool
+
+    def handle_event(self, event) -> bool:  # pylint: disable = unused-argument
+        return False
+
+    def start_tick(self):
+        self.apply(self.pool.action(self.player))
+
+
+def new_sandboxed_player(maze_controller: base.BaseMazeController, pool: BotPool,
+                         command: Sequence[str]) -> SandboxedPlayerController:
+    """Add a new player in the maze, controlled by a sandboxed bot.
+
+    Raises:
+        maze.MazeFullError: If the max amount of players has been reached.
+    """
+    player_controller = SandboxedPlayerController(maze_controller.maze.new_player(), pool)
+    maze_controller.players.append(player_controller)
+    pool.add(player_controller.player, command)
+    return player_controller
+
+
+def worker_command(factory: str) -> List[str]:
+    """Command running a python bot in a worker. (factory: 'module:attribute', see `Factory`)"""
+    return [sys.executable, '-c', f'import {__name__}; {__name__}.main()', factory]
+
+
+def chaser(maze_: maze.Maze, player_: player.Player) -> Callable[[], base.Action]:
+    """Factory of a bot chasing the nearest player and avoiding the explosions. (See `bot.BotController`)"""
+    return bot.BotController(player_, pathfinding.PathFinder(maze_), danger_map=danger.DangerMap(maze_)).action
+
+
+class BotWorker:
+    """Worker side of a sandboxed bot: the mirror of the maze, and the policy of its player.
+
+    Attrs:
+        factory (Factory): Creates the policy of the player.
+        maze (Optional[maze.Maze]): The mirror of the maze. (None until welcomed)
+        player_id (int): Id of the player of the bot.
+        policy (Optional[Callable[[], base.Action]]): Policy of the player. (Created at the first answer)
+        tick (Optional[int]): Tick of the last state received, if not answered yet.
+    """
+    def __init__(self, factory: Factory):
+        self.factory = factory
+        self.maze: Optional[maze.Maze] = None
+        self.player_id = 0
+        self.policy: Optional[Callable[[], base.Action]] = None
+        self.tick: Optional[int] = None
+
+    def receive(self, kind: int, payload: bytes):
+        """Update the mirror with a message of the game."""
+        if kind == protocol.WELCOME:
+            self.player_id, height, width, _, self.tick, time_ = protocol.WELCOME_HEADER.unpack_from(payload)
+            keyframe = memoryview(payload)[protocol.WELCOME_HEADER.size:]
+            self.maze = delta.from_keyframe(width, height, keyframe, time_)
+            self.policy = None
+        elif kind == protocol.STATE and self.maze is not None:
+            self.tick, time_ = protocol.STATE_HEADER.unpack_from(payload)
+            self.maze.scheduler.time = time_  # The mirror does not spend time: it follows the game.
+            delta.apply(self.maze, payload, protocol.STATE_HEADER.size)
+
+    def answer(self) -> bytes:
+        """Message of the action of the player for the last state. (Idle if the player has been eliminated)"""
+        player_ = next((player_ for player_ in self.maze.players if player_.id == self.player_id), None)
+        action = base.Action()
+        if player_ is not None:
+            if self.policy is None:
+                self.policy = self.factory(self.maze, player_)
+            action = self.policy()
+        message = protocol.ACTION_MESSAGE.pack(self.tick, replay.DIRECTION_CODES[action.direction], action.bombs)
+        self.tick = None
+        return protocol.encode(protocol.ACTION, message)
+
+
+def run(factory: Factory, input_fd: int = 0, output_fd: int = 1):
+    """Worker side: mirror the maze from the messages received and answer each tick with the policy.
+
+    When several states are pending, only the last one is answered, so that a slow bot catches up.
+    """
+    worker = BotWorker(factory)
+    buffer = bytearray()
+    selector = selectors.DefaultSelector()
+    selector.register(input_fd, selectors.EVENT_READ)
+    while True:
+        data = os.read(input_fd, 1 << 16)
+        if not data:
+            return
+        buffer += data
+        for kind, payload in protocol.split(buffer):
+            worker.receive(kind, payload)
+
+        if worker.tick is None or buffer or selector.select(0):
+            continue  # Catch up with the pending states first.
+        os.write(output_fd, worker.answer())
+
+
+def main():
+    """Run a python bot in a worker: `bomberman-bot module:factory`."""
+    module_name, _, attribute = sys.argv[1].partition(':')
+    factory = getattr(importlib.import_module(module_name), attribute)
+
+    # The messages use the original stdout: anything printed by the bot goes to stderr.
+    output_fd = os.dup(1)
+    os.dup2(2, 1)
+    run(factory, 0, output_fd)
@@ -7,7 +7,8 @@ the window.
 from . import obstacle_view
 from . import maze_view
 from . import player_view
+from . import profiler_view
 from . import view
 
 
-__all__ = ['obstacle_view', 'maze_view', 'player_view', 'view']
+__all__ = ['obstacle_view', 'maze_view', 'player_view', 'profiler_view', 'view']
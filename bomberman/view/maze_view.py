@@ -1,84 +1,364 @@
 """Handle the Maze to display it on the screen."""
 
+import collections
+from typing import Dict, List, Optional, Tuple
+
 import pygame
 
-from ..designpattern import event
-from ..designpattern import observer
+from ..model import chunks
 from ..model import events
 from ..model import obstacle
 from ..model import maze
+from ..model import player
 from . import obstacle_view
 from . import player_view
 from . import view
 
+from ..model import BOX_SIZE
+
+
+class MazeView(view.View):
+    """Display the whole maze at each frame.
+
+    The walls are drawn from the cells of the maze with the image of their type code.
+    (See `wall_locations`) They have no view: the wall objects are transient values. (See `Maze.obstacle_in`)
+    Bombs and players have their own view.
 
-class MazeView(view.View, observer.Observer):
+    Attrs:
+        maze (maze.Maze): The maze displayed.
+        wall_images (Dict[int, pygame.Surface]): Image of each wall type code.
+        bomb_views (Dict[obstacle.Bomb, obstacle_view.BombView]): View of each bomb.
+        player_views (Dict[player.Player, player_view.PlayerView]): View of each player.
+    """
     background_location = 'background.png'
+    wall_locations = {
+        obstacle.StoneWall.code: 'stone_wall.png',
+        obstacle.WoodWall.code: 'wood_wall.png',
+    }
 
     def __init__(self, maze_: maze.Maze):
         super().__init__()
         self.maze = maze_
-        self.maze.add_observer(self)
+        self.maze.subscribe(events.NewObstacleEvent, self.on_new_obstacle)
+        self.maze.subscribe(events.DeleteObstacleEvent, self.on_delete_obstacle)
+        self.maze.subscribe(events.NewPlayerEvent, self.on_new_player)
+        self.maze.subscribe(events.DeletePlayerEvent, self.on_delete_player)
+        self.maze.subscribe(events.MazeRestoredEvent, self.on_maze_restored)
 
-        self.bomb_views = []
-        self.obstacle_views = []
-        self.player_views = []
+        self.wall_images = {
+            code: view.View.load_image(location, obstacle.Obstacle.size)
+            for code, location in self.wall_locations.items()
+        }
+        self.bomb_views: Dict[obstacle.Bomb, obstacle_view.BombView] = {}
+        self.player_views: Dict[player.Player, player_view.PlayerView] = {}
 
-        for obstacle_ in self.maze.obstacles:
-            self.create_obstacle_view(obstacle_)
         for bomb in self.maze.bombs:
             self.create_obstacle_view(bomb)
         for player_ in self.maze.players:
-            self.player_views.append(player_view.PlayerView(player_))
+            self.create_player_view(player_)
 
-        box_size = obstacle.Obstacle.size
-        background_box = view.View.load_image(self.background_location, box_size)
-        self.image = pygame.surface.Surface(self.maze.size)  # pylint: disable = c-extension-no-member
+        self.background_box = view.View.load_image(self.background_location, obstacle.Obstacle.size)
+        self.image = self.create_background()
 
+    def create_background(self) -> Optional[pygame.SurfaceType]:  # pylint: disable = no-member
+        """Prerender the background of the whole maze."""
+        image = pygame.surface.Surface(self.maze.size)  # pylint: disable = c-extension-no-member
         for i in range(self.maze.height):
             for j in range(self.maze.width):
-                self.image.blit(background_box, (j * box_size[0], i * box_size[1]))
+                image.blit(self.background_box, (j * BOX_SIZE, i * BOX_SIZE))
+        return image
 
-    def display(self):
+    def display(self) -> List[pygame.Rect]:
+        """Display the maze on the window.
+
+        Returns:
+            List[pygame.Rect]: The areas of the window that have changed.
+                (To be given to `pygame.display.update`)
+        """
         super().display()
 
-        for obstacle_ in self.obstacle_views:
-            obstacle_.display()
-        for bomb_ in self.bomb_views:
+        self.display_walls(self.window)
+        for bomb_ in self.bomb_views.values():
             bomb_.display()
-        for player in self.player_views:
-            player.display()
-
-    def notify(self, event_: event.Event):
-        if isinstance(event_, events.NewObstacleEvent):
-            self.create_obstacle_view(event_.obstacle)
-
-        elif isinstance(event_, events.NewPlayerEvent):
-            self.player_views.append(player_view.PlayerView(event_.player))
-
-        elif isinstance(event_, events.DeleteObstacleEvent):
-            obstacle_ = event_.obstacle
-            if isinstance(obstacle_, obstacle.Bomb):
-                for bomb_view_ in self.bomb_views:
-                    if bomb_view_.obstacle == obstacle_:
-                        self.bomb_views.remove(bomb_view_)
-                        break
+        for player_ in self.player_views.values():
+            player_.display()
+
+        return [self.window.get_rect()]
+
+    def display_walls(self, surface: pygame.SurfaceType):  # pylint: disable = no-member
+        """Draw the walls of the maze on the surface."""
+        width = self.maze.width
+        for index, code in enumerate(self.maze.cells):
+            image = self.wall_images.get(code) if code else None
+            if image:
+                i, j = divmod(index, width)
+                surface.blit(image, (j * BOX_SIZE, i * BOX_SIZE))
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        self.create_obstacle_view(event_.obstacle)
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        if isinstance(event_.obstacle, obstacle.Bomb):
+            self.bomb_views.pop(event_.obstacle, None)
+
+    def on_new_player(self, event_: events.NewPlayerEvent):
+        self.create_player_view(event_.player)
+
+    def on_delete_player(self, event_: events.DeletePlayerEvent):
+        self.delete_player_view(event_.player)
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):  # pylint: disable = unused-argument
+        """Resynchronise the views of the bombs and players with the restored state."""
+        for bomb in [bomb for bomb in self.bomb_views if bomb not in self.maze.bombs]:
+            bomb.unsubscribe(events.ObstacleBombedEvent, self.bomb_views.pop(bomb).on_bombed)
+        for bomb in self.maze.bombs:
+            if bomb not in self.bomb_views:
+                self.create_obstacle_view(bomb)
+
+        players = set(self.maze.players)
+        for player_ in [player_ for player_ in self.player_views if player_ not in players]:
+            self.delete_player_view(player_)
+        for player_ in self.maze.players:
+            if player_ in self.player_views:
+                self.player_views[player_].update_pos()
             else:
-                for obstacle_view_ in self.obstacle_views:
-                    if obstacle_view_.obstacle == obstacle_:
-                        self.obstacle_views.remove(obstacle_view_)
-                        break
+                self.create_player_view(player_)
 
-        elif isinstance(event_, events.DeletePlayerEvent):
-            for player_view_ in self.player_views:
-                if player_view_.player == event_.player:
-                    self.player_views.remove(player_view_)
-                    break
+    def mark_dirty(self, pos, size):
+        """Redraw an area of the window at the next display. (No-op: the whole window is redrawn)"""
 
     def create_obstacle_view(self, obstacle_: obstacle.Obstacle):
-        if isinstance(obstacle_, obstacle.WoodWall):
-            self.obstacle_views.append(obstacle_view.WoodWallView(obstacle_))
-        elif isinstance(obstacle_, obstacle.StoneWall):
-            self.obstacle_views.append(obstacle_view.StoneWallView(obstacle_))
-        elif isinstance(obstacle_, obstacle.Bomb):
-            self.bomb_views.append(obstacle_view.BombView(obstacle_))
+        if isinstance(obstacle_, obstacle.Bomb):
+            self.bomb_views[obstacle_] = obstacle_view.BombView(obstacle_)
+
+    def create_player_view(self, player_: player.Player):
+        self.player_views[player_] = player_view.PlayerView(player_)
+
+    def delete_player_view(self, player_: player.Player):
+        view_ = self.player_views.pop(player_, None)
+        if view_ is not None:
+            player_.unsubscribe(events.PlayerMovedEvent, view_.on_player_moved)
+
+
+class DirtyMazeView(MazeView):
+    """Only redraw the areas of the window that have changed.
+
+    The background and the walls are cached in a static layer. The areas touched by
+    the model events (players moves, new and deleted obstacles) are restored from it
+    and the bombs and players over them are drawn again, clipped to each area: the parts of
+    the window outside of the areas are left untouched, so that the layers stay in order.
+
+    Attrs:
+        static_image (pygame.Surface): The background with the walls.
+        dirty_rects (List[pygame.Rect]): Areas to redraw at the next display.
+            None if the whole window should be redrawn.
+    """
+    def __init__(self, maze_: maze.Maze):
+        super().__init__(maze_)
+
+        self.static_image = self.image.copy()
+        self.display_walls(self.static_image)
+
+        self.dirty_rects = None
+
+    def display(self) -> List[pygame.Rect]:
+        if self.dirty_rects is None:
+            self.window.blit(self.static_image, (0, 0))
+            for bomb_ in self.bomb_views.values():
+                bomb_.display()
+            for player_ in self.player_views.values():
+                player_.display()
+            self.dirty_rects = []
+            return [self.window.get_rect()]
+
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        for rect in rects:
+            self.window.set_clip(rect)
+            self.window.blit(self.static_image, rect, rect)
+            for bomb_ in self.bombs_over([rect]):
+                self.bomb_views[bomb_].display()
+            for player_view_ in self.player_views.values():
+                if player_view_.rect().colliderect(rect):
+                    player_view_.display()
+        self.window.set_clip(None)
+
+        return rects
+
+    def bombs_over(self, rects: List[pygame.Rect]) -> List[obstacle.Bomb]:
+        """Bombs of the maze that intersect the given areas."""
+        bombs = []
+        for rect in rects:
+            for i in range(max(0, rect.top // BOX_SIZE), min(self.maze.height, (rect.bottom - 1) // BOX_SIZE + 1)):
+                for j in range(max(0, rect.left // BOX_SIZE), min(self.maze.width, (rect.right - 1) // BOX_SIZE + 1)):
+                    bomb = self.maze.bomb_in(i, j)
+                    if bomb is not None and bomb in self.bomb_views and bomb not in bombs:
+                        bombs.append(bomb)
+        return bombs
+
+    def mark_dirty(self, pos, size):
+        if self.dirty_rects is not None:
+            self.dirty_rects.append(pygame.Rect(pos, size))
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        super().on_new_obstacle(event_)
+        obstacle_ = event_.obstacle
+        if obstacle_.code in self.wall_images:
+            self.static_image.blit(self.wall_images[obstacle_.code], obstacle_.pos)
+        self.mark_dirty(obstacle_.pos, obstacle_.size)
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        super().on_delete_obstacle(event_)
+        obstacle_ = event_.obstacle
+        if not isinstance(obstacle_, obstacle.Bomb):
+            self.static_image.blit(self.image, obstacle_.pos, pygame.Rect(obstacle_.pos, obstacle_.size))
+        self.mark_dirty(obstacle_.pos, obstacle_.size)
+
+    def on_new_player(self, event_: events.NewPlayerEvent):
+        super().on_new_player(event_)
+        self.mark_dirty(event_.player.pos, event_.player.size)
+
+    def on_delete_player(self, event_: events.DeletePlayerEvent):
+        super().on_delete_player(event_)
+        self.mark_dirty(event_.player.pos, event_.player.size)
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):
+        super().on_maze_restored(event_)
+        self.static_image = self.image.copy()
+        self.display_walls(self.static_image)
+        self.dirty_rects = None
+
+    def on_player_moved(self, event_: events.PlayerMovedEvent):
+        self.mark_dirty(event_.former_pos, event_.player.size)
+        self.mark_dirty(event_.new_pos, event_.player.size)
+
+    def create_player_view(self, player_: player.Player):
+        super().create_player_view(player_)
+        player_.subscribe(events.PlayerMovedEvent, self.on_player_moved)
+
+    def delete_player_view(self, player_: player.Player):
+        super().delete_player_view(player_)
+        player_.unsubscribe(events.PlayerMovedEvent, self.on_player_moved)
+
+
+class CameraMazeView(MazeView):
+    """Display the part of the maze seen by a camera, for mazes larger than the window.
+
+    The camera follows the target player, or all the players. Only the bombs and players inside it are drawn, and
+    the background (with the walls) is rendered lazily by tiles of `TILE_BOXES` boxes: only
+    the tiles around the camera are kept, so that the cost does not depend on the size of the maze.
+    The chunks of a lazily loaded maze displayed by the camera are retained. (See `chunks.ChunkedCells.camera`)
+
+    Attrs:
+        camera (pygame.Rect): Area of the maze displayed on the window (in pixels).
+        target (Optional[player.Player]): The player followed. None to follow all the players.
+        tiles (OrderedDict[Tuple[int, int], pygame.Surface]): The rendered tiles, by tile indexes,
+            the least recently displayed first.
+        max_tiles (int): Number of tiles kept.
+    """
+    TILE_BOXES = 8
+
+    def __init__(self, maze_: maze.Maze, target: Optional[player.Player] = None):
+        super().__init__(maze_)
+        self.camera = self.window.get_rect()
+        self.target = target
+        self.tile_size = self.TILE_BOXES * BOX_SIZE
+        self.tiles: Dict[Tuple[int, int], pygame.SurfaceType] = collections.OrderedDict()  # pylint: disable = no-member
+        columns = self.camera.width // self.tile_size + 2
+        rows = self.camera.height // self.tile_size + 2
+        self.max_tiles = 2 * columns * rows
+
+    def create_background(self):
+        return None  # Rendered by tiles.
+
+    def follow(self):
+        """Center the camera on the followed players, inside the maze."""
+        players = [self.target] if self.target in self.maze.players else self.maze.players
+        if players:
+            xs = [player_.pos[0] + player_.size[0] / 2 for player_ in players]
+            ys = [player_.pos[1] + player_.size[1] / 2 for player_ in players]
+            self.camera.center = ((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2)
+        self.camera.left = self._clamp(self.camera.left, self.camera.width, self.maze.size[0])
+        self.camera.top = self._clamp(self.camera.top, self.camera.height, self.maze.size[1])
+
+        if isinstance(self.maze.cells, chunks.ChunkedCells):  # Keep the chunks displayed loaded.
+            self.maze.cells.camera = (
+                max(0, self.camera.top // BOX_SIZE), max(0, self.camera.left // BOX_SIZE),
+                min(self.maze.height - 1, (self.camera.bottom - 1) // BOX_SIZE),
+                min(self.maze.width - 1, (self.camera.right - 1) // BOX_SIZE),
+            )
+
+    @staticmethod
+    def _clamp(start: int, length: int, total: int) -> int:
+        """Keep [start, start + length[ inside [0, total[, or center it if it is larger."""
+        if length >= total:
+            return (total - length) // 2
+        return max(0, min(start, total - length))
+
+    def tile(self, ti: int, tj: int) -> pygame.SurfaceType:  # pylint: disable = no-member
+        """Render (or get) the tile (ti, tj): the background and the walls of its boxes."""
+        tile = self.tiles.get((ti, tj))
+        if tile is not None:
+            self.tiles.move_to_end((ti, tj))
+            return tile
+
+        tile = pygame.surface.Surface((self.tile_size, self.tile_size))  # pylint: disable = c-extension-no-member
+        for i in range(ti * self.TILE_BOXES, min(self.maze.height, (ti + 1) * self.TILE_BOXES)):
+            for j in range(tj * self.TILE_BOXES, min(self.maze.width, (tj + 1) * self.TILE_BOXES)):
+                self.draw_box(tile, i, j)
+
+        self.tiles[ti, tj] = tile
+        if len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def draw_box(self, tile: pygame.SurfaceType, i: int, j: int):  # pylint: disable = no-member
+        """Draw the background and the wall of the box (i, j) on its tile."""
+        pos = ((j % self.TILE_BOXES) * BOX_SIZE, (i % self.TILE_BOXES) * BOX_SIZE)
+        tile.blit(self.background_box, pos)
+        image = self.wall_images.get(self.maze.cells[self.maze.index(i, j)])
+        if image:
+            tile.blit(image, pos)
+
+    def display(self) -> List[pygame.Rect]:
+        self.follow()
+        left, top = self.camera.topleft
+        self.window.fill((0, 0, 0))
+
+        first_ti, first_tj = max(0, top // self.tile_size), max(0, left // self.tile_size)
+        last_ti = min((self.maze.height - 1) // self.TILE_BOXES, (self.camera.bottom - 1) // self.tile_size)
+        last_tj = min((self.maze.width - 1) // self.TILE_BOXES, (self.camera.right - 1) // self.tile_size)
+        for ti in range(first_ti, last_ti + 1):
+            for tj in range(first_tj, last_tj + 1):
+                self.window.blit(self.tile(ti, tj), (tj * self.tile_size - left, ti * self.tile_size - top))
+
+        for i in range(max(0, top // BOX_SIZE), min(self.maze.height, (self.camera.bottom - 1) // BOX_SIZE + 1)):
+            for j in range(max(0, left // BOX_SIZE), min(self.maze.width, (self.camera.right - 1) // BOX_SIZE + 1)):
+                bomb_view = self.bomb_views.get(self.maze.bomb_in(i, j))
+                if bomb_view is not None:
+                    self.window.blit(bomb_view.image, (bomb_view.pos[0] - left, bomb_view.pos[1] - top))
+
+        for player_view_ in self.player_views.values():
+            if player_view_.rect().colliderect(self.camera):
+                self.window.blit(player_view_.image, (player_view_.pos[0] - left, player_view_.pos[1] - top))
+
+        return [self.window.get_rect()]
+
+    def update_box(self, i: int, j: int):
+        tile = self.tiles.get((i // self.TILE_BOXES, j // self.TILE_BOXES))
+        if tile is not None:
+            self.draw_box(tile, i, j)
+
+    def on_new_obstacle(self, event_: events.NewObstacleEvent):
+        super().on_new_obstacle(event_)
+        if not isinstance(event_.obstacle, obstacle.Bomb):
+            self.update_box(event_.obstacle.i, event_.obstacle.j)
+
+    def on_delete_obstacle(self, event_: events.DeleteObstacleEvent):
+        super().on_delete_obstacle(event_)
+        if not isinstance(event_.obstacle, obstacle.Bomb):
+            self.update_box(event_.obstacle.i, event_.obstacle.j)
+
+    def on_maze_restored(self, event_: events.MazeRestoredEvent):
+        super().on_maze_restored(event_)
+        self.tiles.clear()
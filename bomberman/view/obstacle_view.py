@@ -1,19 +1,20 @@
-"""Display obstacles."""
+"""Display obstacles.
+
+Only the bombs have a view: the walls are drawn from the cells of the maze. (See `maze_view.MazeView`)
+"""
 
-from ..designpattern import event
-from ..designpattern import observer
 from ..model import events
 from ..model import obstacle
 from . import view
 
 
-class ObstacleView(view.View, observer.Observer):
+class ObstacleView(view.View):
     default_location = None
 
     def __init__(self, obstacle_: obstacle.Obstacle):
         super().__init__()
         self.obstacle = obstacle_
-        self.obstacle.add_observer(self)
+        self.obstacle.subscribe(events.ObstacleBombedEvent, self.on_bombed)
 
         self.load_images()
         self.image = self.images['default']
@@ -23,21 +24,12 @@ class ObstacleView(view.View, observer.Observer):
     def load_images(self):
         self.images['default'] = view.View.load_image(self.default_location, self.obstacle.size)
 
-    def notify(self, event_: event.Event):
-        if isinstance(event_, events.ObstacleBombedEvent):
-            self.bombed_animation()
+    def on_bombed(self, event_: events.ObstacleBombedEvent):  # pylint: disable = unused-argument
+        self.bombed_animation()
 
     def bombed_animation(self):  # Could do some sprite animation to destroy a tile/bomb.
         pass
 
 
-class WoodWallView(ObstacleView):
-    default_location = 'wood_wall.png'
-
-
-class StoneWallView(ObstacleView):
-    default_location = 'stone_wall.png'
-
-
 class BombView(ObstacleView):
     default_location = 'bomb.png'
@@ -1,19 +1,17 @@
 """Handle the player's display"""
 
-from ..designpattern import event
-from ..designpattern import observer
 from ..model import events
 from ..model import player
 from . import view
 
 
-class PlayerView(view.View, observer.Observer):
+class PlayerView(view.View):
     default_player_location = 'boom.png'
 
     def __init__(self, player_: player.Player):
         super().__init__()
         self.player = player_
-        self.player.add_observer(self)
+        self.player.subscribe(events.PlayerMovedEvent, self.on_player_moved)
 
         self.load_images()
         self.image = self.images['default']
@@ -26,6 +24,5 @@ class PlayerView(view.View, observer.Observer):
     def update_pos(self):
         self.pos = self.player.pos
 
-    def notify(self, event_: event.Event):
-        if isinstance(event_, events.PlayerMovedEvent):
-            self.update_pos()  # We have access to the player so no need to use the event.
+    def on_player_moved(self, event_: events.PlayerMovedEvent):  # pylint: disable = unused-argument
+        self.update_pos()  # We have access to the player so no need to use the event.
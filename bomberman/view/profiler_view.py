@@ -0,0 +1,73 @@
+"""Overlay displaying the measures of a frame profiler."""
+
+from typing import List
+
+import pygame
+
+from .. import profiler
+from . import view
+
+
+class ProfilerView(view.View):
+    """Text overlay in the top left corner of the window: percentiles of the phases and events per frame.
+
+    The text is only rendered again every `refresh` frames, but it is blitted at each frame
+    as the maze views may draw over it. The percentiles of the phases are in milliseconds.
+
+    Attrs:
+        profiler (profiler.FrameProfiler): The profiler displayed.
+        refresh (int): Number of frames between two renderings of the text.
+        font (pygame.font.Font): The font of the text.
+    """
+    FONT_SIZE = 18
+    COLOR = (255, 255, 255)
+    BACKGROUND = (0, 0, 0, 180)
+
+    def __init__(self, profiler_: profiler.FrameProfiler, refresh: int = 12):
+        super().__init__()
+        self.profiler = profiler_
+        self.refresh = refresh
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.font = pygame.font.Font(None, self.FONT_SIZE)
+        self._rendered = -1
+
+    def lines(self) -> List[str]:
+        report = self.profiler.report()
+        frame = report.pop('frame', None)
+        lines = []
+        if frame is not None:
+            lines.append(f"frame  p50 {frame['p50'] * 1000:5.1f}ms  max {frame['max'] * 1000:5.1f}ms")
+        for name, stats in report.items():
+            if name.startswith('events/'):
+                lines.append(f"{name[7:]}  p50 {stats['p50']:.0f}  max {stats['max']:.0f}")
+            else:
+                lines.append(f"{name}  p50 {stats['p50'] * 1000:5.2f}ms  max {stats['max'] * 1000:5.2f}ms")
+        return lines
+
+    def render(self):
+        """Render the text of the last measures."""
+        lines = [self.font.render(line, True, self.COLOR) for line in self.lines()]
+        width = max((line.get_width() for line in lines), default=0) + 8
+        height = sum(line.get_height() for line in lines) + 8
+        self.image = pygame.Surface((width, height), pygame.SRCALPHA)  # pylint: disable = no-member
+        self.image.fill(self.BACKGROUND)
+        y = 4
+        for line in lines:
+            self.image.blit(line, (4, y))
+            y += line.get_height()
+
+    def display(self) -> List[pygame.Rect]:
+        """Display the overlay (over the maze).
+
+        The area covered at the previous frame should be redrawn by the maze view first.
+        (See `MazeView.mark_dirty`)
+
+        Returns:
+            List[pygame.Rect]: The area of the window covered by the overlay.
+        """
+        if self.profiler.frame // self.refresh != self._rendered:
+            self._rendered = self.profiler.frame // self.refresh
+            self.render()
+        super().display()
+        return [self.rect()]
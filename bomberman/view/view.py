@@ -1,5 +1,6 @@
 """Provides the basic class for simple views."""
 
+import functools
 import os
 from typing import Dict, Tuple
 
@@ -12,6 +13,9 @@ class View:
     It can be displayed on the main_window, but the image has to be set first.
     Be careful, you have to open a window first.
 
+    Images are loaded once for the whole process: `load_image` keeps the last
+    `IMAGE_CACHE_SIZE` surfaces loaded, shared by all the views. (They should not be modified)
+
     Attr:
         window (pygame.Surface): The pygame surface on which the image
             will be displayed.
@@ -19,6 +23,8 @@ class View:
         images (Dict[str, pygame.Surface]): All the other image that can be used for the view.
         x, y (int): Positions of the image on the window.
     """
+    IMAGE_CACHE_SIZE = 128
+
     def __init__(self):
         # pylint does not find the pygame.Surface class.
         self.window: pygame.SurfaceType = pygame.display.get_surface()  # pylint: disable = no-member
@@ -31,11 +37,18 @@ class View:
         if self.image:
             self.window.blit(self.image, self.pos)
 
+    def rect(self) -> pygame.Rect:
+        """Area of the window covered by the image."""
+        return pygame.Rect(self.pos, self.image.get_size())
+
     @staticmethod
+    @functools.lru_cache(maxsize=IMAGE_CACHE_SIZE)
     def load_image(file_name: str, size: Tuple[int, int]) -> pygame.SurfaceType:  # pylint: disable = no-member
         """Load an image from the img folder.
 
         Should only be called when the main window (mode) has been set.
+        The result is cached by (file_name, size): the same surface is returned for each call.
+        (Use `View.load_image.cache_clear()` to reload the images)
 
         Args:
             file_name (str): The name of the image with the extension.
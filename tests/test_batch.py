@@ -0,0 +1,61 @@
+"""The batch engine follows the same rules as the headless engine."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+# pylint: disable = wrong-import-position
+from bomberman.controller import base
+from bomberman.model import maze
+from bomberman.simulation import batch
+from bomberman.simulation import headless
+
+
+def scripted(directions, bombs, n):
+    """Policy of the players of the n-th game, from the actions of the batch."""
+    def policy(game, player_):
+        return base.Action(batch.BatchGame.DIRECTIONS[directions[game.tick, n, player_.id]],
+                           bool(bombs[game.tick, n, player_.id]))
+    return policy
+
+
+def headless_games(directions, bombs, delta_time):
+    """The headless games playing the actions of the batch, and their players."""
+    games, players = [], []
+    for n in range(directions.shape[1]):
+        game = headless.HeadlessGame(maze.Maze.from_id(1), delta_time)
+        players.append([game.add_player(scripted(directions, bombs, n)) for _ in range(directions.shape[2])])
+        games.append(game)
+    return games, players
+
+
+def assert_same_state(batch_game, n, game, players):
+    """The n-th game of the batch is in the state of the headless game."""
+    walls = np.frombuffer(bytes(game.maze.cells), dtype=np.int8).reshape(game.maze.height, game.maze.width)
+    assert (walls == batch_game.walls[n]).all()
+    for p, player_ in enumerate(players):
+        assert player_.alive == batch_game.alive[n, p]
+        assert player_.pos == tuple(batch_game.positions[n, p])
+        assert player_.bombs_capacity == batch_game.bombs_capacity[n, p]
+
+
+@pytest.mark.parametrize('delta_time', [1 / 48, 0.3])
+def test_batch_matches_headless(delta_time):
+    games_number, players_number, ticks = 8, 2, int(60 / delta_time)
+    rng = np.random.default_rng(0)
+    directions = np.repeat(rng.integers(0, 5, (ticks // 10 + 1, games_number, players_number)), 10, axis=0)[:ticks]
+    bombs = rng.random((ticks, games_number, players_number)) < 0.2 * delta_time
+
+    batch_game = batch.BatchGame.from_maze(maze.Maze.from_id(1), games_number, players_number, delta_time)
+    wood_walls = (batch_game.walls == batch.BatchGame.WOOD_WALL).sum()
+    games, players = headless_games(directions, bombs, delta_time)
+
+    for tick in range(ticks):
+        batch_game.step(directions[tick], bombs[tick])
+        for n, game in enumerate(games):
+            game.step()
+            assert_same_state(batch_game, n, game, players[n])
+
+    # Walls have been destroyed and players eliminated on the way.
+    assert (batch_game.walls == batch.BatchGame.WOOD_WALL).sum() < wood_walls
+    assert not batch_game.alive.all()
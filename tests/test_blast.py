@@ -0,0 +1,60 @@
+"""The explosions chain through the bombs, stop at the first obstacle and eliminate the players reached."""
+
+from bomberman.model import blast
+from bomberman.model import mazefile
+from bomberman.model import obstacle
+
+from bomberman.model import BOX_SIZE
+
+
+MAZE = (
+    'p  s      \n'
+    '      ww  \n'
+    '   p      '
+)
+
+
+def setup(tmp_path):
+    """Maze with 3 bombs of the first player in a chain: (1, 1) -> (1, 3) -> (1, 5) -> wood walls."""
+    (tmp_path / 'maze.txt').write_text(MAZE)
+    maze_ = mazefile.load_text(str(tmp_path / 'maze.txt'))
+    bomber, victim = maze_.new_player(), maze_.new_player()
+    bomber.bombs_capacity = 3
+    bombs = []
+    for j in (1, 3, 5):
+        bomber.set_pos((j * BOX_SIZE, BOX_SIZE))
+        bomber.bombs()
+        bombs.append(maze_.bomb_in(1, j))
+        maze_.time_spend(1)  # The first bomb expires first.
+    bomber.set_pos((9 * BOX_SIZE, 0))  # Out of reach.
+    return maze_, bomber, victim, bombs
+
+
+def test_chain_reaction(tmp_path):
+    maze_, bomber, victim, bombs = setup(tmp_path)
+
+    maze_.time_spend(bombs[0].time_to_leave - 0.5)
+    assert len(maze_.bombs) == 3
+    maze_.time_spend(1)  # Only the first bomb has expired: it detonates the others.
+
+    assert not maze_.bombs
+    assert len(maze_.scheduler) == 0
+    assert bomber.bombs_capacity == 3
+    assert maze_.cells[maze_.index(1, 6)] == 0  # Reached by the last bomb of the chain.
+    assert maze_.cells[maze_.index(1, 7)] == obstacle.WoodWall.code  # Behind it.
+    assert maze_.cells[maze_.index(0, 3)] == obstacle.StoneWall.code
+    assert maze_.players == [bomber]
+    assert not victim.alive
+
+
+def test_rays_stop_at_first_obstacle(tmp_path):
+    maze_, _, _, bombs = setup(tmp_path)
+
+    boxes = blast.explode(maze_, bombs[:1])
+
+    assert boxes == {
+        (1, 0), (1, 1), (0, 1), (2, 1), (1, 2),  # First bomb.
+        (1, 3), (0, 3), (2, 3), (1, 4),  # Second one: stopped by the stone wall and by the first bomb.
+        (1, 5), (0, 5), (2, 5), (1, 6),  # Third one: stopped by the wood wall.
+    }
+    assert not maze_.bombs
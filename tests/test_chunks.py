@@ -0,0 +1,40 @@
+"""The chunked cells keep their changes through evictions and rollbacks, with bounded memory."""
+
+import random
+
+import pytest
+
+from bomberman.model import chunks
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_changes_survive_evictions(tmp_path, seed):
+    rng = random.Random(seed)
+    width, height = 100, 70
+    text = '\n'.join(''.join(rng.choice(' ws') for _ in range(width)) for _ in range(height))
+    (tmp_path / 'maze.txt').write_text(text)
+    cells = chunks.ChunkedCells(str(tmp_path / 'maze.txt'), chunk_size=8)
+    expected = bytearray(text.replace('\n', '').encode().translate(chunks.TEXT_CODES))
+    snapshot, snapshot_cells = None, None
+
+    for step in range(400):
+        box = (rng.randrange(height), rng.randrange(width))
+        for _ in range(5):  # Explosions around a player.
+            i = min(height - 1, max(0, box[0] + rng.randint(-4, 4)))
+            j = min(width - 1, max(0, box[1] + rng.randint(-4, 4)))
+            code = rng.choice([0, 0, expected[i * width + j]])
+            cells[i * width + j] = code
+            expected[i * width + j] = code
+        cells.retain([box], radius=1)
+        assert len(cells.chunks) <= 9
+
+        if step == 200:
+            snapshot, snapshot_cells = cells.snapshot(), bytes(expected)
+        if step % 50 == 0:
+            assert bytes(cells) == expected
+            assert all(cells[index] == code for index, code in enumerate(expected) if index % 7 == 0)
+
+    assert cells.deltas
+    cells.restore(snapshot)
+    cells.retain([(0, 0)], radius=1)
+    assert bytes(cells) == snapshot_cells
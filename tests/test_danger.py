@@ -0,0 +1,40 @@
+"""The danger map follows the bombs dropped, chained and exploded."""
+
+import pytest
+
+from bomberman.controller import bot
+from bomberman.model import danger
+from bomberman.model import maze
+from bomberman.model import snapshots
+from bomberman.simulation import headless
+
+
+@pytest.mark.parametrize('defer_events', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_times_match_rebuild(seed, defer_events):
+    game = headless.HeadlessGame(maze.Maze.from_id('1'), defer_events=defer_events)
+    danger_map = game.controller.danger_map
+    snapshot = snapshots.take(game.maze)
+    ticks = 48 * 30
+    bombs = 0
+
+    for tick in range(ticks):
+        while len(game.maze.players) < len(game.maze.players_initial_positions):  # The eliminated players join again.
+            if tick % 2:
+                bot.new_bot(game.controller)
+            else:
+                game.add_player(headless.RandomPolicy(seed * ticks + tick, change_probability=0.1,
+                                                      bombs_probability=0.1))
+        game.step()
+        if tick == ticks // 2:  # Rollback: the bombs dropped since then are gone.
+            snapshots.restore(game.maze, snapshot)
+            if game.event_queue is not None:
+                game.event_queue.flush()
+
+        bombs += len(game.maze.bombs) > 1
+        fresh = danger.DangerMap(game.maze)
+        assert danger_map.times == fresh.times, tick
+        assert danger_map.detonations == fresh.detonations, tick
+        fresh.close()
+
+    assert bombs  # Some bombs may have been chained.
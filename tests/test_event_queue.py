@@ -0,0 +1,56 @@
+"""The deferred events are coalesced per observable and dispatched in order when the queue is flushed."""
+
+from bomberman.designpattern import event_queue
+from bomberman.model import events
+from bomberman.model import maze
+
+
+def setup():
+    maze_ = maze.Maze(10, 10)
+    maze_.players_initial_positions = [(0, 0), (5, 5)]
+    first, second = maze_.new_player(), maze_.new_player()
+    queue = event_queue.EventQueue()
+    maze_.defer_events(queue)
+    received = []
+    for player_ in (first, second):
+        player_.subscribe(events.PlayerMovedEvent, received.append)
+    maze_.subscribe(events.DeletePlayerEvent, received.append)
+    return maze_, queue, received
+
+
+def test_moves_coalesced():
+    maze_, queue, received = setup()
+    first, second = maze_.players
+    start = first.pos, second.pos
+
+    for step in range(1, 4):
+        first.set_pos((step, 0))
+        second.set_pos((100, step * 10))
+        if step == 2:
+            maze_.remove_player(second)
+    assert not received
+    assert len(queue) == 3
+
+    queue.flush()
+    assert [type(event_) for event_ in received] == [
+        events.PlayerMovedEvent, events.PlayerMovedEvent, events.DeletePlayerEvent
+    ]
+    assert (received[0].player, received[0].former_pos, received[0].new_pos) == (first, start[0], (3, 0))
+    assert (received[1].player, received[1].former_pos, received[1].new_pos) == (second, start[1], (100, 30))
+    assert not queue
+
+    first.set_pos((4, 0))  # A new batch: not merged with the events already dispatched.
+    queue.flush()
+    assert (received[3].former_pos, received[3].new_pos) == ((3, 0), (4, 0))
+
+
+def test_events_queued_during_flush():
+    maze_, queue, received = setup()
+    first = maze_.players[0]
+    first.subscribe(events.PlayerMovedEvent, lambda event_: event_.new_pos[0] < 2 and first.set_pos((2, 0)))
+
+    first.set_pos((1, 0))
+    queue.flush()
+
+    assert [event_.new_pos for event_ in received] == [(1, 0), (2, 0)]
+    assert not queue
@@ -0,0 +1,68 @@
+"""Seeking a match log gives the state of the match at any tick, whether the log has been closed or not."""
+
+import pytest
+
+from bomberman.model import maze
+from bomberman.simulation import headless
+from bomberman.simulation import match_log
+
+
+def state_of(maze_: maze.Maze):
+    return (
+        bytes(maze_.cells),
+        {player_.id: player_.pos for player_ in maze_.players},
+        {(bomb.i, bomb.j): bomb.player.id for bomb in maze_.bombs},
+    )
+
+
+def play(file_name: str, ticks: int, seed: int):
+    """Log a game of random players, joining again once eliminated. Returns the state at each tick."""
+    game = headless.HeadlessGame(maze.Maze.from_id('1'), defer_events=True)
+    writer = match_log.MatchLogWriter(file_name, game.maze, game.delta_time, keyframe_interval=24)
+    states = [state_of(game.maze)]
+    for tick in range(ticks):
+        while len(game.maze.players) < len(game.maze.players_initial_positions):
+            game.add_player(headless.RandomPolicy(seed * ticks + tick, bombs_probability=0.05))
+        game.step()
+        writer.frame(game.tick)
+        states.append(state_of(game.maze))
+    return writer, states
+
+
+def check(reader: match_log.MatchLogReader, states):
+    ticks = list(range(0, reader.last_tick + 1, 5))
+    ticks += [tick + delta for tick in range(24, reader.last_tick, 24) for delta in (-1, 0, 1)]  # Keyframes.
+    for tick in ticks:
+        state = reader.seek(tick)
+        assert state.tick == tick
+        assert (bytes(state.cells), state.players, state.bombs) == states[tick], tick
+
+
+@pytest.mark.parametrize('seed', range(2))
+def test_seek(tmp_path, seed):
+    file_name = str(tmp_path / 'match.log')
+    writer, states = play(file_name, 48 * 30, seed)
+    writer.close()
+
+    with match_log.MatchLogReader(file_name) as reader:
+        assert reader.index is None  # Read from the index written on close.
+        assert reader.keyframes >= 48 * 30 // 24
+        assert reader.last_tick == len(states) - 1 or states[reader.last_tick] == states[-1]
+        assert states[0][0] != states[-1][0]  # Some walls have been destroyed.
+        check(reader, states)
+
+
+def test_seek_unclosed(tmp_path):
+    file_name = str(tmp_path / 'match.log')
+    writer, states = play(file_name, 48 * 30, 0)
+    records_end = writer.offset
+    writer.close()
+    with open(file_name, 'rb') as file:
+        data = file.read()
+    with open(file_name, 'wb') as file:  # No index, and the last record partially written.
+        file.write(data[:records_end - 3])
+
+    with match_log.MatchLogReader(file_name) as reader:
+        assert reader.index is not None
+        assert 0 < reader.last_tick < len(states) - 1
+        check(reader, states)
@@ -0,0 +1,38 @@
+"""The binary maze files round-trip the walls and spawn points, and reject invalid files."""
+
+import pytest
+
+from bomberman.model import maze
+from bomberman.model import mazefile
+
+
+@pytest.mark.parametrize('maze_id', maze.Maze.ids())
+def test_binary_round_trip(tmp_path, maze_id):
+    maze_ = maze.Maze.from_id(maze_id)
+    file_name = str(tmp_path / 'maze.bin')
+    mazefile.save_binary(maze_, file_name)
+    loaded = mazefile.load_binary(file_name)
+
+    assert (loaded.width, loaded.height) == (maze_.width, maze_.height)
+    assert bytes(loaded.cells) == bytes(maze_.cells)
+    assert loaded.players_initial_positions == maze_.players_initial_positions
+
+    loaded.cells[0] = 2  # Copy on write: the file is not changed.
+    assert bytes(mazefile.load_binary(file_name).cells) == bytes(maze_.cells)
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: data[:10],  # Truncated header.
+    lambda data: data[:-1],  # Truncated cells.
+    lambda data: b'XXXX' + data[4:],  # Not a maze file.
+])
+def test_invalid_binary(tmp_path, corrupt):
+    file_name = str(tmp_path / 'maze.bin')
+    mazefile.save_binary(maze.Maze.from_id('1'), file_name)
+    with open(file_name, 'rb') as file:
+        data = file.read()
+    with open(file_name, 'wb') as file:
+        file.write(corrupt(data))
+
+    with pytest.raises(ValueError):
+        mazefile.load_binary(file_name)
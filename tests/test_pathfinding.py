@@ -0,0 +1,60 @@
+"""The cached distance fields follow the changes of the maze."""
+
+import pytest
+
+from bomberman.controller import bot
+from bomberman.model import maze
+from bomberman.model import pathfinding
+from bomberman.model import snapshots
+from bomberman.simulation import headless
+
+
+def play(game: headless.HeadlessGame, ticks: int):
+    """Step a game of bots bombing their way to each other. The eliminated bots join again."""
+    snapshot = snapshots.take(game.maze)
+    for tick in range(ticks):
+        while len(game.maze.players) < len(game.maze.players_initial_positions):
+            bot.new_bot(game.controller)
+        game.step()
+        if tick == ticks // 2:  # Rollback: the fields computed since then are outdated.
+            snapshots.restore(game.maze, snapshot)
+            if game.event_queue is not None:
+                game.event_queue.flush()
+        yield tick
+
+
+@pytest.mark.parametrize('defer_events', [False, True])
+def test_fields_match_rebuild(defer_events):
+    game = headless.HeadlessGame(maze.Maze.from_id('1'), defer_events=defer_events)
+    finder = game.controller.pathfinder
+    targets = [(i, j) for i in range(0, game.maze.height, 3) for j in range(0, game.maze.width, 3)]
+    cells = bytes(game.maze.cells)
+    destroyed = False
+
+    for tick in play(game, 48 * 40):
+        if tick % 24:
+            continue
+        destroyed = destroyed or bytes(game.maze.cells) != cells
+        fresh = pathfinding.PathFinder(game.maze)
+        for index in list(finder.fields):  # The fields used by the bots.
+            assert finder.fields[index] == fresh.field(*divmod(index, game.maze.width)), (tick, index)
+        for target in targets:
+            assert finder.field(*target) == fresh.field(*target), (tick, target)
+        fresh.close()
+
+    assert destroyed
+
+
+def test_cache_bounded_by_cells():
+    maze_ = maze.Maze.from_id('1')
+    cells = maze_.width * maze_.height
+    finder = pathfinding.PathFinder(maze_, max_cells=3 * cells)
+    for j in range(maze_.width):
+        finder.field(1, j)
+        assert len(finder.fields) <= 3
+    assert list(finder.fields) == [maze_.index(1, j) for j in range(maze_.width - 3, maze_.width)]
+
+    small = pathfinding.PathFinder(maze_, max_cells=1)  # The field in use is kept.
+    assert small.field(1, 1) is small.field(1, 1)
+    finder.close()
+    small.close()
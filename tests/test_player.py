@@ -0,0 +1,40 @@
+"""The moves of the players are swept: a large time step does not tunnel through a wall."""
+
+import pytest
+
+from bomberman.model import maze
+from bomberman.model import obstacle
+from bomberman.model import player
+
+from bomberman.model import BOX_SIZE
+
+
+@pytest.mark.parametrize('direction', list(player.Direction))
+@pytest.mark.parametrize('time', [1 / 48, 0.5, 10])
+def test_large_time_step_stops_at_wall(direction, time):
+    maze_ = maze.Maze(9, 9)
+    maze_.players_initial_positions = [(4, 4)]
+    player_ = maze_.new_player()
+    axis, sign = direction.value
+    wall = (4 + sign * 2 * (axis == 1), 4 + sign * 2 * (axis == 0))  # Two boxes away.
+    maze_.add_obstacle(obstacle.WoodWall(*wall))
+    start = player_.pos
+
+    player_.move(time, direction)
+
+    if sign == 1:
+        gap = wall[1 - axis] * BOX_SIZE - (start[axis] + player_.size[axis])
+    else:
+        gap = start[axis] - (wall[1 - axis] + 1) * BOX_SIZE
+    assert (player_.pos[axis] - start[axis]) * sign == pytest.approx(min(time * player_.speed, gap))
+    assert player_.pos[1 - axis] == start[1 - axis]
+
+
+def test_stops_at_maze_border():
+    maze_ = maze.Maze(3, 3)
+    maze_.players_initial_positions = [(1, 1)]
+    player_ = maze_.new_player()
+
+    player_.move(100, player.Direction.RIGHT)
+
+    assert player_.pos[0] + player_.size[0] == 3 * BOX_SIZE
@@ -0,0 +1,54 @@
+"""A recorded game is replayed bit for bit."""
+
+import random
+
+import pytest
+
+from bomberman.controller import base
+from bomberman.controller import bot
+from bomberman.model import maze
+from bomberman.model import player
+from bomberman.simulation import replay
+
+
+DELTA_TIME = 1 / 48
+
+
+def record(seed: int, ticks: int, bots: int = 0):
+    """Play a game with random inputs (and bots), players joining again once eliminated."""
+    rng = random.Random(seed)
+    maze_ = maze.Maze.from_id(1)
+    controller = base.BaseMazeController(maze_)
+    controller.recorder = replay.InputRecorder('1', DELTA_TIME)
+    for _ in range(bots):
+        bot.new_bot(controller)
+
+    for _ in range(ticks):
+        if len(maze_.players) < len(maze_.players_initial_positions) and rng.random() < 0.02:
+            controller.new_player()
+        for player_controller in controller.players:
+            if isinstance(player_controller, bot.BotController):
+                continue
+            if rng.random() < 0.05:
+                player_controller.start_moving(rng.choice(list(player.Direction)))
+            if rng.random() < 0.01:
+                player_controller.bombs()
+        controller.time_spend(DELTA_TIME)
+    return maze_, controller.recorder.log
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_replay_digest(seed):
+    maze_, log = record(seed, 48 * 60)
+    log = replay.InputLog.from_bytes(log.to_bytes())
+
+    game = replay.replay(log)
+    assert game.tick == log.ticks
+    assert replay.digest(game.maze) == replay.digest(maze_)
+    assert sum(entry.direction == replay.NEW_PLAYER for entry in log.entries) > len(maze_.players_initial_positions)
+
+
+def test_replay_bots():
+    maze_, log = record(0, 48 * 30, bots=2)
+    assert any(entry.bombs for entry in log.entries)
+    assert replay.digest(replay.replay(log).maze) == replay.digest(maze_)
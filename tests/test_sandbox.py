@@ -0,0 +1,40 @@
+"""The sandboxed bots are limited whatever their language."""
+
+import os
+import sys
+
+import pytest
+
+from bomberman.controller import base
+from bomberman.model import maze
+from bomberman.model import player
+from bomberman.simulation import sandbox
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="POSIX only")
+
+
+def test_memory_limit_set_before_exec():
+    maze_ = maze.Maze.from_id('1')
+    bot_ = sandbox.SandboxedBot(maze_.new_player(), ['sh', '-c', 'ulimit -v'], memory_limit=1 << 30)
+    bot_.process.wait()
+    assert os.read(bot_.process.stdout.fileno(), 64) == b'1048576\n'  # In KiB: the shell is not python.
+    bot_.close()
+
+
+def test_timeout_gives_idle_action():
+    maze_ = maze.Maze.from_id('1')
+    pool = sandbox.BotPool(maze_, timeout=0.05)
+    try:
+        chaser, stuck = maze_.new_player(), maze_.new_player()
+        pool.add(chaser, sandbox.worker_command(f'{sandbox.__name__}:chaser'))
+        pool.wait_ready()
+        pool.add(stuck, ['sh', '-c', 'exec 3>&1 cat > /dev/null'])  # Reads the states, never answers.
+        pool.bots[stuck.id].action = base.Action(player.Direction.UP, True)
+
+        for _ in range(3):
+            maze_.time_spend(pool.delta_time)
+            assert pool.action(stuck) == base.Action()
+            assert pool.bots[chaser.id].answered
+            assert pool.bots[stuck.id].alive and not pool.bots[stuck.id].answered
+    finally:
+        pool.close()
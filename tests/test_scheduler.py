@@ -0,0 +1,48 @@
+"""The scheduler expires its entities by deadline, once, and forgets the cancelled ones."""
+
+import random
+
+from bomberman.model import scheduler
+
+
+def test_expired_by_deadline():
+    rng = random.Random(0)
+    scheduler_ = scheduler.Scheduler()
+    deadlines = {entity: rng.uniform(0, 10) for entity in range(200)}
+    for entity, deadline in deadlines.items():
+        scheduler_.schedule(entity, deadline)
+    cancelled = set(rng.sample(sorted(deadlines), 50))
+    for entity in cancelled:
+        scheduler_.cancel(entity)
+    scheduler_.schedule(0, 20)  # Rescheduled: only its new deadline counts.
+    cancelled.discard(0)
+
+    expired = []
+    while scheduler_.time < 10:
+        for entity in scheduler_.advance(1 / 48):
+            assert deadlines[entity] < scheduler_.time
+            expired.append(entity)
+
+    assert expired == sorted(set(deadlines) - cancelled - {0}, key=deadlines.get)
+    assert len(scheduler_) == 1 and 0 in scheduler_
+    assert scheduler_.deadline(0) == 20
+    assert scheduler_.advance(10) == [0]
+    assert len(scheduler_) == 0
+
+
+def test_equal_deadlines_in_scheduling_order():
+    scheduler_ = scheduler.Scheduler()
+    for entity in 'bca':
+        scheduler_.schedule(entity, 1)
+    assert scheduler_.advance(2) == ['b', 'c', 'a']
+
+
+def test_restore():
+    scheduler_ = scheduler.Scheduler()
+    scheduler_.schedule('a', 5)
+    scheduler_.restore(3, ['b', 'c'], [4, 3.5])
+
+    assert scheduler_.time == 3
+    assert 'a' not in scheduler_
+    assert scheduler_.advance(0.75) == ['c']
+    assert scheduler_.advance(0.5) == ['b']
@@ -0,0 +1,138 @@
+"""Clients join, play, leave and join again a room of a server over loopback."""
+
+import asyncio
+
+import pytest
+
+from bomberman.model import maze
+from bomberman.model import player
+from bomberman.network import client
+from bomberman.network import protocol
+from bomberman.network import server
+
+
+def state(maze_):
+    return (
+        bytes(maze_.cells),
+        sorted((player_.id, player_.pos) for player_ in maze_.players),
+        sorted((bomb.i, bomb.j) for bomb in maze_.bombs),
+    )
+
+
+async def sync(server_, room, *clients):
+    """Wait until the clients mirror the maze of the room."""
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if all(state(client_.maze) == state(server_.rooms[room].maze) for client_ in clients):
+            return True
+    return False
+
+
+def test_join_leave_rejoin():
+    async def scenario():
+        server_ = server.Server(delta_time=1 / 240)
+        listener = await server_.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        first = await client.Client.connect('127.0.0.1', port, 'room', '1')
+        second = await client.Client.connect('127.0.0.1', port, 'room', '1')
+        tasks = [asyncio.ensure_future(first.run()), asyncio.ensure_future(second.run())]
+        assert (first.player_id, second.player_id) == (0, 1)
+        with pytest.raises(client.ServerError):  # Level 1 has two spawn points.
+            await client.Client.connect('127.0.0.1', port, 'room', '1')
+
+        first.send_input(player.Direction.DOWN)
+        second.send_input(player.Direction.UP, True)
+        await asyncio.sleep(0.1)
+        first.send_input(None)
+        second.send_input(None)
+        assert await sync(server_, 'room', first, second)
+        assert server_.rooms['room'].maze.bombs
+
+        second.close()
+        assert await sync(server_, 'room', first)
+        assert [player_.id for player_ in first.maze.players] == [0]
+
+        third = await client.Client.connect('127.0.0.1', port, 'room', '1')  # Takes the slot left.
+        tasks.append(asyncio.ensure_future(third.run()))
+        assert third.player_id == 1
+        assert await sync(server_, 'room', first, third)
+        assert sorted(player_.id for player_ in first.maze.players) == [0, 1]
+
+        first.close()
+        third.close()
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0.05)
+        assert not server_.rooms
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('maze_id', ['../../../../tmp/evil', '1.txt', '', 'unknown'])
+def test_unknown_maze(maze_id):
+    async def scenario():
+        server_ = server.Server()
+        listener = await server_.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        with pytest.raises(client.ServerError):
+            await client.Client.connect('127.0.0.1', port, 'room', maze_id)
+        assert not server_.rooms
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('join', [b'[]', b'1', b'"room"', b'null', b'{"room": 1, "maze": "1"}', b'{"room": "room"}'])
+def test_malformed_join(join):
+    async def scenario():
+        server_ = server.Server()
+        listener = await server_.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(protocol.encode(protocol.JOIN, join))
+        kind, _ = await protocol.read_message(reader)
+        assert kind == protocol.ERROR
+        writer.close()
+        assert not server_.rooms
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_join_after_bomb_owner_eliminated():
+    async def scenario():
+        server_ = server.Server(delta_time=1 / 240)
+        maze_ = maze.Maze.from_id('1')
+        maze_.players_initial_positions.append((0, maze_.width - 1))
+        server_.rooms['room'] = server.Room('room', maze_, server_.delta_time)
+        listener = await server_.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        clients = [await client.Client.connect('127.0.0.1', port, 'room', '1') for _ in range(3)]
+        tasks = [asyncio.ensure_future(client_.run()) for client_ in clients]
+        clients[2].send_input(None, True)
+        assert await sync(server_, 'room', *clients)
+        assert [bomb.player.id for bomb in maze_.bombs] == [2]
+        clients[0].close()
+        clients[2].close()  # Its bomb is still ticking.
+        assert await sync(server_, 'room', clients[1])
+
+        late = await client.Client.connect('127.0.0.1', port, 'room', '1')  # Takes the slot 0.
+        tasks.append(asyncio.ensure_future(late.run()))
+        assert await sync(server_, 'room', clients[1], late)
+        bomb, = late.maze.bombs
+        remote = next(iter(maze_.bombs))
+        assert (bomb.player.id, bomb.radius) == (2, remote.radius)
+        assert late.maze.scheduler.deadline(bomb) == maze_.scheduler.deadline(remote)  # Not from the join.
+
+        clients[1].close()
+        late.close()
+        await asyncio.gather(*tasks)
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
@@ -0,0 +1,32 @@
+"""The snapshots of a maze share a copy of its cells, and restore any former state."""
+
+import random
+
+from bomberman.model import maze
+from bomberman.model import obstacle
+from bomberman.model import snapshots
+
+
+def test_restore_any_snapshot():
+    rng = random.Random(0)
+    maze_ = maze.Maze(100, 100)
+    saved = []
+    for step in range(300):
+        for _ in range(rng.randint(0, 3)):
+            i, j = rng.randrange(maze_.height), rng.randrange(maze_.width)
+            wall = maze_.obstacle_in(i, j)
+            if wall is None:
+                maze_.add_obstacle(obstacle.WoodWall(i, j))
+            else:
+                maze_.remove_obstacle(wall)
+        if step % 7 == 0:
+            saved.append((snapshots.take(maze_), bytes(maze_.cells)))
+        if step % 23 == 0:  # Back to a former state: the changes since then are dropped.
+            snapshot, cells = rng.choice(saved)
+            snapshots.restore(maze_, snapshot)
+            assert bytes(maze_.cells) == cells, step
+
+    for snapshot, cells in reversed(saved):
+        snapshots.restore(maze_, snapshot)
+        assert bytes(maze_.cells) == cells
+    assert len({id(snapshot.cells.base) for snapshot, _ in saved}) < len(saved) // 4  # Copies shared.